@@ -0,0 +1,186 @@
+"""
+Асинхронный доступ к базе данных SQLite.
+
+Методы DatabaseManager выполняют запросы синхронно и, будучи вызванными из обработчиков
+aiogram или корутин обновителя данных, останавливают цикл событий на время запроса.
+AsyncDatabaseManager предоставляет те же методы в виде корутин и выполняет их в отдельных
+потоках; каждый поток работает через собственное соединение (см. database_connection).
+
+Заполнение данных миграций (преобразование сохраненных строк при обновлении схемы) не
+выполняется при создании менеджера: его запускает start_migrations после запуска бота,
+и до его завершения бот работает с данными в обоих форматах (см. DatabaseManager._migrations).
+"""
+
+import asyncio
+import logging
+import sqlite3
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from functools import partial
+from typing import Any, Callable, Dict, Optional
+
+from config import DB_WORKERS, DB_SLOW_QUERY_SECONDS
+from database_manager import DatabaseManager
+
+logger = logging.getLogger('DatabaseManager')
+
+# Методы, которые при заполненном кэше справочников выполняются сразу по снимку кэша
+# (ReferenceData содержит выборки с теми же именами), без передачи в поток
+_REFERENCE_METHODS = frozenset({'get_faculties', 'get_faculty', 'get_groups', 'get_group'})
+
+
+@dataclass
+class QueryStats:
+    """
+    Статистика вызовов одного метода DatabaseManager.
+
+    Attributes:
+        calls: Количество вызовов
+        total_time: Суммарное время выполнения (в секундах)
+        max_time: Наибольшее время выполнения (в секундах)
+        total_wait: Суммарное время ожидания свободного потока (в секундах)
+    """
+    calls: int = 0
+    total_time: float = 0.0
+    max_time: float = 0.0
+    total_wait: float = 0.0
+
+
+class AsyncDatabaseManager:
+    """
+    Асинхронная обертка над DatabaseManager.
+
+    Публичные методы DatabaseManager доступны под теми же именами и с теми же аргументами,
+    но возвращают корутины:
+
+        settings = await db_manager.get_user_settings(user_id)
+    """
+
+    def __init__(self, db_path: str = "vedomosti.db", workers: int = DB_WORKERS):
+        """
+        Инициализация менеджера (схема базы обновляется в текущем потоке, заполнение данных
+        миграций откладывается до start_migrations).
+
+        Args:
+            db_path: Путь к файлу базы данных SQLite
+            workers: Количество потоков, выполняющих запросы
+        """
+        self.db_manager = DatabaseManager(db_path, defer_backfill=True)
+        self.workers = workers
+        self._executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix='db')
+        self.stats: Dict[str, QueryStats] = {}
+        # Вызовы, переданные в потоки и еще не начавшие выполняться
+        self.queued = 0
+        self.running = 0
+        self._counters_lock = threading.Lock()
+        self._migrations: Optional[asyncio.Task] = None
+
+    def __getattr__(self, name: str) -> Callable[..., Any]:
+        method = getattr(self.db_manager, name)
+        if name.startswith('_') or not callable(method):
+            return method
+
+        async def call(*args: Any, **kwargs: Any) -> Any:
+            if name in _REFERENCE_METHODS:
+                data = self.db_manager.reference_cache.peek()
+                if data is not None:
+                    return getattr(data, name)(*args, **kwargs)
+            return await self._run(name, partial(method, *args, **kwargs))
+
+        call.__name__ = name
+        call.__doc__ = method.__doc__
+        return call
+
+    async def _run(self, name: str, func: Callable[[], Any]) -> Any:
+        """
+        Выполнение вызова в потоке базы данных с учетом статистики.
+
+        Args:
+            name: Имя метода DatabaseManager (для статистики)
+            func: Вызов без аргументов
+
+        Returns:
+            Any: Результат вызова
+        """
+        submitted = time.monotonic()
+        started = submitted
+
+        def run() -> Any:
+            nonlocal started
+            started = time.monotonic()
+            with self._counters_lock:
+                self.queued -= 1
+                self.running += 1
+            try:
+                return func()
+            finally:
+                with self._counters_lock:
+                    self.running -= 1
+
+        with self._counters_lock:
+            self.queued += 1
+        loop = asyncio.get_running_loop()
+        try:
+            # Начатый или поставленный в очередь вызов выполняется до конца, даже если
+            # ожидающая его задача отменена: запись не обрывается на середине
+            return await asyncio.shield(loop.run_in_executor(self._executor, run))
+        finally:
+            finished = time.monotonic()
+            self._record(name, started - submitted, finished - started)
+
+    def _record(self, name: str, wait: float, duration: float) -> None:
+        """Учет времени одного вызова."""
+        stats = self.stats.setdefault(name, QueryStats())
+        stats.calls += 1
+        stats.total_time += duration
+        stats.max_time = max(stats.max_time, duration)
+        stats.total_wait += wait
+
+        if duration + wait >= DB_SLOW_QUERY_SECONDS:
+            logger.warning(f"Медленный запрос к базе данных {name}: выполнение {duration:.3f} с, "
+                           f"ожидание потока {wait:.3f} с, в очереди {self.queued}")
+
+    def format_stats(self) -> str:
+        """
+        Краткое текстовое описание статистики.
+
+        Returns:
+            str: Глубина очереди и среднее/наибольшее время вызовов по методам
+        """
+        methods = ', '.join(
+            f"{name}: {stats.calls} выз., среднее {stats.total_time / stats.calls * 1000:.1f} мс, "
+            f"макс. {stats.max_time * 1000:.1f} мс, ожидание {stats.total_wait / stats.calls * 1000:.1f} мс"
+            for name, stats in sorted(self.stats.items(), key=lambda item: -item[1].total_time)
+        )
+        return (f"в очереди {self.queued}, выполняется {self.running}; {methods or 'запросов не было'}; "
+                f"кэш справочников: {self.db_manager.reference_cache.format_stats()}; "
+                f"кэш настроек: {self.db_manager.user_settings_cache.format_stats()}; "
+                f"кэш ведомостей студентов: {self.db_manager.student_vedomosti_cache.format_stats()}")
+
+    def start_migrations(self) -> None:
+        """
+        Запуск заполнения данных миграций в одном из потоков базы данных (если оно требуется).
+
+        Вызывается после запуска бота; остальные запросы выполняются в других потоках, пока
+        идет заполнение. При закрытии менеджера заполнение останавливается после текущей порции.
+        """
+        if self._migrations is None:
+            self._migrations = asyncio.ensure_future(self._complete_migrations())
+
+    async def _complete_migrations(self) -> None:
+        """Заполнение данных миграций (ошибка записывается в журнал и не останавливает бота)."""
+        loop = asyncio.get_running_loop()
+        try:
+            await loop.run_in_executor(self._executor, self.db_manager.complete_migrations)
+        except sqlite3.Error as e:
+            logger.error(f"Ошибка при заполнении данных миграций: {e}")
+
+    async def close(self) -> None:
+        """Завершение запросов в очереди и закрытие соединений с базой данных."""
+        self.db_manager.cancel_migrations()
+        await asyncio.to_thread(self._executor.shutdown, wait=True)
+        if self._migrations is not None:
+            await self._migrations
+        self.db_manager.close()
@@ -3,7 +3,8 @@
 """
 
 from aiogram import Dispatcher
-from database_manager import DatabaseManager
+from async_database_manager import AsyncDatabaseManager
+from parsers.async_vsuet_parser import AsyncVsuetParser
 
 from bot.handlers.common import register_common_handlers
 from bot.handlers.faculty_handlers import register_faculty_handlers
@@ -12,17 +13,18 @@ from bot.handlers.vedomost_handlers import register_vedomost_handlers
 from bot.handlers.settings_handlers import register_settings_handlers
 
 
-def register_all_handlers(dp: Dispatcher, db_manager: DatabaseManager):
+def register_all_handlers(dp: Dispatcher, db_manager: AsyncDatabaseManager, parser: AsyncVsuetParser):
     """
     Регистрация всех обработчиков сообщений.
 
     Args:
         dp: Диспетчер Telegram бота
         db_manager: Менеджер базы данных
+        parser: Общий парсер сайта ВГУИТ
     """
     # Порядок регистрации важен для правильной обработки запросов
-    register_common_handlers(dp, db_manager)
+    register_common_handlers(dp, db_manager, parser)
     register_settings_handlers(dp, db_manager)
-    register_faculty_handlers(dp, db_manager)
-    register_group_handlers(dp, db_manager)
-    register_vedomost_handlers(dp, db_manager)
\ No newline at end of file
+    register_faculty_handlers(dp, db_manager, parser)
+    register_group_handlers(dp, db_manager, parser)
+    register_vedomost_handlers(dp, db_manager, parser)
\ No newline at end of file
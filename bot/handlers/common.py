@@ -11,10 +11,11 @@ from bot.states.dialog_states import BotStates
 from bot.config import START_MESSAGE, HELP_MESSAGE
 from bot.keyboards.faculty_keyboards import get_faculties_keyboard
 from bot.keyboards.vedomost_keyboards import get_search_keyboard
-from database_manager import DatabaseManager
+from async_database_manager import AsyncDatabaseManager
+from parsers.async_vsuet_parser import AsyncVsuetParser
 
 
-async def cmd_start(message: Message, state: FSMContext, db_manager: DatabaseManager):
+async def cmd_start(message: Message, state: FSMContext, db_manager: AsyncDatabaseManager):
     """
     Обработчик команды /start.
 
@@ -27,7 +28,7 @@ async def cmd_start(message: Message, state: FSMContext, db_manager: DatabaseMan
     await state.clear()
 
     # Проверяем, есть ли у пользователя настройки
-    user_settings = db_manager.get_user_settings(message.from_user.id)
+    user_settings = await db_manager.get_user_settings(message.from_user.id)
 
     # Если настроек нет, предлагаем настроить профиль
     if not user_settings:
@@ -69,7 +70,8 @@ async def process_main_menu(callback: CallbackQuery, state: FSMContext):
     await callback.message.edit_text(START_MESSAGE, reply_markup=keyboard)
 
 
-async def process_browse_faculties(callback: CallbackQuery, state: FSMContext, db_manager: DatabaseManager):
+async def process_browse_faculties(callback: CallbackQuery, state: FSMContext, db_manager: AsyncDatabaseManager,
+                                   parser: AsyncVsuetParser):
     """
     Обработчик перехода к просмотру факультетов.
 
@@ -77,12 +79,13 @@ async def process_browse_faculties(callback: CallbackQuery, state: FSMContext, d
         callback: Объект callback-запроса
         state: Контекст состояния FSM
         db_manager: Менеджер базы данных
+        parser: Парсер сайта ВГУИТ
     """
     await callback.answer("Загрузка списка факультетов...")
     await state.set_state(BotStates.select_faculty)
 
     # Получаем клавиатуру выбора факультета
-    keyboard = await get_faculties_keyboard(db_manager)
+    keyboard = await get_faculties_keyboard(db_manager, parser)
 
     if keyboard:
         await callback.message.edit_text("Выберите факультет:", reply_markup=keyboard)
@@ -110,7 +113,8 @@ async def process_search_by_record_book(callback: CallbackQuery, state: FSMConte
     )
 
 
-async def process_input_record_book(message: Message, state: FSMContext, db_manager: DatabaseManager):
+async def process_input_record_book(message: Message, state: FSMContext, db_manager: AsyncDatabaseManager,
+                                    parser: AsyncVsuetParser):
     """
     Обработчик ввода номера зачетной книжки.
 
@@ -118,6 +122,7 @@ async def process_input_record_book(message: Message, state: FSMContext, db_mana
         message: Объект сообщения
         state: Контекст состояния FSM
         db_manager: Менеджер базы данных
+        parser: Парсер сайта ВГУИТ
     """
     record_book = message.text.strip()
 
@@ -134,7 +139,7 @@ async def process_input_record_book(message: Message, state: FSMContext, db_mana
 
     # Ищем результаты по номеру зачетки в базе данных
     from bot.handlers.vedomost_handlers import search_by_record_book_db
-    await search_by_record_book_db(message, state, db_manager)
+    await search_by_record_book_db(message, state, db_manager, parser)
 
 
 async def handle_unknown_callback(callback: CallbackQuery):
@@ -153,13 +158,14 @@ async def handle_unknown_callback(callback: CallbackQuery):
     )
 
 
-def register_common_handlers(dp: Dispatcher, db_manager: DatabaseManager):
+def register_common_handlers(dp: Dispatcher, db_manager: AsyncDatabaseManager, parser: AsyncVsuetParser):
     """
     Регистрация общих обработчиков сообщений.
 
     Args:
         dp: Диспетчер Telegram бота
         db_manager: Менеджер базы данных
+        parser: Парсер сайта ВГУИТ
     """
     # Регистрация обработчиков команд
     dp.message.register(lambda msg, state: cmd_start(msg, state, db_manager), Command("start"))
@@ -168,14 +174,14 @@ def register_common_handlers(dp: Dispatcher, db_manager: DatabaseManager):
     # Обработчики главного меню
     dp.callback_query.register(process_main_menu, F.data == "main_menu")
     dp.callback_query.register(
-        lambda callback, state: process_browse_faculties(callback, state, db_manager),
+        lambda callback, state: process_browse_faculties(callback, state, db_manager, parser),
         F.data == "browse_faculties"
     )
     dp.callback_query.register(process_search_by_record_book, F.data == "search_by_record_book")
 
     # Обработчик ввода номера зачетки
     dp.message.register(
-        lambda message, state: process_input_record_book(message, state, db_manager),
+        lambda message, state: process_input_record_book(message, state, db_manager, parser),
         BotStates.enter_record_book
     )
 
@@ -9,13 +9,15 @@ from aiogram.fsm.context import FSMContext
 
 from bot.states.dialog_states import BotStates
 from bot.keyboards.group_keyboards import get_groups_keyboard
-from database_manager import DatabaseManager
+from async_database_manager import AsyncDatabaseManager
+from parsers.async_vsuet_parser import AsyncVsuetParser
 
 # Инициализация логирования
 logger = logging.getLogger(__name__)
 
 
-async def process_faculty_selection(callback: CallbackQuery, state: FSMContext, db_manager: DatabaseManager):
+async def process_faculty_selection(callback: CallbackQuery, state: FSMContext, db_manager: AsyncDatabaseManager,
+                                    parser: AsyncVsuetParser):
     """
     Обработчик выбора факультета.
 
@@ -23,6 +25,7 @@ async def process_faculty_selection(callback: CallbackQuery, state: FSMContext,
         callback: Объект callback-запроса
         state: Контекст состояния FSM
         db_manager: Менеджер базы данных
+        parser: Парсер сайта ВГУИТ
     """
     # Извлекаем ID факультета из callback данных
     faculty_id = callback.data.replace("faculty_", "")
@@ -31,15 +34,9 @@ async def process_faculty_selection(callback: CallbackQuery, state: FSMContext,
         # Сохраняем ID факультета в состоянии
         await state.update_data(selected_faculty_id=faculty_id)
 
-        # Получаем данные о факультете
-        faculties = db_manager.get_faculties()
-
         # Находим название выбранного факультета
-        faculty_name = "Неизвестный факультет"
-        for faculty in faculties:
-            if faculty['id'] == faculty_id:
-                faculty_name = faculty['name']
-                break
+        faculty = await db_manager.get_faculty(faculty_id)
+        faculty_name = faculty['name'] if faculty else "Неизвестный факультет"
 
         await state.update_data(selected_faculty_name=faculty_name)
 
@@ -47,7 +44,7 @@ async def process_faculty_selection(callback: CallbackQuery, state: FSMContext,
         await callback.answer(f"Выбран факультет: {faculty_name}")
 
         # Получаем клавиатуру с группами для выбранного факультета
-        keyboard = await get_groups_keyboard(faculty_id, db_manager)
+        keyboard = await get_groups_keyboard(faculty_id, db_manager, parser)
 
         if keyboard:
             # Устанавливаем состояние выбора группы
@@ -73,17 +70,18 @@ async def process_faculty_selection(callback: CallbackQuery, state: FSMContext,
         )
 
 
-def register_faculty_handlers(dp: Dispatcher, db_manager: DatabaseManager):
+def register_faculty_handlers(dp: Dispatcher, db_manager: AsyncDatabaseManager, parser: AsyncVsuetParser):
     """
     Регистрация обработчиков сообщений для работы с факультетами.
 
     Args:
         dp: Диспетчер Telegram бота
         db_manager: Менеджер базы данных
+        parser: Парсер сайта ВГУИТ
     """
     # Регистрация обработчика выбора факультета
     dp.callback_query.register(
-        lambda callback, state: process_faculty_selection(callback, state, db_manager),
+        lambda callback, state: process_faculty_selection(callback, state, db_manager, parser),
         F.data.startswith("faculty_"),
         BotStates.select_faculty
     )
\ No newline at end of file
@@ -12,14 +12,16 @@ from bot.states.dialog_states import BotStates
 from bot.keyboards.group_keyboards import get_groups_keyboard
 from bot.keyboards.vedomost_keyboards import get_vedomosti_keyboard
 from bot.keyboards.faculty_keyboards import get_faculties_keyboard
-from database_manager import DatabaseManager
-from parsers.vsuet_parser import VsuetParser
+from async_database_manager import AsyncDatabaseManager
+from models.vedomosti import VedomostInfo
+from parsers.async_vsuet_parser import AsyncVsuetParser
+from parsers.resilience import VsuetUnavailableError
 
 # Инициализация логирования
 logger = logging.getLogger(__name__)
 
 
-async def cmd_groups(message: Message, state: FSMContext, db_manager: DatabaseManager):
+async def cmd_groups(message: Message, state: FSMContext, db_manager: AsyncDatabaseManager, parser: AsyncVsuetParser):
     """
     Обработчик команды /groups.
 
@@ -27,6 +29,7 @@ async def cmd_groups(message: Message, state: FSMContext, db_manager: DatabaseMa
         message: Объект сообщения
         state: Контекст состояния FSM
         db_manager: Менеджер базы данных
+        parser: Парсер сайта ВГУИТ
     """
     # Проверяем, был ли выбран факультет
     data = await state.get_data()
@@ -35,7 +38,7 @@ async def cmd_groups(message: Message, state: FSMContext, db_manager: DatabaseMa
     if not faculty_id:
         # Если факультет не выбран, предлагаем его выбрать
         await message.answer("Сначала выберите факультет:")
-        keyboard = await get_faculties_keyboard(db_manager)
+        keyboard = await get_faculties_keyboard(db_manager, parser)
         if keyboard:
             await state.set_state(BotStates.select_faculty)
             await message.answer("Выберите факультет:", reply_markup=keyboard)
@@ -44,7 +47,7 @@ async def cmd_groups(message: Message, state: FSMContext, db_manager: DatabaseMa
         return
 
     # Если факультет уже выбран, показываем группы
-    keyboard = await get_groups_keyboard(faculty_id, db_manager)
+    keyboard = await get_groups_keyboard(faculty_id, db_manager, parser)
     if keyboard:
         faculty_name = data.get('selected_faculty_name', 'Выбранный факультет')
         await state.set_state(BotStates.select_group)
@@ -53,7 +56,8 @@ async def cmd_groups(message: Message, state: FSMContext, db_manager: DatabaseMa
         await message.answer("Не удалось получить список групп. Пожалуйста, попробуйте позже.")
 
 
-async def process_group_back(callback: CallbackQuery, state: FSMContext, db_manager: DatabaseManager):
+async def process_group_back(callback: CallbackQuery, state: FSMContext, db_manager: AsyncDatabaseManager,
+                             parser: AsyncVsuetParser):
     """
     Обработчик возврата к выбору факультета.
 
@@ -61,6 +65,7 @@ async def process_group_back(callback: CallbackQuery, state: FSMContext, db_mana
         callback: Объект callback-запроса
         state: Контекст состояния FSM
         db_manager: Менеджер базы данных
+        parser: Парсер сайта ВГУИТ
     """
     await callback.answer("Возврат к выбору факультета")
 
@@ -68,7 +73,7 @@ async def process_group_back(callback: CallbackQuery, state: FSMContext, db_mana
     await state.set_state(BotStates.select_faculty)
 
     # Получаем клавиатуру выбора факультета
-    keyboard = await get_faculties_keyboard(db_manager)
+    keyboard = await get_faculties_keyboard(db_manager, parser)
 
     if keyboard:
         await callback.message.edit_text("Выберите факультет:", reply_markup=keyboard)
@@ -78,7 +83,8 @@ async def process_group_back(callback: CallbackQuery, state: FSMContext, db_mana
         )
 
 
-async def process_group_selection(callback: CallbackQuery, state: FSMContext, db_manager: DatabaseManager):
+async def process_group_selection(callback: CallbackQuery, state: FSMContext, db_manager: AsyncDatabaseManager,
+                                  parser: AsyncVsuetParser):
     """
     Обработчик выбора группы.
 
@@ -86,6 +92,7 @@ async def process_group_selection(callback: CallbackQuery, state: FSMContext, db
         callback: Объект callback-запроса
         state: Контекст состояния FSM
         db_manager: Менеджер базы данных
+        parser: Парсер сайта ВГУИТ
     """
     # Извлекаем ID группы из callback данных
     group_id = callback.data.replace("group_", "")
@@ -102,15 +109,9 @@ async def process_group_selection(callback: CallbackQuery, state: FSMContext, db
             )
             return
 
-        # Получаем информацию о группе
-        groups = db_manager.get_groups(faculty_id)
-
         # Находим название выбранной группы
-        group_name = "Неизвестная группа"
-        for group in groups:
-            if group['id'] == group_id:
-                group_name = group['name']
-                break
+        group = await db_manager.get_group(group_id)
+        group_name = group['name'] if group else "Неизвестная группа"
 
         # Сохраняем ID и название группы в состоянии
         await state.update_data(selected_group_id=group_id)
@@ -121,8 +122,25 @@ async def process_group_selection(callback: CallbackQuery, state: FSMContext, db
 
         # Получаем ведомости для выбранной группы
         # По умолчанию используем текущий учебный год и весенний семестр (0)
-        parser = VsuetParser()
-        vedomosti = parser.get_ved_list(group_id, year="2024-2025", semester="0")
+        cached_note = ""
+        try:
+            vedomosti = await parser.get_ved_list(group_id, year="2024-2025", semester="0")
+        except VsuetUnavailableError as e:
+            # Сайт недоступен - показываем ведомости, сохраненные в базе данных
+            logger.warning(f"Сайт ВГУИТ недоступен, список ведомостей группы {group_id} взят из базы данных: {e}")
+            vedomosti = [
+                VedomostInfo(
+                    id=ved['id'],
+                    discipline=ved['discipline'],
+                    type=ved['type'],
+                    closed=ved['status'] or '',
+                    url=None,
+                    group_id=ved['group_id'],
+                    group_name=ved['group_name']
+                )
+                for ved in await db_manager.get_vedomosti(group_id)
+            ]
+            cached_note = "⚠️ Сайт ВГУИТ недоступен, показаны сохраненные данные.\n\n"
 
         if vedomosti:
             # Устанавливаем состояние выбора ведомости
@@ -135,11 +153,17 @@ async def process_group_selection(callback: CallbackQuery, state: FSMContext, db
             keyboard = await get_vedomosti_keyboard(vedomosti, page=1)
 
             await callback.message.edit_text(
+                f"{cached_note}"
                 f"Группа: {group_name}\n\n"
                 f"Найдено ведомостей: {len(vedomosti)}\n\n"
                 "Выберите ведомость для просмотра:",
                 reply_markup=keyboard
             )
+        elif cached_note:
+            await callback.message.edit_text(
+                f"Сайт ВГУИТ временно недоступен, а сохраненных ведомостей для группы {group_name} нет.\n"
+                "Пожалуйста, попробуйте позже."
+            )
         else:
             await callback.message.edit_text(
                 f"Для группы {group_name} не найдено ведомостей.\n"
@@ -155,27 +179,28 @@ async def process_group_selection(callback: CallbackQuery, state: FSMContext, db
         )
 
 
-def register_group_handlers(dp: Dispatcher, db_manager: DatabaseManager):
+def register_group_handlers(dp: Dispatcher, db_manager: AsyncDatabaseManager, parser: AsyncVsuetParser):
     """
     Регистрация обработчиков сообщений для работы с группами.
 
     Args:
         dp: Диспетчер Telegram бота
         db_manager: Менеджер базы данных
+        parser: Парсер сайта ВГУИТ
     """
     # Регистрация обработчика команды groups
-    dp.message.register(lambda msg, state: cmd_groups(msg, state, db_manager), Command("groups"))
+    dp.message.register(lambda msg, state: cmd_groups(msg, state, db_manager, parser), Command("groups"))
 
     # Регистрация обработчика кнопки "Назад"
     dp.callback_query.register(
-        lambda callback, state: process_group_back(callback, state, db_manager),
+        lambda callback, state: process_group_back(callback, state, db_manager, parser),
         F.data == "group_back",
         BotStates.select_group
     )
 
     # Регистрация обработчика выбора группы
     dp.callback_query.register(
-        lambda callback, state: process_group_selection(callback, state, db_manager),
+        lambda callback, state: process_group_selection(callback, state, db_manager, parser),
         F.data.startswith("group_"),
         ~F.data.in_({"group_back"}),
         BotStates.select_group
@@ -17,13 +17,13 @@ from bot.keyboards.settings_keyboards import (
     get_notification_settings_keyboard
 )
 from bot.keyboards.vedomost_keyboards import get_search_keyboard
-from database_manager import DatabaseManager
+from async_database_manager import AsyncDatabaseManager
 
 # Инициализация логирования
 logger = logging.getLogger(__name__)
 
 
-async def cmd_settings(message: Message, state: FSMContext, db_manager: DatabaseManager):
+async def cmd_settings(message: Message, state: FSMContext, db_manager: AsyncDatabaseManager):
     """
     Обработчик команды /settings.
 
@@ -33,7 +33,7 @@ async def cmd_settings(message: Message, state: FSMContext, db_manager: Database
         db_manager: Менеджер базы данных
     """
     # Получаем настройки пользователя
-    user_settings = db_manager.get_user_settings(message.from_user.id)
+    user_settings = await db_manager.get_user_settings(message.from_user.id)
 
     if user_settings:
         # Если настройки уже есть, отображаем их
@@ -68,7 +68,7 @@ async def cmd_settings(message: Message, state: FSMContext, db_manager: Database
     await message.answer(text, reply_markup=keyboard, parse_mode="Markdown")
 
 
-async def process_settings_menu(callback: CallbackQuery, state: FSMContext, db_manager: DatabaseManager):
+async def process_settings_menu(callback: CallbackQuery, state: FSMContext, db_manager: AsyncDatabaseManager):
     """
     Обработчик выбора в меню настроек.
 
@@ -101,7 +101,7 @@ async def process_settings_menu(callback: CallbackQuery, state: FSMContext, db_m
 
     elif action == "group":
         # Проверяем, выбран ли факультет
-        user_settings = db_manager.get_user_settings(callback.from_user.id)
+        user_settings = await db_manager.get_user_settings(callback.from_user.id)
 
         if not user_settings or not user_settings.get('faculty_id'):
             await callback.message.edit_text(
@@ -141,7 +141,7 @@ async def process_settings_menu(callback: CallbackQuery, state: FSMContext, db_m
         await state.set_state(BotStates.settings_notifications)
 
         # Получаем текущие настройки
-        user_settings = db_manager.get_user_settings(callback.from_user.id)
+        user_settings = await db_manager.get_user_settings(callback.from_user.id)
         notify_enabled = user_settings.get('notify_enabled', 1) if user_settings else 1
 
         # Получаем клавиатуру настройки уведомлений
@@ -159,7 +159,7 @@ async def process_settings_menu(callback: CallbackQuery, state: FSMContext, db_m
         await callback.message.edit_text(START_MESSAGE, reply_markup=keyboard)
 
 
-async def process_faculty_selection_settings(callback: CallbackQuery, state: FSMContext, db_manager: DatabaseManager):
+async def process_faculty_selection_settings(callback: CallbackQuery, state: FSMContext, db_manager: AsyncDatabaseManager):
     """
     Обработчик выбора факультета в настройках.
 
@@ -179,20 +179,14 @@ async def process_faculty_selection_settings(callback: CallbackQuery, state: FSM
 
     try:
         # Получаем информацию о факультете
-        faculties = db_manager.get_faculties()
-        faculty_name = None
-
-        for faculty in faculties:
-            if faculty['id'] == faculty_id:
-                faculty_name = faculty['name']
-                break
-
-        if not faculty_name:
+        faculty = await db_manager.get_faculty(faculty_id)
+        if not faculty:
             await callback.answer("Факультет не найден")
             return
+        faculty_name = faculty['name']
 
         # Сохраняем выбранный факультет в настройках пользователя
-        db_manager.save_user_settings(
+        await db_manager.save_user_settings(
             callback.from_user.id,
             {'faculty_id': faculty_id}
         )
@@ -212,7 +206,7 @@ async def process_faculty_selection_settings(callback: CallbackQuery, state: FSM
         await cmd_settings(callback.message, state, db_manager)
 
 
-async def process_group_selection_settings(callback: CallbackQuery, state: FSMContext, db_manager: DatabaseManager):
+async def process_group_selection_settings(callback: CallbackQuery, state: FSMContext, db_manager: AsyncDatabaseManager):
     """
     Обработчик выбора группы в настройках.
 
@@ -234,25 +228,19 @@ async def process_group_selection_settings(callback: CallbackQuery, state: FSMCo
 
     try:
         # Получаем информацию о группе
-        user_settings = db_manager.get_user_settings(callback.from_user.id)
+        user_settings = await db_manager.get_user_settings(callback.from_user.id)
         if not user_settings or not user_settings.get('faculty_id'):
             await callback.answer("Сначала выберите факультет")
             return
 
-        groups = db_manager.get_groups(user_settings['faculty_id'])
-        group_name = None
-
-        for group in groups:
-            if group['id'] == group_id:
-                group_name = group['name']
-                break
-
-        if not group_name:
+        group = await db_manager.get_group(group_id)
+        if not group or group['faculty_id'] != user_settings['faculty_id']:
             await callback.answer("Группа не найдена")
             return
+        group_name = group['name']
 
         # Сохраняем выбранную группу в настройках пользователя
-        db_manager.save_user_settings(
+        await db_manager.save_user_settings(
             callback.from_user.id,
             {'group_id': group_id}
         )
@@ -272,7 +260,7 @@ async def process_group_selection_settings(callback: CallbackQuery, state: FSMCo
         await cmd_settings(callback.message, state, db_manager)
 
 
-async def process_record_book_input(message: Message, state: FSMContext, db_manager: DatabaseManager):
+async def process_record_book_input(message: Message, state: FSMContext, db_manager: AsyncDatabaseManager):
     """
     Обработчик ввода номера зачетной книжки.
 
@@ -291,7 +279,7 @@ async def process_record_book_input(message: Message, state: FSMContext, db_mana
 
     try:
         # Сохраняем номер зачетной книжки в настройках пользователя
-        db_manager.save_user_settings(
+        await db_manager.save_user_settings(
             message.from_user.id,
             {'record_book': record_book}
         )
@@ -299,12 +287,12 @@ async def process_record_book_input(message: Message, state: FSMContext, db_mana
         await message.answer(f"Номер зачетной книжки сохранен: {record_book}")
 
         # Проверяем, есть ли студент с таким номером в базе
-        student = db_manager.get_student_by_record_book(record_book)
+        student = await db_manager.get_student_by_record_book(record_book)
 
         if student:
             # Если студент найден, обновляем группу в настройках
             if student.get('group_id'):
-                db_manager.save_user_settings(
+                await db_manager.save_user_settings(
                     message.from_user.id,
                     {'group_id': student['group_id']}
                 )
@@ -331,7 +319,7 @@ async def process_record_book_input(message: Message, state: FSMContext, db_mana
         await cmd_settings(message, state, db_manager)
 
 
-async def process_notification_settings(callback: CallbackQuery, state: FSMContext, db_manager: DatabaseManager):
+async def process_notification_settings(callback: CallbackQuery, state: FSMContext, db_manager: AsyncDatabaseManager):
     """
     Обработчик настройки уведомлений.
 
@@ -351,14 +339,14 @@ async def process_notification_settings(callback: CallbackQuery, state: FSMConte
     try:
         # Обновляем настройки уведомлений
         if action == "enable":
-            db_manager.save_user_settings(
+            await db_manager.save_user_settings(
                 callback.from_user.id,
                 {'notify_enabled': 1}
             )
             await callback.answer("Уведомления включены")
 
         elif action == "disable":
-            db_manager.save_user_settings(
+            await db_manager.save_user_settings(
                 callback.from_user.id,
                 {'notify_enabled': 0}
             )
@@ -377,7 +365,7 @@ async def process_notification_settings(callback: CallbackQuery, state: FSMConte
         await cmd_settings(callback.message, state, db_manager)
 
 
-def register_settings_handlers(dp: Dispatcher, db_manager: DatabaseManager):
+def register_settings_handlers(dp: Dispatcher, db_manager: AsyncDatabaseManager):
     """
     Регистрация обработчиков сообщений для настройки профиля.
 
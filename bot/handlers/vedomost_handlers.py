@@ -19,9 +19,10 @@ from bot.keyboards.vedomost_keyboards import (
     get_student_details_keyboard
 )
 from bot.keyboards.group_keyboards import get_groups_keyboard
-from parsers.vsuet_parser import VsuetParser
+from parsers.async_vsuet_parser import AsyncVsuetParser
+from parsers.resilience import VsuetUnavailableError
 from utils.data_exporter import DataExporter
-from database_manager import DatabaseManager
+from async_database_manager import AsyncDatabaseManager
 from config import EXPORT_DIR
 
 # Инициализация логирования
@@ -64,7 +65,8 @@ async def process_vedomost_pagination(callback: CallbackQuery, state: FSMContext
     )
 
 
-async def process_vedomost_back(callback: CallbackQuery, state: FSMContext, db_manager: DatabaseManager):
+async def process_vedomost_back(callback: CallbackQuery, state: FSMContext, db_manager: AsyncDatabaseManager,
+                                parser: AsyncVsuetParser):
     """
     Обработчик возврата к выбору группы.
 
@@ -72,6 +74,7 @@ async def process_vedomost_back(callback: CallbackQuery, state: FSMContext, db_m
         callback: Объект callback-запроса
         state: Контекст состояния FSM
         db_manager: Менеджер базы данных
+        parser: Парсер сайта ВГУИТ
     """
     await callback.answer("Возврат к выбору группы")
 
@@ -84,7 +87,7 @@ async def process_vedomost_back(callback: CallbackQuery, state: FSMContext, db_m
     await state.set_state(BotStates.select_group)
 
     # Получаем клавиатуру выбора группы
-    keyboard = await get_groups_keyboard(faculty_id, db_manager)
+    keyboard = await get_groups_keyboard(faculty_id, db_manager, parser)
 
     if keyboard:
         await callback.message.edit_text(
@@ -98,7 +101,8 @@ async def process_vedomost_back(callback: CallbackQuery, state: FSMContext, db_m
         )
 
 
-async def process_vedomost_selection(callback: CallbackQuery, state: FSMContext, db_manager: DatabaseManager):
+async def process_vedomost_selection(callback: CallbackQuery, state: FSMContext, db_manager: AsyncDatabaseManager,
+                                     parser: AsyncVsuetParser):
     """
     Обработчик выбора ведомости.
 
@@ -106,6 +110,7 @@ async def process_vedomost_selection(callback: CallbackQuery, state: FSMContext,
         callback: Объект callback-запроса
         state: Контекст состояния FSM
         db_manager: Менеджер базы данных
+        parser: Парсер сайта ВГУИТ
     """
     # Извлекаем ID ведомости из callback данных
     vedomost_id = callback.data.replace("vedomost_", "")
@@ -141,16 +146,25 @@ async def process_vedomost_selection(callback: CallbackQuery, state: FSMContext,
         await state.update_data(selected_vedomost=selected_vedomost)
 
         # Проверяем, есть ли детальная информация в базе данных
-        vedomost_details = db_manager.get_vedomost_details(vedomost_id)
+        vedomost_details = await db_manager.get_vedomost_details(vedomost_id)
 
         if not vedomost_details:
             # Если нет в базе, получаем через парсер
-            parser = VsuetParser()
-            vedomost_details = parser.get_detailed_ved(vedomost_id)
+            try:
+                vedomost_details = await parser.get_detailed_ved(vedomost_id)
+            except VsuetUnavailableError as e:
+                logger.warning(f"Сайт ВГУИТ недоступен, ведомость {vedomost_id} не загружена: {e}")
+                await callback.message.edit_text(
+                    f"Сайт ВГУИТ временно недоступен, а ведомость {selected_vedomost.discipline} "
+                    "еще не сохранена в базе данных.\n"
+                    "Пожалуйста, попробуйте позже.",
+                    reply_markup=get_search_keyboard()
+                )
+                return
 
             # Сохраняем в базу данных
             if vedomost_details:
-                db_manager.save_vedomost_details(vedomost_id, vedomost_details)
+                await db_manager.save_vedomost_details(vedomost_id, vedomost_details)
 
         if vedomost_details:
             # Сохраняем детальную информацию в состоянии
@@ -411,13 +425,14 @@ async def process_show_detailed_vedomost(callback: CallbackQuery, state: FSMCont
         await callback.answer("Произошла ошибка при отображении информации")
 
 
-async def search_by_record_book(message: Message, state: FSMContext):
+async def search_by_record_book(message: Message, state: FSMContext, parser: AsyncVsuetParser):
     """
     Поиск ведомостей по номеру зачетной книжки.
 
     Args:
         message: Объект сообщения
         state: Контекст состояния FSM
+        parser: Парсер сайта ВГУИТ
     """
     # Получаем данные из состояния
     data = await state.get_data()
@@ -433,14 +448,11 @@ async def search_by_record_book(message: Message, state: FSMContext):
     await message.answer(f"🔍 Ищем информацию по зачетной книжке: {record_book}...")
 
     try:
-        # Создаем парсер
-        parser = VsuetParser()
-
         # В этой реализации мы будем перебирать доступные ведомости и искать студента
         # В реальном приложении лучше сделать отдельный метод в парсере для прямого поиска
 
         # Получаем список факультетов
-        faculties = parser.get_faculties()
+        faculties = await parser.get_faculties()
 
         found_results = []
         student_name = None
@@ -448,40 +460,43 @@ async def search_by_record_book(message: Message, state: FSMContext):
         # Поиск по всем факультетам и группам (это может занять много времени)
         # В реальном приложении лучше ограничить поиск или кешировать результаты
         for faculty in faculties[:3]:  # Ограничиваем для демонстрации
-            groups = parser.get_groups_by_faculty(faculty.id)
+            groups = await parser.get_groups_by_faculty(faculty.id)
 
             for group in groups[:5]:  # Ограничиваем для демонстрации
-                vedomosti = parser.get_ved_list(group.id)
-
-                for ved in vedomosti:
-                    # Получаем детальную информацию о ведомости
-                    ved_details = parser.get_detailed_ved(ved.id)
-
-                    if ved_details and 'students' in ved_details:
-                        # Ищем студента по номеру зачетки
-                        for student in ved_details['students']:
-                            if student.get('record_book') == record_book:
-                                student_name = student.get('name')
-
-                                # Добавляем результат
-                                found_results.append({
-                                    'vedomost_id': ved.id,
-                                    'discipline': ved_details['discipline'],
-                                    'group': ved_details['group'],
-                                    'semester': ved_details['semester'],
-                                    'year': ved_details['year'],
-                                    'final_grade': student.get('final_grade', 'Нет оценки'),
-                                    'kt_results': student.get('kt_results', []),
-                                    'final_rating': student.get('final_rating', '')
-                                })
-
-                                # Если нашли хотя бы одну ведомость, прерываем поиск для демонстрации
-                                if len(found_results) >= 1:
-                                    break
-
-                        # Прерываем поиск если нашли результаты
-                        if student_name and len(found_results) >= 1:
-                            break
+                vedomosti = await parser.get_ved_list(group.id)
+
+                # Ведомости группы загружаются одновременно и проверяются по мере получения;
+                # после прерывания поиска оставшиеся запросы отменяются
+                details_stream = parser.get_detailed_veds([ved.id for ved in vedomosti if ved.id])
+                try:
+                    async for ved_id, ved_details in details_stream:
+                        if ved_details and 'students' in ved_details:
+                            # Ищем студента по номеру зачетки
+                            for student in ved_details['students']:
+                                if student.get('record_book') == record_book:
+                                    student_name = student.get('name')
+
+                                    # Добавляем результат
+                                    found_results.append({
+                                        'vedomost_id': ved_id,
+                                        'discipline': ved_details['discipline'],
+                                        'group': ved_details['group'],
+                                        'semester': ved_details['semester'],
+                                        'year': ved_details['year'],
+                                        'final_grade': student.get('final_grade', 'Нет оценки'),
+                                        'kt_results': student.get('kt_results', []),
+                                        'final_rating': student.get('final_rating', '')
+                                    })
+
+                                    # Если нашли хотя бы одну ведомость, прерываем поиск для демонстрации
+                                    if len(found_results) >= 1:
+                                        break
+
+                            # Прерываем поиск если нашли результаты
+                            if student_name and len(found_results) >= 1:
+                                break
+                finally:
+                    await details_stream.aclose()
 
                 # Прерываем поиск если нашли результаты
                 if student_name and len(found_results) >= 1:
@@ -533,6 +548,13 @@ async def search_by_record_book(message: Message, state: FSMContext):
                 reply_markup=get_search_keyboard()
             )
 
+    except VsuetUnavailableError as e:
+        logger.warning(f"Сайт ВГУИТ недоступен, поиск по зачетной книжке прерван: {e}")
+        await message.answer(
+            "Сайт ВГУИТ временно недоступен, а в базе данных нет сведений по этой зачетной книжке.\n"
+            "Пожалуйста, попробуйте позже.",
+            reply_markup=get_search_keyboard()
+        )
     except Exception as e:
         logger.error(f"Ошибка при поиске по зачетной книжке: {e}")
         await message.answer(
@@ -541,7 +563,8 @@ async def search_by_record_book(message: Message, state: FSMContext):
         )
 
 
-async def search_by_record_book_db(message: Message, state: FSMContext, db_manager: DatabaseManager):
+async def search_by_record_book_db(message: Message, state: FSMContext, db_manager: AsyncDatabaseManager,
+                                   parser: AsyncVsuetParser):
     """
     Поиск ведомостей по номеру зачетной книжки в базе данных.
 
@@ -549,6 +572,7 @@ async def search_by_record_book_db(message: Message, state: FSMContext, db_manag
         message: Объект сообщения
         state: Контекст состояния FSM
         db_manager: Менеджер базы данных
+        parser: Парсер сайта ВГУИТ
     """
     # Получаем данные из состояния
     data = await state.get_data()
@@ -565,15 +589,15 @@ async def search_by_record_book_db(message: Message, state: FSMContext, db_manag
 
     try:
         # Ищем студента в базе данных
-        student = db_manager.get_student_by_record_book(record_book)
+        student = await db_manager.get_student_by_record_book(record_book)
 
         if not student:
             # Если студент не найден в базе, пробуем поискать через парсер
-            await search_by_record_book(message, state)
+            await search_by_record_book(message, state, parser)
             return
 
         # Получаем все ведомости с результатами для этого студента
-        vedomosti = db_manager.get_vedomosti_for_student(record_book)
+        vedomosti = await db_manager.get_vedomosti_for_student(record_book)
 
         if not vedomosti:
             await message.answer(
@@ -582,7 +606,7 @@ async def search_by_record_book_db(message: Message, state: FSMContext, db_manag
                 reply_markup=get_search_keyboard()
             )
             # Если результатов нет в базе, пробуем поискать через парсер
-            await search_by_record_book(message, state)
+            await search_by_record_book(message, state, parser)
             return
 
         # Формируем сообщение с результатами
@@ -621,11 +645,11 @@ async def search_by_record_book_db(message: Message, state: FSMContext, db_manag
             reply_markup=get_search_keyboard()
         )
         # В случае ошибки пробуем поискать через парсер
-        await search_by_record_book(message, state)
+        await search_by_record_book(message, state, parser)
 
 
 async def process_export_student_results(callback: CallbackQuery, state: FSMContext, bot: Bot,
-                                         db_manager: DatabaseManager):
+                                         db_manager: AsyncDatabaseManager):
     """
     Обработчик экспорта результатов студента.
 
@@ -640,13 +664,12 @@ async def process_export_student_results(callback: CallbackQuery, state: FSMCont
 
     # Получаем данные из состояния
     data = await state.get_data()
-    student_name = data.get('student_name', 'Студент
-
+    student_name = data.get('student_name', 'Студент')
     found_results = data.get('found_results', [])
 
     if not found_results:
         await callback.answer("Нет данных для экспорта")
-    return
+        return
 
     try:
         # Сообщаем пользователю, что идет подготовка экспорта
@@ -696,13 +719,14 @@ async def process_export_student_results(callback: CallbackQuery, state: FSMCont
         )
 
 
-def register_vedomost_handlers(dp: Dispatcher, db_manager: DatabaseManager):
+def register_vedomost_handlers(dp: Dispatcher, db_manager: AsyncDatabaseManager, parser: AsyncVsuetParser):
     """
     Регистрация обработчиков сообщений для работы с ведомостями.
 
     Args:
         dp: Диспетчер Telegram бота
         db_manager: Менеджер базы данных
+        parser: Парсер сайта ВГУИТ
     """
     # Регистрация обработчиков пагинации списка ведомостей
     dp.callback_query.register(
@@ -713,14 +737,14 @@ def register_vedomost_handlers(dp: Dispatcher, db_manager: DatabaseManager):
 
     # Регистрация обработчика возврата к выбору группы
     dp.callback_query.register(
-        lambda callback, state: process_vedomost_back(callback, state, db_manager),
+        lambda callback, state: process_vedomost_back(callback, state, db_manager, parser),
         F.data == "vedomost_back",
         BotStates.select_vedomost
     )
 
     # Регистрация обработчика выбора ведомости
     dp.callback_query.register(
-        lambda callback, state: process_vedomost_selection(callback, state, db_manager),
+        lambda callback, state: process_vedomost_selection(callback, state, db_manager, parser),
         F.data.startswith("vedomost_"),
         ~F.data.in_({"vedomost_next_page", "vedomost_prev_page", "vedomost_back", "vedomost_detail_back"}),
         BotStates.select_vedomost
@@ -6,32 +6,37 @@ import logging
 from aiogram.types import InlineKeyboardMarkup, InlineKeyboardButton
 from aiogram.utils.keyboard import InlineKeyboardBuilder
 
-from database_manager import DatabaseManager
-from parsers.vsuet_parser import VsuetParser
+from async_database_manager import AsyncDatabaseManager
+from parsers.async_vsuet_parser import AsyncVsuetParser
+from parsers.resilience import VsuetUnavailableError
 
 # Инициализация логирования
 logger = logging.getLogger(__name__)
 
 
-async def get_faculties_keyboard(db_manager: DatabaseManager) -> InlineKeyboardMarkup:
+async def get_faculties_keyboard(db_manager: AsyncDatabaseManager, parser: AsyncVsuetParser) -> InlineKeyboardMarkup:
     """
     Создание инлайн-клавиатуры для выбора факультета.
 
     Args:
         db_manager: Менеджер базы данных
+        parser: Парсер сайта ВГУИТ
 
     Returns:
         InlineKeyboardMarkup: Клавиатура с кнопками факультетов
     """
     try:
         # Получаем список факультетов из базы данных
-        faculties = db_manager.get_faculties()
+        faculties = await db_manager.get_faculties()
 
         if not faculties:
             logger.warning("Не удалось получить список факультетов из базы данных")
             # Пробуем получить через парсер
-            parser = VsuetParser()
-            parser_faculties = parser.get_faculties()
+            try:
+                parser_faculties = await parser.get_faculties()
+            except VsuetUnavailableError as e:
+                logger.warning(f"Сайт ВГУИТ недоступен, список факультетов не получен: {e}")
+                return None
 
             if not parser_faculties:
                 logger.warning("Не удалось получить список факультетов через парсер")
@@ -40,7 +45,7 @@ async def get_faculties_keyboard(db_manager: DatabaseManager) -> InlineKeyboardM
             faculties = [faculty.to_dict() for faculty in parser_faculties]
 
             # Сохраняем факультеты в базу данных
-            db_manager.save_faculties(faculties)
+            await db_manager.save_faculties(faculties)
 
         # Создаем клавиатуру
         keyboard_builder = InlineKeyboardBuilder()
@@ -6,34 +6,40 @@ import logging
 from aiogram.types import InlineKeyboardMarkup, InlineKeyboardButton
 from aiogram.utils.keyboard import InlineKeyboardBuilder
 
-from database_manager import DatabaseManager
-from parsers.vsuet_parser import VsuetParser
+from async_database_manager import AsyncDatabaseManager
+from parsers.async_vsuet_parser import AsyncVsuetParser
+from parsers.resilience import VsuetUnavailableError
 from bot.config import BUTTON_LABELS
 
 # Инициализация логирования
 logger = logging.getLogger(__name__)
 
 
-async def get_groups_keyboard(faculty_id: str, db_manager: DatabaseManager) -> InlineKeyboardMarkup:
+async def get_groups_keyboard(faculty_id: str, db_manager: AsyncDatabaseManager,
+                             parser: AsyncVsuetParser) -> InlineKeyboardMarkup:
     """
     Создание инлайн-клавиатуры для выбора группы.
 
     Args:
         faculty_id: ID факультета
         db_manager: Менеджер базы данных
+        parser: Парсер сайта ВГУИТ
 
     Returns:
         InlineKeyboardMarkup: Клавиатура с кнопками групп
     """
     try:
         # Получаем список групп для факультета из базы данных
-        groups = db_manager.get_groups(faculty_id)
+        groups = await db_manager.get_groups(faculty_id)
 
         if not groups:
             logger.warning(f"Не удалось получить список групп для факультета {faculty_id} из базы данных")
             # Пробуем получить через парсер
-            parser = VsuetParser()
-            parser_groups = parser.get_groups_by_faculty(faculty_id)
+            try:
+                parser_groups = await parser.get_groups_by_faculty(faculty_id)
+            except VsuetUnavailableError as e:
+                logger.warning(f"Сайт ВГУИТ недоступен, список групп для факультета {faculty_id} не получен: {e}")
+                return None
 
             if not parser_groups:
                 logger.warning(f"Не удалось получить список групп для факультета {faculty_id} через парсер")
@@ -42,7 +48,7 @@ async def get_groups_keyboard(faculty_id: str, db_manager: DatabaseManager) -> I
             groups = [group.to_dict() for group in parser_groups]
 
             # Сохраняем группы в базу данных
-            db_manager.save_groups(groups, faculty_id)
+            await db_manager.save_groups(groups, faculty_id)
 
         # Создаем клавиатуру
         keyboard_builder = InlineKeyboardBuilder()
@@ -5,7 +5,7 @@
 import logging
 from aiogram.types import InlineKeyboardMarkup, InlineKeyboardButton
 from aiogram.utils.keyboard import InlineKeyboardBuilder
-from database_manager import DatabaseManager
+from async_database_manager import AsyncDatabaseManager
 
 # Инициализация логирования
 logger = logging.getLogger(__name__)
@@ -68,7 +68,7 @@ def get_settings_keyboard() -> InlineKeyboardMarkup:
         return InlineKeyboardBuilder().as_markup()
 
 
-async def get_faculty_settings_keyboard(db_manager: DatabaseManager) -> InlineKeyboardMarkup:
+async def get_faculty_settings_keyboard(db_manager: AsyncDatabaseManager) -> InlineKeyboardMarkup:
     """
     Создание инлайн-клавиатуры для выбора факультета в настройках.
 
@@ -82,7 +82,7 @@ async def get_faculty_settings_keyboard(db_manager: DatabaseManager) -> InlineKe
         keyboard_builder = InlineKeyboardBuilder()
 
         # Получаем список факультетов из базы данных
-        faculties = db_manager.get_faculties()
+        faculties = await db_manager.get_faculties()
 
         if not faculties:
             logger.warning("Не удалось получить список факультетов из базы данных")
@@ -122,7 +122,7 @@ async def get_faculty_settings_keyboard(db_manager: DatabaseManager) -> InlineKe
         return InlineKeyboardBuilder().as_markup()
 
 
-async def get_group_settings_keyboard(db_manager: DatabaseManager, faculty_id: str) -> InlineKeyboardMarkup:
+async def get_group_settings_keyboard(db_manager: AsyncDatabaseManager, faculty_id: str) -> InlineKeyboardMarkup:
     """
     Создание инлайн-клавиатуры для выбора группы в настройках.
 
@@ -137,7 +137,7 @@ async def get_group_settings_keyboard(db_manager: DatabaseManager, faculty_id: s
         keyboard_builder = InlineKeyboardBuilder()
 
         # Получаем список групп для факультета из базы данных
-        groups = db_manager.get_groups(faculty_id)
+        groups = await db_manager.get_groups(faculty_id)
 
         if not groups:
             logger.warning(f"Не удалось получить список групп для факультета {faculty_id} из базы данных")
@@ -7,25 +7,26 @@ import os
 from typing import List, Dict, Any
 from aiogram import Bot
 from aiogram.types import FSInputFile
-from database_manager import DatabaseManager
+from async_database_manager import AsyncDatabaseManager
 from data_updater import DataUpdater
 
 logger = logging.getLogger(__name__)
 
 
-async def check_and_send_notifications(bot: Bot, db_manager: DatabaseManager) -> None:
+async def check_and_send_notifications(bot: Bot, db_manager: AsyncDatabaseManager, data_updater: DataUpdater) -> None:
     """
     Проверка и отправка уведомлений пользователям.
 
     Args:
         bot: Объект бота для отправки сообщений
         db_manager: Менеджер базы данных
+        data_updater: Обновитель данных (для экспорта PDF)
     """
     try:
         logger.info("Проверка новых уведомлений")
 
         # Получаем непрочитанные уведомления
-        notifications = db_manager.get_pending_notifications(limit=100)
+        notifications = await db_manager.get_pending_notifications(limit=100)
 
         if not notifications:
             logger.info("Нет новых уведомлений")
@@ -41,9 +42,6 @@ async def check_and_send_notifications(bot: Bot, db_manager: DatabaseManager) ->
                 user_notifications[user_id] = []
             user_notifications[user_id].append(notification)
 
-        # Создаем экземпляр обновителя данных для экспорта PDF
-        data_updater = DataUpdater()
-
         # Отправляем уведомления пользователям
         for user_id, user_notifs in user_notifications.items():
             try:
@@ -51,14 +49,11 @@ async def check_and_send_notifications(bot: Bot, db_manager: DatabaseManager) ->
             except Exception as e:
                 logger.error(f"Ошибка при отправке уведомлений пользователю {user_id}: {e}", exc_info=True)
 
-        # Закрываем соединения
-        data_updater.close()
-
     except Exception as e:
         logger.error(f"Ошибка при проверке и отправке уведомлений: {e}", exc_info=True)
 
 
-async def send_notifications_to_user(bot: Bot, db_manager: DatabaseManager, data_updater: DataUpdater,
+async def send_notifications_to_user(bot: Bot, db_manager: AsyncDatabaseManager, data_updater: DataUpdater,
                                      user_id: int, notifications: List[Dict[str, Any]]) -> None:
     """
     Отправка уведомлений конкретному пользователю.
@@ -130,7 +125,7 @@ async def send_notifications_to_user(bot: Bot, db_manager: DatabaseManager, data
 
             # Отмечаем уведомления как отправленные
             for notif in ved_notifs:
-                db_manager.mark_notification_as_sent(notif['id'])
+                await db_manager.mark_notification_as_sent(notif['id'])
 
         logger.info(f"Отправлены уведомления пользователю {user_id}")
 
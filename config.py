@@ -23,10 +23,74 @@ WEBAPP_PORT = int(os.getenv("WEBAPP_PORT", 8000))
 
 # Настройки парсера ВГУИТ
 VSUET_BASE_URL = os.getenv("VSUET_BASE_URL", "https://rating.vsuet.ru/web/Ved/")
+# Максимальное количество одновременных соединений с сервером ВГУИТ
+PARSER_POOL_SIZE = int(os.getenv("PARSER_POOL_SIZE", 10))
+# Таймаут одного запроса к серверу ВГУИТ (в секундах)
+PARSER_REQUEST_TIMEOUT = float(os.getenv("PARSER_REQUEST_TIMEOUT", 30))
+# Время жизни неактивного keep-alive соединения (в секундах)
+PARSER_KEEPALIVE_TIMEOUT = float(os.getenv("PARSER_KEEPALIVE_TIMEOUT", 30))
+# Максимальная частота запросов к серверу ВГУИТ (запросов в секунду) и допустимый всплеск
+PARSER_RATE_LIMIT = float(os.getenv("PARSER_RATE_LIMIT", 5))
+PARSER_RATE_BURST = float(os.getenv("PARSER_RATE_BURST", 10))
+# Минимальное число одновременных запросов (максимальное - PARSER_POOL_SIZE)
+PARSER_MIN_CONCURRENCY = int(os.getenv("PARSER_MIN_CONCURRENCY", 1))
+# Время ответа (в секундах), выше которого сервер считается перегруженным
+PARSER_LATENCY_TARGET = float(os.getenv("PARSER_LATENCY_TARGET", 2))
+# Количество попыток запроса при временных ошибках и границы задержки между ними (в секундах)
+PARSER_RETRY_ATTEMPTS = int(os.getenv("PARSER_RETRY_ATTEMPTS", 3))
+PARSER_RETRY_BASE_DELAY = float(os.getenv("PARSER_RETRY_BASE_DELAY", 0.5))
+PARSER_RETRY_MAX_DELAY = float(os.getenv("PARSER_RETRY_MAX_DELAY", 10))
+# Количество ошибок подряд, после которого запросы к серверу приостанавливаются, и длительность паузы (в секундах)
+PARSER_BREAKER_THRESHOLD = int(os.getenv("PARSER_BREAKER_THRESHOLD", 5))
+PARSER_BREAKER_RESET_TIMEOUT = float(os.getenv("PARSER_BREAKER_RESET_TIMEOUT", 60))
+# Время жизни сохраненных __VIEWSTATE/__EVENTVALIDATION формы (в секундах)
+PARSER_FORM_STATE_TTL = float(os.getenv("PARSER_FORM_STATE_TTL", 600))
+# Время бездействия (в секундах), после которого сервер забывает сессию ASP.NET
+PARSER_SESSION_TTL = float(os.getenv("PARSER_SESSION_TTL", 1200))
+# Время (в секундах), в течение которого результат запроса отдается повторным одинаковым запросам
+PARSER_SINGLE_FLIGHT_TTL = float(os.getenv("PARSER_SINGLE_FLIGHT_TTL", 5))
+# Движок разбора страниц ведомостей: lxml (быстрый) или bs4 (запасной)
+VED_PARSE_ENGINE = os.getenv("VED_PARSE_ENGINE", "lxml")
+# Сверять результат основного движка с BeautifulSoup при каждом разборе (для отладки)
+VED_PARSE_PARITY_CHECK = os.getenv("VED_PARSE_PARITY_CHECK", "False").lower() == "true"
+# Количество процессов для разбора страниц при массовом обходе сайта (0 - разбор в основном процессе)
+PARSER_PARSE_WORKERS = int(os.getenv("PARSER_PARSE_WORKERS", 2))
+# Страницы меньше этого размера (в байтах) всегда разбираются в основном процессе
+PARSER_PARSE_INLINE_BYTES = int(os.getenv("PARSER_PARSE_INLINE_BYTES", 16384))
+
+# Настройки базы данных SQLite
+# Время ожидания блокировки базы другим соединением (в секундах)
+DB_BUSY_TIMEOUT = float(os.getenv("DB_BUSY_TIMEOUT", 30))
+# Размер кэша страниц одного соединения (в килобайтах)
+DB_CACHE_SIZE_KB = int(os.getenv("DB_CACHE_SIZE_KB", 16384))
+# Размер файла базы, отображаемого в память (в байтах, 0 - не использовать)
+DB_MMAP_SIZE = int(os.getenv("DB_MMAP_SIZE", 268435456))
+# Режим синхронизации записи на диск: NORMAL (достаточно для WAL) или FULL
+DB_SYNCHRONOUS = os.getenv("DB_SYNCHRONOUS", "NORMAL")
+# Количество потоков, выполняющих запросы к базе данных из асинхронного кода
+DB_WORKERS = int(os.getenv("DB_WORKERS", 4))
+# Время вызова (в секундах, включая ожидание потока), выше которого запрос записывается в лог
+DB_SLOW_QUERY_SECONDS = float(os.getenv("DB_SLOW_QUERY_SECONDS", 1))
+# Время (в секундах), в течение которого факультеты и группы берутся из памяти без чтения базы данных
+REFERENCE_CACHE_TTL = float(os.getenv("REFERENCE_CACHE_TTL", 3600))
+# Кэши настроек пользователей и ведомостей студентов: время жизни записи (в секундах),
+# наибольшее число записей и примерный объем (в байтах) каждого кэша
+USER_CACHE_TTL = float(os.getenv("USER_CACHE_TTL", 300))
+USER_CACHE_MAX_ENTRIES = int(os.getenv("USER_CACHE_MAX_ENTRIES", 10000))
+USER_CACHE_MAX_BYTES = int(os.getenv("USER_CACHE_MAX_BYTES", 16777216))
+# Срок хранения отправленных уведомлений (в днях, 0 - хранить без ограничения)
+NOTIFICATION_RETENTION_DAYS = int(os.getenv("NOTIFICATION_RETENTION_DAYS", 30))
 
 # Пути к директориям
 BASE_DIR = os.path.dirname(os.path.abspath(__file__))
 EXPORT_DIR = os.path.join(BASE_DIR, "exports")
 
+# Архив исходных страниц сайта ВГУИТ для повторного разбора без обращения к сайту
+SNAPSHOT_ARCHIVE_ENABLED = os.getenv("SNAPSHOT_ARCHIVE_ENABLED", "False").lower() == "true"
+# Директория архива (относительный путь отсчитывается от директории проекта)
+SNAPSHOT_ARCHIVE_DIR = os.path.join(BASE_DIR, os.getenv("SNAPSHOT_ARCHIVE_DIR", "archive"))
+# Сжатие архива: zstd или zlib (по умолчанию zstd, если установлен пакет zstandard)
+SNAPSHOT_COMPRESSION = os.getenv("SNAPSHOT_COMPRESSION") or None
+
 # Создаем директорию для экспорта, если не существует
 os.makedirs(EXPORT_DIR, exist_ok=True)
\ No newline at end of file
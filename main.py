@@ -7,16 +7,19 @@ import asyncio
 import logging
 import os
 from datetime import datetime
+from typing import Optional
 from aiogram import Bot, Dispatcher
 from aiogram.fsm.storage.memory import MemoryStorage
 from apscheduler.schedulers.asyncio import AsyncIOScheduler
 
-from config import BOT_TOKEN, WEBHOOK_URL, WEBHOOK_PATH, WEBAPP_HOST, WEBAPP_PORT, USE_WEBHOOK
+from config import (BOT_TOKEN, WEBHOOK_URL, WEBHOOK_PATH, WEBAPP_HOST, WEBAPP_PORT, USE_WEBHOOK,
+                    NOTIFICATION_RETENTION_DAYS)
 from bot.handlers import register_all_handlers
 from bot.utils.message_utils import set_commands
 from bot.notification_service import check_and_send_notifications
-from database_manager import DatabaseManager
+from async_database_manager import AsyncDatabaseManager
 from data_updater import DataUpdater
+from parsers.async_vsuet_parser import AsyncVsuetParser, close_shared_connector
 
 # Настройка логирования
 logging.basicConfig(
@@ -29,11 +32,11 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
-# Создаем экземпляр базы данных
-db_manager = DatabaseManager()
-
-# Создаем экземпляр обновителя данных
-data_updater = DataUpdater()
+# База данных, общий парсер сайта ВГУИТ и обновитель данных создаются в main(): процессы
+# разбора страниц (см. parsers.parse_pool) импортируют этот модуль, и им они не нужны
+db_manager: Optional[AsyncDatabaseManager] = None
+parser: Optional[AsyncVsuetParser] = None
+data_updater: Optional[DataUpdater] = None
 
 
 async def on_startup(bot: Bot) -> None:
@@ -42,9 +45,12 @@ async def on_startup(bot: Bot) -> None:
     """
     await set_commands(bot)
 
+    # Заполнение данных миграций схемы выполняется в фоне, пока бот отвечает пользователям
+    db_manager.start_migrations()
+
     # Инициализация базы данных, если она еще не инициализирована
     # Проверяем наличие факультетов в базе
-    faculties = db_manager.get_faculties()
+    faculties = await db_manager.get_faculties()
     if not faculties:
         logger.info("База данных не инициализирована, запускаем инициализацию...")
         await data_updater.initialize_database()
@@ -57,8 +63,10 @@ async def on_shutdown(bot: Bot) -> None:
     Действия при остановке бота.
     """
     # Закрываем соединения с базой данных
-    db_manager.close()
-    data_updater.close()
+    await db_manager.close()
+    await data_updater.close()
+    await parser.close()
+    await close_shared_connector()
     logger.info("Соединения с базой данных закрыты")
 
     # Отключаем вебхук, если он был включен
@@ -76,20 +84,33 @@ async def scheduled_jobs(bot: Bot) -> None:
     await data_updater.update_outdated_vedomosti()
 
     # Отправка уведомлений пользователям
-    await check_and_send_notifications(bot, db_manager)
+    await check_and_send_notifications(bot, db_manager, data_updater)
+
+    # Удаление отправленных уведомлений старше срока хранения
+    if NOTIFICATION_RETENTION_DAYS:
+        await db_manager.delete_sent_notifications(NOTIFICATION_RETENTION_DAYS)
 
 
 async def main():
     """Основная функция для запуска бота"""
+    global db_manager, parser, data_updater
     logger.info("Запуск бота")
 
+    # Создаем экземпляр базы данных
+    db_manager = AsyncDatabaseManager()
+    # Общий парсер сайта ВГУИТ для обработчиков и обновителя данных
+    # (HTTP-сессия создается при первом запросе)
+    parser = AsyncVsuetParser()
+    # Создаем экземпляр обновителя данных
+    data_updater = DataUpdater(parser=parser)
+
     # Инициализация бота и диспетчера
     bot = Bot(token=BOT_TOKEN)
     storage = MemoryStorage()
     dp = Dispatcher(storage=storage)
 
     # Регистрация всех хендлеров
-    register_all_handlers(dp, db_manager)
+    register_all_handlers(dp, db_manager, parser)
 
     # Установка действий при запуске и остановке
     dp.startup.register(on_startup)
@@ -0,0 +1,685 @@
+"""
+Асинхронный парсер сайта ВГУИТ.
+
+Возвращает те же объекты, что и VsuetParser, но выполняет запросы через aiohttp
+и не блокирует цикл событий бота и обновителя данных.
+"""
+
+import zlib
+import time
+import asyncio
+import logging
+from dataclasses import dataclass
+from typing import List, Optional, Dict, Any, AsyncIterator, Awaitable, Callable, Collection, Iterable, Tuple, TypeVar
+from urllib.parse import urlsplit
+
+import aiohttp
+
+from config import (
+    VSUET_BASE_URL,
+    PARSER_POOL_SIZE,
+    PARSER_REQUEST_TIMEOUT,
+    PARSER_KEEPALIVE_TIMEOUT,
+    PARSER_FORM_STATE_TTL,
+    PARSER_SESSION_TTL,
+    PARSER_SINGLE_FLIGHT_TTL,
+    SNAPSHOT_ARCHIVE_ENABLED,
+    SNAPSHOT_ARCHIVE_DIR,
+    SNAPSHOT_COMPRESSION
+)
+from models.faculty import Faculty
+from models.group import Group
+from models.vedomosti import VedomostInfo
+from parsers.form_state import FormState, FormStateCache, is_state_rejected
+from parsers.http_cache import ConditionalRequestCache, ACCEPT_ENCODING, decode_body
+from parsers.parse_pool import ParsePool
+from parsers.single_flight import SingleFlight
+from parsers.snapshot_archive import SnapshotArchive
+from parsers.rate_limiter import HostRateLimiter, get_rate_limiter
+from parsers.resilience import (
+    RETRYABLE_STATUSES,
+    RetryPolicy,
+    call_with_retry,
+    get_circuit_breaker
+)
+from parsers.html_parsers import (
+    parse_faculties,
+    parse_groups,
+    parse_ved_list,
+    parse_detailed_ved
+)
+
+logger = logging.getLogger('AsyncVsuetParser')
+
+T = TypeVar('T')
+
+# Общий пул соединений для всех экземпляров парсера в рамках одного цикла событий
+_shared_connector: Optional[aiohttp.TCPConnector] = None
+_shared_connector_loop: Optional[asyncio.AbstractEventLoop] = None
+
+
+def _get_shared_connector() -> aiohttp.TCPConnector:
+    """
+    Получение общего ограниченного пула keep-alive соединений.
+
+    Returns:
+        aiohttp.TCPConnector: Пул соединений для текущего цикла событий
+    """
+    global _shared_connector, _shared_connector_loop
+
+    loop = asyncio.get_running_loop()
+    if _shared_connector is None or _shared_connector.closed or _shared_connector_loop is not loop:
+        _shared_connector = aiohttp.TCPConnector(
+            limit=PARSER_POOL_SIZE,
+            limit_per_host=PARSER_POOL_SIZE,
+            keepalive_timeout=PARSER_KEEPALIVE_TIMEOUT,
+            ttl_dns_cache=300
+        )
+        _shared_connector_loop = loop
+    return _shared_connector
+
+
+async def close_shared_connector() -> None:
+    """Закрытие общего пула соединений (при остановке приложения)."""
+    global _shared_connector, _shared_connector_loop
+
+    if _shared_connector is not None and not _shared_connector.closed:
+        await _shared_connector.close()
+    _shared_connector = None
+    _shared_connector_loop = None
+
+
+@dataclass
+class FetchedPage:
+    """
+    Необработанная страница, полученная с сервера.
+
+    Attributes:
+        content: Тело ответа (распакованное)
+        encoding: Кодировка ответа из заголовка Content-Type
+        status: HTTP-статус ответа
+        not_modified: Сервер ответил 304 - страница не изменилась с прошлого запроса
+        etag: Заголовок ETag ответа
+        last_modified: Заголовок Last-Modified ответа
+    """
+    content: bytes
+    encoding: Optional[str] = None
+    status: int = 200
+    not_modified: bool = False
+    etag: Optional[str] = None
+    last_modified: Optional[str] = None
+
+    def text(self) -> str:
+        """
+        Декодирование тела ответа.
+
+        Returns:
+            str: Текст страницы
+        """
+        return self.content.decode(self.encoding or 'utf-8', errors='replace')
+
+
+class AsyncVsuetParser:
+    """
+    Асинхронный клиент сайта ВГУИТ.
+
+    Каждый экземпляр хранит собственные cookies (сессию ASP.NET),
+    но использует общий пул соединений с ограничением на количество подключений.
+    Бот и обновитель данных используют один долгоживущий экземпляр; HTTP-сессия
+    создается при первом запросе.
+
+    Публичные методы возвращают пустой результат, если сервер ответил, но данных нет,
+    и выбрасывают VsuetUnavailableError, если сервер недоступен.
+    Одновременные одинаковые запросы объединяются в один, поэтому возвращаемые
+    объекты могут быть общими для нескольких вызывающих и не должны изменяться.
+    """
+
+    def __init__(self, base_url: str = VSUET_BASE_URL, request_timeout: float = PARSER_REQUEST_TIMEOUT,
+                 session_ttl: float = PARSER_SESSION_TTL, archive: Optional[SnapshotArchive] = None):
+        """
+        Инициализация парсера (без сетевых запросов).
+
+        Args:
+            base_url: Базовый URL для API ведомостей
+            request_timeout: Таймаут одного запроса в секундах
+            session_ttl: Время бездействия в секундах, после которого cookies сессии считаются истекшими
+            archive: Архив исходных страниц (по умолчанию создается, если включен SNAPSHOT_ARCHIVE_ENABLED)
+        """
+        self.base_url = base_url
+        self.timeout = aiohttp.ClientTimeout(total=request_timeout)
+        self.session: Optional[aiohttp.ClientSession] = None
+        # Блокировка создается в цикле событий при первом запросе
+        self._session_lock: Optional[asyncio.Lock] = None
+        # Время бездействия, после которого сервер забывает сессию ASP.NET
+        self.session_ttl = session_ttl
+        self._last_request_at: Optional[float] = None
+        # Скрытые поля формы Default.aspx из последнего ответа сервера
+        self.form_state = FormStateCache(ttl=PARSER_FORM_STATE_TTL)
+        # Отправки формы по адресу выполняются по одной (см. _post_form)
+        self._form_locks: Dict[str, asyncio.Lock] = {}
+        # Валидаторы ответов для условных запросов и статистика трафика
+        self.http_cache = ConditionalRequestCache()
+        self.retry_policy = RetryPolicy()
+        # Объединение одновременных одинаковых запросов от разных пользователей
+        self.single_flight = SingleFlight(ttl=PARSER_SINGLE_FLIGHT_TTL)
+        # Разбор страниц в отдельных процессах при массовом обходе
+        self.parse_pool = ParsePool()
+        # Архив исходных страниц (если включен)
+        if archive is None and SNAPSHOT_ARCHIVE_ENABLED:
+            archive = SnapshotArchive(SNAPSHOT_ARCHIVE_DIR, SNAPSHOT_COMPRESSION)
+        self.archive = archive
+
+    async def __aenter__(self) -> "AsyncVsuetParser":
+        await self._ensure_session()
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb) -> None:
+        await self.close()
+
+    async def _ensure_session(self) -> aiohttp.ClientSession:
+        """
+        Создание HTTP-сессии при первом обращении.
+
+        Отдельный запрос для получения cookies не выполняется: сервер выдает их
+        в ответе на первый реальный запрос.
+
+        Returns:
+            aiohttp.ClientSession: Открытая сессия
+        """
+        if self._session_lock is None:
+            self._session_lock = asyncio.Lock()
+
+        async with self._session_lock:
+            if self.session is None or self.session.closed:
+                # Сжатие согласуется явно и распаковывается вручную, чтобы учитывать объем трафика
+                self.session = aiohttp.ClientSession(
+                    connector=_get_shared_connector(),
+                    connector_owner=False,
+                    timeout=self.timeout,
+                    auto_decompress=False
+                )
+                self._last_request_at = None
+                logger.debug("Создана HTTP-сессия")
+            elif self._last_request_at is not None and \
+                    time.monotonic() - self._last_request_at > self.session_ttl:
+                # Сессия ASP.NET на сервере истекла: старые cookies и состояние формы недействительны
+                self.session.cookie_jar.clear()
+                self.form_state.invalidate()
+                logger.debug("Сессия ASP.NET истекла, cookies будут получены заново")
+        return self.session
+
+    async def _send(self, session: aiohttp.ClientSession, method: str, url: str,
+                    data: Optional[Dict[str, Any]] = None, conditional: bool = False,
+                    raise_for_status: bool = True, cached_form_state: bool = False) -> FetchedPage:
+        """
+        Выполнение запроса с явным согласованием сжатия и учетом трафика.
+
+        Все запросы проходят через общий для хоста ограничитель частоты и числа одновременных запросов.
+
+        Args:
+            session: HTTP-сессия
+            method: HTTP-метод
+            url: Адрес страницы
+            data: Поля формы для POST-запроса
+            conditional: Отправлять ли сохраненные валидаторы (If-None-Match/If-Modified-Since)
+            raise_for_status: Выбрасывать ли исключение при статусе ответа >= 400
+            cached_form_state: В форме отправлено сохраненное состояние ASP.NET (ответ 500 означает,
+                что сервер его отклонил, и не учитывается ограничителем как перегрузка)
+
+        Returns:
+            FetchedPage: Распакованное тело ответа (пустое при ответе 304)
+        """
+        headers = {'Accept-Encoding': ACCEPT_ENCODING}
+        if conditional:
+            headers.update(self.http_cache.request_headers(url))
+
+        rate_limiter = get_rate_limiter(urlsplit(url).netloc)
+        async with rate_limiter.request() as outcome, \
+                session.request(method, url, data=data, headers=headers) as response:
+            raw = await response.read()
+            outcome.status = response.status
+            if cached_form_state and response.status == 500:
+                outcome.overloaded = False
+            try:
+                content = decode_body(raw, response.headers.get('Content-Encoding'))
+            except (ValueError, zlib.error) as e:
+                raise aiohttp.ClientPayloadError(f"Не удалось распаковать ответ {url}: {e}")
+            self.http_cache.record_response(
+                url, response.status, response.headers, len(raw), len(content), conditional=conditional,
+                method=method
+            )
+            if raise_for_status or response.status in RETRYABLE_STATUSES:
+                response.raise_for_status()
+            return FetchedPage(
+                content=content,
+                encoding=response.charset,
+                status=response.status,
+                not_modified=response.status == 304,
+                etag=response.headers.get('ETag'),
+                last_modified=response.headers.get('Last-Modified')
+            )
+
+    async def _request(self, session: aiohttp.ClientSession, method: str, url: str,
+                       data: Optional[Dict[str, Any]] = None, conditional: bool = False,
+                       raise_for_status: bool = True, cached_form_state: bool = False) -> FetchedPage:
+        """
+        Выполнение запроса с повторными попытками при временных ошибках.
+
+        Args:
+            session: HTTP-сессия
+            method: HTTP-метод
+            url: Адрес страницы
+            data: Поля формы для POST-запроса
+            conditional: Отправлять ли сохраненные валидаторы
+            raise_for_status: Выбрасывать ли исключение при статусе ответа >= 400
+            cached_form_state: В форме отправлено сохраненное состояние ASP.NET
+
+        Returns:
+            FetchedPage: Распакованное тело ответа
+
+        Raises:
+            VsuetUnavailableError: Сервер не ответил после всех попыток или запросы к нему приостановлены
+        """
+        return await call_with_retry(
+            lambda: self._send(session, method, url, data, conditional, raise_for_status, cached_form_state),
+            get_circuit_breaker(urlsplit(url).netloc),
+            self.retry_policy
+        )
+
+    async def _fetch(self, method: str, url: str, data: Optional[Dict[str, Any]] = None,
+                     conditional: bool = False, raise_for_status: bool = True,
+                     cached_form_state: bool = False) -> FetchedPage:
+        """
+        Выполнение запроса в сессии парсера (сессия создается при первом обращении).
+
+        Args:
+            method: HTTP-метод
+            url: Адрес страницы
+            data: Поля формы для POST-запроса
+            conditional: Отправлять ли сохраненные валидаторы
+            raise_for_status: Выбрасывать ли исключение при статусе ответа >= 400
+            cached_form_state: В форме отправлено сохраненное состояние ASP.NET
+
+        Returns:
+            FetchedPage: Распакованное тело ответа
+
+        Raises:
+            VsuetUnavailableError: Сервер недоступен
+        """
+        session = await self._ensure_session()
+        page = await self._request(session, method, url, data, conditional, raise_for_status, cached_form_state)
+        self._last_request_at = time.monotonic()
+
+        if self.archive is not None and page.status == 200 and page.content:
+            await self._archive_page(url, page, data)
+        return page
+
+    async def _archive_page(self, url: str, page: FetchedPage, data: Optional[Dict[str, Any]]) -> None:
+        """
+        Сохранение полученной страницы в архив (ошибки архива не прерывают запрос).
+
+        Args:
+            url: Адрес страницы
+            page: Полученная страница
+            data: Поля формы POST-запроса
+        """
+        try:
+            await asyncio.to_thread(self.archive.store, url, page.content, page.encoding, data)
+        except OSError as e:
+            logger.warning(f"Не удалось сохранить страницу {url} в архив: {e}")
+
+    async def _post_form(self, fields: Dict[str, Any]) -> str:
+        """
+        Отправка формы Default.aspx с сохраненным состоянием ASP.NET.
+
+        Сначала используется __VIEWSTATE из предыдущего ответа сервера. Свежая страница
+        запрашивается через GET, только если состояния нет, оно устарело или сервер его отклонил;
+        после отклонения форма отправляется повторно один раз. Отправки формы выполняются
+        по одной: одновременные запросы перезаписывали бы общее состояние друг друга.
+
+        Args:
+            fields: Поля формы без скрытых полей ASP.NET
+
+        Returns:
+            str: Текст ответа
+
+        Raises:
+            aiohttp.ClientError: Сервер отклонил и свежее состояние формы или вернул ошибку
+        """
+        url = self.base_url + "Default.aspx"
+
+        async with self._form_lock(url):
+            # Сессия проверяется до чтения состояния формы: при истечении cookies оно сбрасывается
+            await self._ensure_session()
+            state = self.form_state.get()
+            if state is not None:
+                page = await self._submit_form(url, fields, state, cached_form_state=True)
+                html = page.text()
+                if not is_state_rejected(page.status, html):
+                    return self._accept_form_response(url, page.status, html)
+                logger.debug("Сервер отклонил сохраненное состояние формы, запрашиваем страницу заново")
+                self.form_state.invalidate()
+
+            html = (await self._fetch('GET', url)).text()
+            state = self.form_state.update(html)
+            if state is None:
+                raise aiohttp.ClientPayloadError("На странице не найдены скрытые поля формы")
+
+            page = await self._submit_form(url, fields, state)
+            html = page.text()
+            if is_state_rejected(page.status, html):
+                self.form_state.invalidate()
+                raise aiohttp.ClientError(f"Сервер отклонил состояние формы {url} (статус {page.status})")
+            return self._accept_form_response(url, page.status, html)
+
+    def _form_lock(self, url: str) -> asyncio.Lock:
+        """
+        Блокировка отправки формы, состояние которой хранится в общем кеше.
+
+        Args:
+            url: Адрес формы
+
+        Returns:
+            asyncio.Lock: Блокировка (создается в цикле событий при первом обращении)
+        """
+        lock = self._form_locks.get(url)
+        if lock is None:
+            lock = self._form_locks[url] = asyncio.Lock()
+        return lock
+
+    async def _submit_form(self, url: str, fields: Dict[str, Any], state: FormState,
+                           cached_form_state: bool = False) -> FetchedPage:
+        """
+        POST-запрос формы со скрытыми полями ASP.NET.
+
+        Args:
+            url: Адрес формы
+            fields: Поля формы без скрытых полей ASP.NET
+            state: Состояние формы
+            cached_form_state: Состояние взято из кеша (а не из только что полученной страницы)
+
+        Returns:
+            FetchedPage: Ответ сервера (без проверки статуса)
+        """
+        form_data = dict(fields)
+        form_data['__VIEWSTATE'] = state.viewstate
+        form_data['__EVENTVALIDATION'] = state.eventvalidation
+        return await self._fetch('POST', url, data=form_data, raise_for_status=False,
+                                 cached_form_state=cached_form_state)
+
+    def _accept_form_response(self, url: str, status: int, html: str) -> str:
+        """
+        Проверка статуса ответа на форму и сохранение нового состояния из него.
+
+        Args:
+            url: Адрес формы
+            status: HTTP-статус ответа
+            html: Текст ответа
+
+        Returns:
+            str: Текст ответа
+
+        Raises:
+            aiohttp.ClientError: Сервер вернул ошибку
+        """
+        if status >= 400:
+            raise aiohttp.ClientError(f"Сервер вернул статус {status} для {url}")
+        self.form_state.update(html)
+        return html
+
+    async def get_faculties(self) -> List[Faculty]:
+        """
+        Получение списка всех факультетов.
+
+        Returns:
+            List[Faculty]: Список объектов Faculty
+
+        Raises:
+            VsuetUnavailableError: Сервер недоступен
+        """
+        return await self.single_flight.do(('faculties',), self._load_faculties)
+
+    async def _load_faculties(self) -> List[Faculty]:
+        """Загрузка списка факультетов с сервера."""
+        try:
+            html = (await self._fetch('GET', self.base_url + "Default.aspx")).text()
+            self.form_state.update(html)
+
+            faculties = await self.parse_pool.run(parse_faculties, html)
+            if faculties is not None:
+                logger.info(f"Получено {len(faculties)} факультетов")
+                return faculties
+            else:
+                logger.warning("Не найден элемент выбора факультета")
+                return []
+
+        except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+            logger.error(f"Ошибка при получении списка факультетов: {e}")
+            return []
+
+    async def get_groups_by_faculty(self, faculty_id: str) -> List[Group]:
+        """
+        Получение списка групп для конкретного факультета.
+
+        Args:
+            faculty_id: ID факультета
+
+        Returns:
+            List[Group]: Список объектов Group
+
+        Raises:
+            VsuetUnavailableError: Сервер недоступен
+        """
+        return await self.single_flight.do(
+            ('groups', faculty_id), lambda: self._load_groups_by_faculty(faculty_id)
+        )
+
+    async def _load_groups_by_faculty(self, faculty_id: str) -> List[Group]:
+        """Загрузка списка групп факультета с сервера."""
+        try:
+            # Формирование POST-запроса для выбора факультета
+            form_data = {
+                '__EVENTTARGET': 'ctl00$ContentPage$cmbFacultets',
+                '__EVENTARGUMENT': '',
+                'ctl00$ContentPage$cmbFacultets': faculty_id
+            }
+
+            html = await self._post_form(form_data)
+
+            groups = await self.parse_pool.run(parse_groups, html, faculty_id)
+            if groups is not None:
+                logger.info(f"Получено {len(groups)} групп для факультета {faculty_id}")
+                return groups
+            else:
+                logger.warning(f"Не найден элемент выбора групп для факультета {faculty_id}")
+                return []
+
+        except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+            logger.error(f"Ошибка при получении списка групп: {e}")
+            return []
+
+    async def get_ved_list(self, group_id: str, year: str = "2024-2025", semester: str = "0") -> List[VedomostInfo]:
+        """
+        Получение списка ведомостей для конкретной группы.
+
+        Args:
+            group_id: ID группы
+            year: Учебный год (формат: "2024-2025")
+            semester: Семестр (0 - весна, 1 - осень)
+
+        Returns:
+            List[VedomostInfo]: Список объектов VedomostInfo
+
+        Raises:
+            VsuetUnavailableError: Сервер недоступен
+        """
+        return await self.single_flight.do(
+            ('ved_list', group_id, year, semester), lambda: self._load_ved_list(group_id, year, semester)
+        )
+
+    async def _load_ved_list(self, group_id: str, year: str, semester: str) -> List[VedomostInfo]:
+        """Загрузка списка ведомостей группы с сервера."""
+        try:
+            # Формирование POST-запроса для выбора группы и семестра
+            form_data = {
+                '__EVENTTARGET': 'ctl00$ContentPage$cmbGroups',
+                '__EVENTARGUMENT': '',
+                'ctl00$ContentPage$cmbGroups': group_id,
+                'ctl00$ContentPage$cmbYears': year,
+                'ctl00$ContentPage$cmbSem': semester
+            }
+
+            html = await self._post_form(form_data)
+
+            ved_list = await self.parse_pool.run(parse_ved_list, html, self.base_url, group_id, year, semester)
+            if ved_list is not None:
+                logger.info(f"Получено {len(ved_list)} ведомостей для группы {group_id}")
+                return ved_list
+            else:
+                logger.warning(f"Не найдена таблица ведомостей для группы {group_id}")
+                return []
+
+        except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+            logger.error(f"Ошибка при получении списка ведомостей: {e}")
+            return []
+
+    async def fetch_ved_page(self, ved_id: str, conditional: bool = False) -> Optional[FetchedPage]:
+        """
+        Загрузка страницы ведомости без разбора.
+
+        Args:
+            ved_id: ID ведомости
+            conditional: Выполнить условный запрос. Ответ 304 возвращается
+                как страница с not_modified=True и пустым содержимым, поэтому условный
+                запрос имеет смысл, только если разобранная версия страницы уже сохранена
+                (валидаторы сохраненной версии запоминает http_cache.store_validators)
+
+        Returns:
+            Optional[FetchedPage]: Страница ведомости или None в случае ошибки
+
+        Raises:
+            VsuetUnavailableError: Сервер недоступен
+        """
+        try:
+            return await self._fetch('GET', self.ved_url(ved_id), conditional=conditional)
+
+        except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+            logger.error(f"Ошибка при получении детальной информации о ведомости {ved_id}: {e}")
+            return None
+
+    async def get_detailed_ved(self, ved_id: str) -> Optional[dict]:
+        """
+        Получение детальной информации о ведомости.
+
+        Args:
+            ved_id: ID ведомости
+
+        Returns:
+            Optional[dict]: Словарь с информацией о ведомости или None в случае ошибки
+
+        Raises:
+            VsuetUnavailableError: Сервер недоступен
+        """
+        return await self.single_flight.do(('ved', ved_id), lambda: self._load_detailed_ved(ved_id))
+
+    async def _load_detailed_ved(self, ved_id: str) -> Optional[dict]:
+        """Загрузка и разбор страницы ведомости."""
+        page = await self.fetch_ved_page(ved_id)
+        if page is None:
+            return None
+
+        ved_info = await self.parse_pool.run(parse_detailed_ved, page.content, ved_id, page.encoding)
+
+        logger.info(f"Получена детальная информация о ведомости {ved_id}")
+        return ved_info
+
+    async def fetch_ved_pages(self, ved_ids: Iterable[str],
+                              conditional_ids: Collection[str] = ()) -> AsyncIterator[Tuple[str, Optional[FetchedPage]]]:
+        """
+        Одновременная загрузка нескольких страниц ведомостей без разбора.
+
+        Страницы отдаются по мере получения, а не в порядке ID. Частоту и число одновременных
+        запросов регулирует общий ограничитель хоста. Если перебор прерван, незавершенные
+        запросы отменяются.
+
+        Args:
+            ved_ids: ID ведомостей
+            conditional_ids: ID ведомостей, для которых выполняется условный запрос (см. fetch_ved_page)
+
+        Yields:
+            Tuple[str, Optional[FetchedPage]]: ID ведомости и страница (None в случае ошибки)
+
+        Raises:
+            VsuetUnavailableError: Сервер недоступен (оставшиеся запросы отменяются)
+        """
+        async for result in self._stream_by_id(
+                ved_ids, lambda ved_id: self.fetch_ved_page(ved_id, conditional=ved_id in conditional_ids)):
+            yield result
+
+    async def get_detailed_veds(self, ved_ids: Iterable[str]) -> AsyncIterator[Tuple[str, Optional[dict]]]:
+        """
+        Одновременное получение детальной информации о нескольких ведомостях.
+
+        Результаты отдаются по мере готовности, а не в порядке ID. Если перебор прерван,
+        незавершенные запросы отменяются.
+
+        Args:
+            ved_ids: ID ведомостей
+
+        Yields:
+            Tuple[str, Optional[dict]]: ID ведомости и информация о ней (None в случае ошибки)
+
+        Raises:
+            VsuetUnavailableError: Сервер недоступен (оставшиеся запросы отменяются)
+        """
+        async for result in self._stream_by_id(ved_ids, self.get_detailed_ved):
+            yield result
+
+    @staticmethod
+    async def _stream_by_id(ved_ids: Iterable[str],
+                            load: Callable[[str], Awaitable[T]]) -> AsyncIterator[Tuple[str, T]]:
+        """
+        Одновременное выполнение загрузок с выдачей результатов в порядке завершения.
+
+        Args:
+            ved_ids: ID ведомостей (повторяющиеся ID загружаются один раз)
+            load: Функция загрузки одной ведомости
+
+        Yields:
+            Tuple[str, T]: ID ведомости и результат загрузки
+        """
+        async def run(ved_id: str) -> Tuple[str, T]:
+            return ved_id, await load(ved_id)
+
+        tasks = [asyncio.ensure_future(run(ved_id)) for ved_id in dict.fromkeys(ved_ids)]
+        try:
+            for next_done in asyncio.as_completed(tasks):
+                yield await next_done
+        finally:
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+
+    @property
+    def rate_limiter(self) -> HostRateLimiter:
+        """Ограничитель запросов к серверу ВГУИТ."""
+        return get_rate_limiter(urlsplit(self.base_url).netloc)
+
+    def ved_url(self, ved_id: str) -> str:
+        """
+        Адрес страницы ведомости.
+
+        Args:
+            ved_id: ID ведомости
+
+        Returns:
+            str: URL страницы Ved.aspx
+        """
+        return f"{self.base_url}Ved.aspx?id={ved_id}"
+
+    async def close(self) -> None:
+        """Закрытие HTTP-сессии и пула разбора (общий пул соединений остается открытым)."""
+        if self.session is not None and not self.session.closed:
+            await self.session.close()
+        self.session = None
+        await self.parse_pool.close()
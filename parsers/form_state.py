@@ -0,0 +1,133 @@
+"""
+Кеш скрытых полей ASP.NET формы страницы Default.aspx.
+
+Сайт ВГУИТ требует передавать __VIEWSTATE и __EVENTVALIDATION в каждом POST-запросе.
+Значения из ответа на предыдущий POST остаются валидными, поэтому повторный GET
+страницы нужен только при первом обращении, по истечении времени жизни
+или когда сервер отклонил сохраненное состояние.
+"""
+
+import re
+import time
+import logging
+from dataclasses import dataclass
+from typing import Optional
+
+logger = logging.getLogger('FormStateCache')
+
+_VIEWSTATE_RE = re.compile(r'<input[^>]*\bid="__VIEWSTATE"[^>]*>', re.IGNORECASE)
+_EVENTVALIDATION_RE = re.compile(r'<input[^>]*\bid="__EVENTVALIDATION"[^>]*>', re.IGNORECASE)
+_VALUE_RE = re.compile(r'\bvalue="([^"]*)"', re.IGNORECASE)
+
+
+@dataclass
+class FormState:
+    """
+    Скрытые поля формы ASP.NET.
+
+    Attributes:
+        viewstate: Значение __VIEWSTATE
+        eventvalidation: Значение __EVENTVALIDATION
+        updated_at: Момент получения значений (time.monotonic)
+    """
+    viewstate: str
+    eventvalidation: str
+    updated_at: float
+
+
+def _extract_input_value(pattern: re.Pattern, html_content: str) -> Optional[str]:
+    """Извлечение атрибута value из тега input, найденного по шаблону."""
+    tag = pattern.search(html_content)
+    if not tag:
+        return None
+    value = _VALUE_RE.search(tag.group(0))
+    return value.group(1) if value else ''
+
+
+def extract_form_state(html_content: str) -> Optional[FormState]:
+    """
+    Извлечение скрытых полей формы без построения полного DOM-дерева.
+
+    Args:
+        html_content: HTML-контент страницы
+
+    Returns:
+        Optional[FormState]: Состояние формы или None, если поля не найдены
+    """
+    viewstate = _extract_input_value(_VIEWSTATE_RE, html_content)
+    if viewstate is None:
+        return None
+    eventvalidation = _extract_input_value(_EVENTVALIDATION_RE, html_content) or ''
+    return FormState(viewstate=viewstate, eventvalidation=eventvalidation, updated_at=time.monotonic())
+
+
+def is_state_rejected(status: int, html_content: str) -> bool:
+    """
+    Проверка, отклонил ли сервер переданное состояние формы.
+
+    Args:
+        status: HTTP-статус ответа
+        html_content: Текст ответа
+
+    Returns:
+        bool: True, если нужно получить свежее состояние через GET
+    """
+    # ASP.NET отвечает ошибкой 500 на устаревший или чужой __VIEWSTATE/__EVENTVALIDATION
+    if status == 500:
+        return True
+    if status >= 400:
+        return False
+    # Страница ошибки или перенаправление на главную без формы
+    return extract_form_state(html_content) is None
+
+
+class FormStateCache:
+    """Хранение последнего валидного состояния формы одной HTTP-сессии."""
+
+    def __init__(self, ttl: float = 600):
+        """
+        Инициализация кеша.
+
+        Args:
+            ttl: Время жизни сохраненного состояния в секундах
+        """
+        self.ttl = ttl
+        self._state: Optional[FormState] = None
+        self.hits = 0
+        self.misses = 0
+
+    def get(self) -> Optional[FormState]:
+        """
+        Получение сохраненного состояния, если оно еще не устарело.
+
+        Returns:
+            Optional[FormState]: Состояние формы или None
+        """
+        state = self._state
+        if state is None or time.monotonic() - state.updated_at > self.ttl:
+            self._state = None
+            self.misses += 1
+            return None
+        self.hits += 1
+        return state
+
+    def update(self, html_content: str) -> Optional[FormState]:
+        """
+        Сохранение скрытых полей из полученной страницы.
+
+        Args:
+            html_content: HTML-контент страницы
+
+        Returns:
+            Optional[FormState]: Новое состояние или None, если поля не найдены
+        """
+        state = extract_form_state(html_content)
+        if state is not None:
+            self._state = state
+        return state
+
+    def invalidate(self) -> None:
+        """Сброс сохраненного состояния."""
+        if self._state is not None:
+            logger.debug("Состояние формы сброшено")
+        self._state = None
@@ -0,0 +1,170 @@
+"""
+Функции разбора HTML-страниц сайта ВГУИТ.
+
+Используются асинхронным парсером (AsyncVsuetParser) и обновителем данных (DataUpdater),
+которые при массовом обходе выполняют разбор в процессах ParsePool. Поэтому функции не
+выполняют сетевых запросов, работают только с уже полученным содержимым страниц и
+возвращают объекты, которые можно передать между процессами.
+"""
+
+import re
+import logging
+from typing import Iterator, List, Optional, Tuple, Union
+
+from bs4 import BeautifulSoup
+
+from config import VED_PARSE_ENGINE, VED_PARSE_PARITY_CHECK
+from models.faculty import Faculty
+from models.group import Group
+from models.vedomosti import VedomostInfo
+from parsers.ved_engines import get_engine, parse_ved_content, parse_ved_stream, check_engine_parity
+
+logger = logging.getLogger(__name__)
+
+
+def parse_faculties(html_content: str) -> Optional[List[Faculty]]:
+    """
+    Разбор списка факультетов со страницы Default.aspx.
+
+    Args:
+        html_content: HTML-контент страницы
+
+    Returns:
+        Optional[List[Faculty]]: Список факультетов или None, если элемент выбора не найден
+    """
+    soup = BeautifulSoup(html_content, 'html.parser')
+
+    faculty_select = soup.find('select', {'id': 'ctl00_ContentPage_cmbFacultets'})
+    if not faculty_select:
+        return None
+
+    return [
+        Faculty(id=option['value'], name=option.text)
+        for option in faculty_select.find_all('option')
+    ]
+
+
+def parse_groups(html_content: str, faculty_id: str) -> Optional[List[Group]]:
+    """
+    Разбор списка групп из ответа на выбор факультета.
+
+    Args:
+        html_content: HTML-контент страницы
+        faculty_id: ID факультета
+
+    Returns:
+        Optional[List[Group]]: Список групп или None, если элемент выбора не найден
+    """
+    soup = BeautifulSoup(html_content, 'html.parser')
+
+    group_select = soup.find('select', {'id': 'ctl00_ContentPage_cmbGroups'})
+    if not group_select:
+        return None
+
+    return [
+        Group(id=option['value'], name=option.text, faculty_id=faculty_id)
+        for option in group_select.find_all('option')
+    ]
+
+
+def parse_ved_list(html_content: str, base_url: str, group_id: str, year: str,
+                   semester: str) -> Optional[List[VedomostInfo]]:
+    """
+    Разбор списка ведомостей из ответа на выбор группы.
+
+    Args:
+        html_content: HTML-контент страницы
+        base_url: Базовый URL для формирования ссылок на ведомости
+        group_id: ID группы
+        year: Учебный год (формат: "2024-2025")
+        semester: Семестр (0 - весна, 1 - осень)
+
+    Returns:
+        Optional[List[VedomostInfo]]: Список ведомостей или None, если таблица не найдена
+    """
+    soup = BeautifulSoup(html_content, 'html.parser')
+    ved_list = []
+
+    # Получаем название группы для добавления в объект ведомости
+    group_name = ""
+    group_info = soup.find('span', {'id': 'ctl00_ContentPage_lblName'})
+    if group_info:
+        match = re.search(r'>([^<]+)<a>', group_info.decode_contents())
+        if match:
+            group_name = match.group(1).strip()
+
+    ved_table = soup.find('table', {'id': 'ctl00_ContentPage_ucListVedBox_Grid'})
+    if not ved_table:
+        return None
+
+    rows = ved_table.find_all('tr')[1:]  # Пропускаем заголовок таблицы
+    for row in rows:
+        cells = row.find_all('td')
+        if len(cells) >= 3:
+            discipline_cell = cells[0]
+            discipline_link = discipline_cell.find('a')
+
+            discipline_name = discipline_cell.text.strip()
+            ved_type = cells[1].text.strip()
+            closed = cells[2].text.strip()
+
+            ved_url = None
+            ved_id = None
+            if discipline_link and 'href' in discipline_link.attrs:
+                href = discipline_link['href']
+                ved_url = base_url + href
+                match = re.search(r'id=(\d+)', href)
+                if match:
+                    ved_id = match.group(1)
+
+            ved_list.append(VedomostInfo(
+                id=ved_id,
+                discipline=discipline_name,
+                type=ved_type,
+                closed=closed,
+                url=ved_url,
+                group_id=group_id,
+                group_name=group_name,
+                year=year,
+                semester="Весна" if semester == "0" else "Осень"
+            ))
+
+    return ved_list
+
+
+def parse_detailed_ved(content: Union[bytes, str], ved_id: str, encoding: Optional[str] = None) -> dict:
+    """
+    Разбор страницы Ved.aspx с детальной информацией о ведомости.
+
+    Args:
+        content: Содержимое страницы (байты ответа или текст)
+        ved_id: ID ведомости
+        encoding: Кодировка байтового содержимого
+
+    Returns:
+        dict: Словарь с информацией о ведомости
+    """
+    ved_info = parse_ved_content(content, ved_id, encoding, get_engine(VED_PARSE_ENGINE))
+
+    if VED_PARSE_PARITY_CHECK:
+        differences = check_engine_parity(content, ved_id, encoding)
+        if differences:
+            logger.warning(f"Движки разбора дали разный результат для ведомости {ved_id}:\n" + "\n".join(differences))
+
+    return ved_info
+
+
+def parse_detailed_ved_stream(content: Union[bytes, str], ved_id: str,
+                              encoding: Optional[str] = None) -> Tuple[dict, Iterator[dict]]:
+    """
+    Потоковый разбор страницы Ved.aspx: записи студентов формируются по мере перебора.
+
+    Args:
+        content: Содержимое страницы (байты ответа или текст)
+        ved_id: ID ведомости
+        encoding: Кодировка байтового содержимого
+
+    Returns:
+        Tuple[dict, Iterator[dict]]: Информация о ведомости без студентов и итератор записей студентов
+    """
+    return parse_ved_stream(content, ved_id, encoding, get_engine(VED_PARSE_ENGINE))
@@ -0,0 +1,227 @@
+"""
+Условные запросы и учет трафика для запросов к сайту ВГУИТ.
+
+Для каждого URL хранятся валидаторы (ETag, Last-Modified) сохраненной версии страницы,
+которые отправляются в следующем запросе в заголовках If-None-Match/If-Modified-Since.
+Ответ 304 означает, что страница не изменилась. Если адрес (endpoint) не
+поддерживает валидаторы, условные запросы для него автоматически отключаются.
+"""
+
+import zlib
+import logging
+from dataclasses import dataclass
+from typing import Dict, Optional, Mapping
+from urllib.parse import urlsplit
+
+logger = logging.getLogger('HttpCache')
+
+try:
+    import brotli
+
+    BROTLI_AVAILABLE = True
+except ImportError:
+    BROTLI_AVAILABLE = False
+
+# Поддерживаемые способы сжатия ответа
+ACCEPT_ENCODING = "gzip, deflate, br" if BROTLI_AVAILABLE else "gzip, deflate"
+
+
+def decode_body(raw: bytes, content_encoding: Optional[str]) -> bytes:
+    """
+    Распаковка тела ответа в соответствии с заголовком Content-Encoding.
+
+    Args:
+        raw: Тело ответа в том виде, в котором оно пришло по сети
+        content_encoding: Значение заголовка Content-Encoding
+
+    Returns:
+        bytes: Распакованное тело ответа
+    """
+    encoding = (content_encoding or '').strip().lower()
+    if not raw or encoding in ('', 'identity'):
+        return raw
+    if encoding == 'gzip':
+        return zlib.decompress(raw, 16 + zlib.MAX_WBITS)
+    if encoding == 'deflate':
+        try:
+            return zlib.decompress(raw)
+        except zlib.error:
+            # Некоторые серверы отдают deflate без zlib-заголовка
+            return zlib.decompress(raw, -zlib.MAX_WBITS)
+    if encoding == 'br' and BROTLI_AVAILABLE:
+        return brotli.decompress(raw)
+    raise ValueError(f"Неподдерживаемое сжатие ответа: {content_encoding}")
+
+
+def endpoint_of(url: str) -> str:
+    """
+    Имя адреса без параметров запроса (например, "Ved.aspx").
+
+    Args:
+        url: Полный URL
+
+    Returns:
+        str: Имя страницы
+    """
+    path = urlsplit(url).path
+    return path.rsplit('/', 1)[-1] or path
+
+
+@dataclass
+class TransferStats:
+    """
+    Статистика запросов к одному адресу.
+
+    Attributes:
+        requests: Количество запросов
+        bytes_received: Объем полученных данных (в сжатом виде, как по сети)
+        bytes_decoded: Объем данных после распаковки
+        not_modified: Количество ответов 304
+    """
+    requests: int = 0
+    bytes_received: int = 0
+    bytes_decoded: int = 0
+    not_modified: int = 0
+
+
+@dataclass
+class _Validators:
+    """Валидаторы последнего ответа для одного URL."""
+    etag: Optional[str] = None
+    last_modified: Optional[str] = None
+
+
+class ConditionalRequestCache:
+    """Хранилище валидаторов ответов и статистики трафика."""
+
+    def __init__(self, max_unsupported_responses: int = 3):
+        """
+        Инициализация хранилища.
+
+        Args:
+            max_unsupported_responses: Количество ответов без поддержки валидаторов подряд,
+                после которого условные запросы к адресу отключаются
+        """
+        self.max_unsupported_responses = max_unsupported_responses
+        self._validators: Dict[str, _Validators] = {}
+        self._unsupported_streak: Dict[str, int] = {}
+        self._disabled_endpoints = set()
+        self.stats: Dict[str, TransferStats] = {}
+
+    def is_enabled(self, url: str) -> bool:
+        """
+        Проверка, используются ли условные запросы для адреса.
+
+        Args:
+            url: URL запроса
+
+        Returns:
+            bool: True, если условные запросы не отключены
+        """
+        return endpoint_of(url) not in self._disabled_endpoints
+
+    def request_headers(self, url: str) -> Dict[str, str]:
+        """
+        Заголовки условного запроса для URL.
+
+        Args:
+            url: URL запроса
+
+        Returns:
+            Dict[str, str]: Заголовки If-None-Match/If-Modified-Since (может быть пустым)
+        """
+        validators = self._validators.get(url)
+        if validators is None or not self.is_enabled(url):
+            return {}
+
+        headers = {}
+        if validators.etag:
+            headers['If-None-Match'] = validators.etag
+        if validators.last_modified:
+            headers['If-Modified-Since'] = validators.last_modified
+        return headers
+
+    def record_response(self, url: str, status: int, headers: Mapping[str, str], bytes_received: int,
+                        bytes_decoded: int, conditional: bool = False, method: str = 'GET') -> None:
+        """
+        Учет ответа сервера: статистика и проверка поддержки валидаторов адресом.
+
+        Валидаторы ответа здесь не сохраняются: ответ 304 означает "не изменилась с версии,
+        валидаторы которой отправлены", поэтому их сохраняет вызывающий через store_validators,
+        когда тело ответа сохранено (например, в базу данных). Иначе страница, загруженная
+        без сохранения, подменила бы валидаторы сохраненной версии. Поддержка валидаторов
+        адресом оценивается только по ответам на условные запросы.
+
+        Args:
+            url: URL запроса
+            status: HTTP-статус ответа
+            headers: Заголовки ответа
+            bytes_received: Размер тела ответа, полученного по сети
+            bytes_decoded: Размер тела ответа после распаковки
+            conditional: Был ли запрос условным
+            method: HTTP-метод запроса
+        """
+        endpoint = endpoint_of(url)
+        stats = self.stats.setdefault(endpoint, TransferStats())
+        stats.requests += 1
+        stats.bytes_received += bytes_received
+        stats.bytes_decoded += bytes_decoded
+
+        if status == 304:
+            stats.not_modified += 1
+            self._unsupported_streak[endpoint] = 0
+            return
+
+        if method != 'GET' or status != 200 or endpoint in self._disabled_endpoints:
+            return
+
+        etag = headers.get('ETag')
+        last_modified = headers.get('Last-Modified')
+
+        if conditional:
+            # Сервер не выдал валидаторов или проигнорировал их и вернул ту же версию страницы
+            previous = self._validators.get(url)
+            ignored = previous is not None and previous.etag is not None and previous.etag == etag
+            if (not etag and not last_modified) or ignored:
+                streak = self._unsupported_streak.get(endpoint, 0) + 1
+                self._unsupported_streak[endpoint] = streak
+                if streak >= self.max_unsupported_responses:
+                    self._disable(endpoint)
+                return
+            self._unsupported_streak[endpoint] = 0
+
+    def store_validators(self, url: str, etag: Optional[str], last_modified: Optional[str]) -> None:
+        """
+        Сохранение валидаторов версии страницы, тело которой сохранено вызывающим.
+
+        Args:
+            url: URL запроса
+            etag: Заголовок ETag ответа
+            last_modified: Заголовок Last-Modified ответа
+        """
+        if endpoint_of(url) in self._disabled_endpoints:
+            return
+        if etag or last_modified:
+            self._validators[url] = _Validators(etag=etag, last_modified=last_modified)
+        else:
+            self._validators.pop(url, None)
+
+    def _disable(self, endpoint: str) -> None:
+        """Отключение условных запросов для адреса."""
+        self._disabled_endpoints.add(endpoint)
+        for url in [url for url in self._validators if endpoint_of(url) == endpoint]:
+            del self._validators[url]
+        logger.info(f"Сервер не поддерживает условные запросы для {endpoint}, они отключены")
+
+    def format_stats(self) -> str:
+        """
+        Краткое текстовое описание статистики трафика.
+
+        Returns:
+            str: Статистика по каждому адресу
+        """
+        return "; ".join(
+            f"{endpoint}: запросов {stats.requests}, 304 - {stats.not_modified}, "
+            f"получено {stats.bytes_received} байт ({stats.bytes_decoded} после распаковки)"
+            for endpoint, stats in sorted(self.stats.items())
+        )
@@ -0,0 +1,133 @@
+"""
+Разбор HTML-страниц в отдельных процессах.
+
+При массовом обходе сайта (инициализация базы, обновление ведомостей всех групп)
+разбор страниц занимает процессор и блокирует цикл событий, в котором работает бот.
+Пул процессов принимает полученные страницы и возвращает уже разобранные данные
+(словари и объекты моделей), так что загрузка, разбор и запись в базу идут параллельно.
+
+Небольшие страницы и одиночные запросы пользователей разбираются в текущем процессе:
+передача данных в другой процесс для них дороже самого разбора.
+
+Процессы запускаются методом forkserver (spawn, где его нет), а не fork: копия
+многопоточного процесса бота могла бы унаследовать блокировки, захваченные другими
+потоками (потоки базы данных, журналирование). Такие процессы импортируют главный
+модуль программы, поэтому он не должен создавать объекты при импорте.
+"""
+
+import asyncio
+import logging
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Any, Callable, Iterator, Optional, TypeVar, Union
+
+from config import PARSER_PARSE_WORKERS, PARSER_PARSE_INLINE_BYTES
+
+logger = logging.getLogger('ParsePool')
+
+T = TypeVar('T')
+
+# Способ запуска процессов разбора
+_MP_CONTEXT = multiprocessing.get_context(
+    'forkserver' if 'forkserver' in multiprocessing.get_all_start_methods() else 'spawn')
+
+# Признак массового обхода; наследуется задачами, созданными внутри блока bulk()
+_bulk_mode: ContextVar[bool] = ContextVar('bulk_parsing', default=False)
+
+
+class ParsePool:
+    """Пул процессов для разбора страниц с запасным разбором в текущем процессе."""
+
+    def __init__(self, workers: int = PARSER_PARSE_WORKERS, inline_bytes: int = PARSER_PARSE_INLINE_BYTES):
+        """
+        Инициализация пула (процессы запускаются при первой задаче).
+
+        Args:
+            workers: Количество процессов разбора (0 - всегда разбирать в текущем процессе)
+            inline_bytes: Размер страницы в байтах, меньше которого она разбирается в текущем процессе
+        """
+        self.workers = workers
+        self.inline_bytes = inline_bytes
+        self._executor: Optional[ProcessPoolExecutor] = None
+        self.offloaded = 0
+        self.inline = 0
+
+    @contextmanager
+    def bulk(self) -> Iterator[None]:
+        """
+        Режим массового обхода: страницы, полученные внутри блока, разбираются в пуле процессов.
+
+        Режим передается задачам, созданным внутри блока (например, через asyncio.gather).
+        Число одновременных запросов при этом не ограничивается: его, как и частоту запросов,
+        регулирует ограничитель парсера.
+        """
+        token = _bulk_mode.set(True)
+        try:
+            yield
+        finally:
+            _bulk_mode.reset(token)
+
+    def should_offload(self, content: Union[bytes, str]) -> bool:
+        """Будет ли страница передана в пул процессов."""
+        return self.workers > 0 and _bulk_mode.get() and len(content) >= self.inline_bytes
+
+    def _get_executor(self) -> ProcessPoolExecutor:
+        """Получение пула процессов (создается при первом обращении)."""
+        if self._executor is None:
+            self._executor = ProcessPoolExecutor(max_workers=self.workers, mp_context=_MP_CONTEXT)
+            logger.info(f"Запущен пул разбора страниц: {self.workers} процессов")
+        return self._executor
+
+    async def run(self, func: Callable[..., T], content: Union[bytes, str], *args: Any) -> T:
+        """
+        Разбор страницы.
+
+        Функция разбора должна быть объявлена на уровне модуля, а ее аргументы и результат -
+        сериализуемы pickle, так как они передаются в другой процесс.
+
+        Args:
+            func: Функция разбора, первым аргументом принимающая содержимое страницы
+            content: Содержимое страницы (байты ответа или текст)
+            *args: Остальные аргументы функции разбора
+
+        Returns:
+            T: Результат функции разбора
+        """
+        if not self.should_offload(content):
+            self.inline += 1
+            return func(content, *args)
+
+        loop = asyncio.get_running_loop()
+        try:
+            result = await loop.run_in_executor(self._get_executor(), func, content, *args)
+        except BrokenProcessPool:
+            # Процесс разбора аварийно завершился: пул пересоздается при следующей задаче
+            logger.warning("Пул разбора страниц остановлен аварийно, страница разбирается в текущем процессе")
+            self._executor = None
+            self.inline += 1
+            return func(content, *args)
+
+        self.offloaded += 1
+        return result
+
+    def shutdown(self) -> None:
+        """Остановка процессов разбора с ожиданием их завершения (незапущенные задачи отменяются)."""
+        if self._executor is not None:
+            self._executor.shutdown(wait=True, cancel_futures=True)
+            self._executor = None
+
+    async def close(self) -> None:
+        """Остановка процессов разбора без блокировки цикла событий."""
+        await asyncio.to_thread(self.shutdown)
+
+    def format_stats(self) -> str:
+        """
+        Краткое текстовое описание статистики.
+
+        Returns:
+            str: Количество страниц, разобранных в пуле и в текущем процессе
+        """
+        return f"в пуле процессов {self.offloaded}, в текущем процессе {self.inline}"
@@ -0,0 +1,247 @@
+"""
+Адаптивное ограничение нагрузки на сервер ВГУИТ.
+
+Для каждого хоста используются два механизма:
+- token bucket ограничивает частоту запросов (запросов в секунду с допустимым всплеском);
+- AIMD-контроллер ограничивает число одновременных запросов: лимит растет на единицу
+  за каждое "окно" успешных быстрых ответов и уменьшается в разы при ошибках 5xx,
+  таймаутах и превышении целевой задержки.
+"""
+
+import time
+import asyncio
+import logging
+from contextlib import asynccontextmanager
+from dataclasses import dataclass
+from typing import Dict, Optional, AsyncIterator
+
+from config import (
+    PARSER_RATE_LIMIT,
+    PARSER_RATE_BURST,
+    PARSER_MIN_CONCURRENCY,
+    PARSER_POOL_SIZE,
+    PARSER_LATENCY_TARGET
+)
+
+logger = logging.getLogger('RateLimiter')
+
+
+class TokenBucket:
+    """Ограничение частоты запросов по алгоритму token bucket."""
+
+    def __init__(self, rate: float, capacity: float):
+        """
+        Инициализация ограничителя.
+
+        Args:
+            rate: Количество запросов в секунду
+            capacity: Максимальный размер всплеска запросов
+        """
+        self.rate = rate
+        self.capacity = capacity
+        self._tokens = capacity
+        self._updated_at = time.monotonic()
+
+    def _refill(self) -> None:
+        """Пополнение токенов за прошедшее время."""
+        now = time.monotonic()
+        self._tokens = min(self.capacity, self._tokens + (now - self._updated_at) * self.rate)
+        self._updated_at = now
+
+    async def acquire(self) -> float:
+        """
+        Ожидание свободного токена.
+
+        Returns:
+            float: Время ожидания в секундах
+        """
+        waited = 0.0
+        while True:
+            self._refill()
+            if self._tokens >= 1:
+                self._tokens -= 1
+                return waited
+            delay = (1 - self._tokens) / self.rate
+            waited += delay
+            await asyncio.sleep(delay)
+
+
+class AimdConcurrencyController:
+    """Ограничение числа одновременных запросов с аддитивным ростом и мультипликативным снижением."""
+
+    def __init__(self, min_limit: int, max_limit: int, latency_target: float,
+                 initial_limit: Optional[int] = None, backoff_ratio: float = 0.5):
+        """
+        Инициализация контроллера.
+
+        Args:
+            min_limit: Минимальное число одновременных запросов
+            max_limit: Максимальное число одновременных запросов
+            latency_target: Задержка ответа (в секундах), выше которой сервер считается перегруженным
+            initial_limit: Начальный лимит (по умолчанию - минимальный)
+            backoff_ratio: Множитель лимита при перегрузке
+        """
+        self.min_limit = min_limit
+        self.max_limit = max_limit
+        self.latency_target = latency_target
+        self.backoff_ratio = backoff_ratio
+        self.limit = float(initial_limit or min_limit)
+        self.in_flight = 0
+        self.decreases = 0
+        self._last_decrease = 0.0
+        self._condition = asyncio.Condition()
+
+    async def acquire(self) -> None:
+        """Ожидание свободного места в пределах текущего лимита."""
+        async with self._condition:
+            await self._condition.wait_for(lambda: self.in_flight < int(self.limit))
+            self.in_flight += 1
+
+    async def release(self, latency: float, overloaded: bool) -> None:
+        """
+        Освобождение места и корректировка лимита.
+
+        Args:
+            latency: Время выполнения запроса в секундах
+            overloaded: Получен сигнал перегрузки (5xx или таймаут)
+        """
+        async with self._condition:
+            self.in_flight -= 1
+
+            if overloaded or latency > self.latency_target:
+                # Снижаем лимит не чаще одного раза за целевое время ответа,
+                # чтобы пачка одновременных ошибок не обнулила его
+                now = time.monotonic()
+                if now - self._last_decrease >= self.latency_target:
+                    previous = int(self.limit)
+                    self.limit = max(float(self.min_limit), self.limit * self.backoff_ratio)
+                    self._last_decrease = now
+                    self.decreases += 1
+                    logger.info(f"Сервер перегружен, лимит одновременных запросов: {previous} -> {int(self.limit)}")
+            else:
+                # +1 к лимиту за каждые limit успешных ответов
+                self.limit = min(float(self.max_limit), self.limit + 1 / self.limit)
+
+            self._condition.notify_all()
+
+
+@dataclass
+class RequestOutcome:
+    """
+    Результат запроса, сообщаемый ограничителю.
+
+    Attributes:
+        status: HTTP-статус ответа (None, если ответ не получен)
+        overloaded: Является ли ответ сигналом перегрузки (None - определяется по статусу); например,
+            ответ 500 на отклоненное состояние формы ASP.NET о нагрузке на сервер не говорит
+    """
+    status: Optional[int] = None
+    overloaded: Optional[bool] = None
+
+
+class HostRateLimiter:
+    """Ограничитель запросов к одному хосту."""
+
+    def __init__(self, host: str, bucket: TokenBucket, controller: AimdConcurrencyController):
+        """
+        Инициализация ограничителя.
+
+        Args:
+            host: Имя хоста
+            bucket: Ограничитель частоты запросов
+            controller: Контроллер числа одновременных запросов
+        """
+        self.host = host
+        self.bucket = bucket
+        self.controller = controller
+        self.requests = 0
+        self.overloads = 0
+        self.throttled_seconds = 0.0
+
+    @asynccontextmanager
+    async def request(self) -> AsyncIterator[RequestOutcome]:
+        """
+        Выполнение одного запроса в пределах ограничений.
+
+        Внутри блока нужно записать HTTP-статус ответа в outcome.status. Если статус не записан
+        (исключение до получения ответа, таймаут), запрос считается сигналом перегрузки.
+
+        Yields:
+            RequestOutcome: Объект для передачи результата запроса
+        """
+        await self.controller.acquire()
+        try:
+            self.throttled_seconds += await self.bucket.acquire()
+        except BaseException:
+            await self.controller.release(0.0, overloaded=False)
+            raise
+
+        outcome = RequestOutcome()
+        request_started = time.monotonic()
+        cancelled = False
+        try:
+            yield outcome
+        except asyncio.CancelledError:
+            # Отмена запроса вызывающим кодом не говорит о состоянии сервера
+            cancelled = True
+            raise
+        finally:
+            latency = time.monotonic() - request_started
+            overloaded = not cancelled and (
+                outcome.overloaded if outcome.overloaded is not None
+                else outcome.status is None or outcome.status >= 500
+            )
+            self.requests += 1
+            if overloaded:
+                self.overloads += 1
+            await self.controller.release(latency, overloaded)
+
+    def format_stats(self) -> str:
+        """
+        Краткое текстовое описание состояния ограничителя.
+
+        Returns:
+            str: Состояние ограничителя
+        """
+        return (
+            f"{self.host}: запросов {self.requests}, перегрузок {self.overloads}, "
+            f"лимит одновременных запросов {int(self.controller.limit)}, "
+            f"ожидание токенов {self.throttled_seconds:.1f} с"
+        )
+
+
+# Ограничители по хостам, общие для всех экземпляров парсера в рамках одного цикла событий
+_limiters: Dict[str, HostRateLimiter] = {}
+_limiters_loop: Optional[asyncio.AbstractEventLoop] = None
+
+
+def get_rate_limiter(host: str) -> HostRateLimiter:
+    """
+    Получение ограничителя запросов для хоста.
+
+    Args:
+        host: Имя хоста
+
+    Returns:
+        HostRateLimiter: Ограничитель для текущего цикла событий
+    """
+    global _limiters_loop
+
+    loop = asyncio.get_running_loop()
+    if _limiters_loop is not loop:
+        _limiters.clear()
+        _limiters_loop = loop
+
+    limiter = _limiters.get(host)
+    if limiter is None:
+        limiter = HostRateLimiter(
+            host,
+            TokenBucket(PARSER_RATE_LIMIT, PARSER_RATE_BURST),
+            AimdConcurrencyController(
+                min_limit=PARSER_MIN_CONCURRENCY,
+                max_limit=PARSER_POOL_SIZE,
+                latency_target=PARSER_LATENCY_TARGET
+            )
+        )
+        _limiters[host] = limiter
+    return limiter
@@ -0,0 +1,229 @@
+"""
+Повторные попытки и автоматический выключатель (circuit breaker) для запросов к сайту ВГУИТ.
+
+Временные ошибки (обрыв соединения, таймаут, ответы 5xx) повторяются с экспоненциальной
+задержкой со случайным разбросом. Если сервер продолжает отвечать ошибками, выключатель
+размыкается, и следующие запросы сразу завершаются ошибкой VsuetUnavailableError без обращения
+к серверу. По истечении паузы выполняется один пробный запрос: при успехе выключатель замыкается.
+"""
+
+import time
+import random
+import asyncio
+import logging
+from typing import Awaitable, Callable, Dict, Optional, TypeVar
+
+import aiohttp
+
+from config import (
+    PARSER_RETRY_ATTEMPTS,
+    PARSER_RETRY_BASE_DELAY,
+    PARSER_RETRY_MAX_DELAY,
+    PARSER_BREAKER_THRESHOLD,
+    PARSER_BREAKER_RESET_TIMEOUT
+)
+
+logger = logging.getLogger('Resilience')
+
+T = TypeVar('T')
+
+# Статусы ответа, при которых запрос повторяется даже без проверки статуса вызывающим кодом
+RETRYABLE_STATUSES = frozenset({502, 503, 504})
+
+
+class VsuetUnavailableError(Exception):
+    """Сайт ВГУИТ недоступен: повторные попытки исчерпаны или выключатель разомкнут."""
+
+    def __init__(self, message: str, retry_after: Optional[float] = None):
+        """
+        Инициализация ошибки.
+
+        Args:
+            message: Описание ошибки
+            retry_after: Через сколько секунд имеет смысл повторить запрос (если известно)
+        """
+        super().__init__(message)
+        self.retry_after = retry_after
+
+
+def is_transient_error(error: BaseException) -> bool:
+    """
+    Проверка, является ли ошибка временной (запрос имеет смысл повторить).
+
+    Args:
+        error: Исключение, выброшенное при выполнении запроса
+
+    Returns:
+        bool: True для сетевых ошибок, таймаутов и ответов 5xx
+    """
+    if isinstance(error, aiohttp.ClientResponseError):
+        return error.status >= 500
+    return isinstance(error, (asyncio.TimeoutError, aiohttp.ClientConnectionError, aiohttp.ClientPayloadError))
+
+
+class RetryPolicy:
+    """Параметры повторных попыток с экспоненциальной задержкой."""
+
+    def __init__(self, attempts: int = PARSER_RETRY_ATTEMPTS, base_delay: float = PARSER_RETRY_BASE_DELAY,
+                 max_delay: float = PARSER_RETRY_MAX_DELAY):
+        """
+        Инициализация параметров.
+
+        Args:
+            attempts: Общее количество попыток
+            base_delay: Задержка перед первой повторной попыткой в секундах
+            max_delay: Максимальная задержка в секундах
+        """
+        self.attempts = max(1, attempts)
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+
+    def delay(self, attempt: int) -> float:
+        """
+        Задержка перед повторной попыткой ("full jitter").
+
+        Args:
+            attempt: Номер неудачной попытки, начиная с 0
+
+        Returns:
+            float: Задержка в секундах
+        """
+        return random.uniform(0, min(self.max_delay, self.base_delay * 2 ** attempt))
+
+
+class CircuitBreaker:
+    """Автоматический выключатель запросов к одному хосту."""
+
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+    def __init__(self, name: str, failure_threshold: int = PARSER_BREAKER_THRESHOLD,
+                 reset_timeout: float = PARSER_BREAKER_RESET_TIMEOUT):
+        """
+        Инициализация выключателя.
+
+        Args:
+            name: Имя защищаемого ресурса (для журнала)
+            failure_threshold: Количество ошибок подряд, после которого выключатель размыкается
+            reset_timeout: Время в секундах до пробного запроса после размыкания
+        """
+        self.name = name
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.state = self.CLOSED
+        self.failures = 0
+        self._opened_at = 0.0
+        self._probe_in_flight = False
+
+    def before_call(self) -> None:
+        """
+        Проверка возможности выполнить запрос.
+
+        Raises:
+            VsuetUnavailableError: Выключатель разомкнут
+        """
+        if self.state == self.CLOSED:
+            return
+
+        remaining = self._opened_at + self.reset_timeout - time.monotonic()
+        if self.state == self.OPEN and remaining <= 0:
+            self.state = self.HALF_OPEN
+            self._probe_in_flight = False
+
+        if self.state == self.HALF_OPEN and not self._probe_in_flight:
+            # Пропускаем один пробный запрос
+            self._probe_in_flight = True
+            return
+
+        raise VsuetUnavailableError(f"Сервер {self.name} недоступен", retry_after=max(remaining, 0.0))
+
+    def record_success(self) -> None:
+        """Учет успешного запроса."""
+        if self.state != self.CLOSED:
+            logger.info(f"Сервер {self.name} снова доступен")
+        self.state = self.CLOSED
+        self.failures = 0
+        self._probe_in_flight = False
+
+    def cancel_probe(self) -> None:
+        """Отмена пробного запроса без результата (следующий запрос станет пробным)."""
+        self._probe_in_flight = False
+
+    def record_failure(self) -> None:
+        """Учет неудачного запроса."""
+        self.failures += 1
+        if self.state == self.HALF_OPEN or (self.state == self.CLOSED and self.failures >= self.failure_threshold):
+            self.state = self.OPEN
+            self._opened_at = time.monotonic()
+            self._probe_in_flight = False
+            logger.warning(f"Сервер {self.name} недоступен, запросы приостановлены на {self.reset_timeout:.0f} с")
+
+
+async def call_with_retry(func: Callable[[], Awaitable[T]], breaker: CircuitBreaker,
+                          policy: Optional[RetryPolicy] = None) -> T:
+    """
+    Выполнение запроса с повторными попытками через выключатель.
+
+    Args:
+        func: Функция, выполняющая одну попытку запроса
+        breaker: Выключатель хоста
+        policy: Параметры повторных попыток
+
+    Returns:
+        T: Результат успешной попытки
+
+    Raises:
+        VsuetUnavailableError: Выключатель разомкнут или все попытки завершились временной ошибкой
+    """
+    policy = policy or RetryPolicy()
+    last_error: Optional[BaseException] = None
+
+    for attempt in range(policy.attempts):
+        breaker.before_call()
+        try:
+            result = await func()
+        except asyncio.CancelledError:
+            breaker.cancel_probe()
+            raise
+        except Exception as e:
+            if not is_transient_error(e):
+                # Сервер ответил, значит он доступен; ошибку обрабатывает вызывающий код
+                breaker.record_success()
+                raise
+            breaker.record_failure()
+            last_error = e
+        else:
+            breaker.record_success()
+            return result
+
+        if attempt + 1 < policy.attempts:
+            delay = policy.delay(attempt)
+            logger.debug(f"Временная ошибка запроса ({last_error!r}), повтор через {delay:.2f} с")
+            await asyncio.sleep(delay)
+
+    description = str(last_error) or type(last_error).__name__
+    raise VsuetUnavailableError(
+        f"Сервер {breaker.name} не ответил после {policy.attempts} попыток: {description}"
+    ) from last_error
+
+
+# Выключатели по хостам, общие для всех экземпляров парсера
+_breakers: Dict[str, CircuitBreaker] = {}
+
+
+def get_circuit_breaker(host: str) -> CircuitBreaker:
+    """
+    Получение выключателя для хоста.
+
+    Args:
+        host: Имя хоста
+
+    Returns:
+        CircuitBreaker: Выключатель хоста
+    """
+    breaker = _breakers.get(host)
+    if breaker is None:
+        breaker = CircuitBreaker(host)
+        _breakers[host] = breaker
+    return breaker
@@ -0,0 +1,111 @@
+"""
+Объединение одновременных одинаковых запросов (single flight).
+
+Если несколько пользователей одновременно запрашивают одни и те же данные
+(например, список ведомостей одной группы), к серверу уходит один запрос,
+а его результат получают все ожидающие. После завершения результат хранится
+еще несколько секунд, чтобы покрыть запросы, пришедшие чуть позже.
+"""
+
+import time
+import asyncio
+import logging
+from typing import Any, Awaitable, Callable, Dict, Hashable, Tuple, TypeVar
+
+logger = logging.getLogger('SingleFlight')
+
+T = TypeVar('T')
+
+
+class SingleFlight:
+    """Объединение одновременных вызовов с одинаковым ключом."""
+
+    def __init__(self, ttl: float = 5):
+        """
+        Инициализация.
+
+        Args:
+            ttl: Время в секундах, в течение которого результат отдается без нового запроса
+        """
+        self.ttl = ttl
+        self._in_flight: Dict[Hashable, asyncio.Future] = {}
+        # Количество ожидающих каждого выполняющегося вызова
+        self._waiters: Dict[asyncio.Future, int] = {}
+        self._results: Dict[Hashable, Tuple[float, Any]] = {}
+        self.calls = 0
+        self.shared = 0
+        self.cache_hits = 0
+
+    async def do(self, key: Hashable, func: Callable[[], Awaitable[T]]) -> T:
+        """
+        Выполнение функции или ожидание уже выполняющегося вызова с тем же ключом.
+
+        Результат общий для всех вызывающих и не должен изменяться. Пустые результаты
+        и исключения не сохраняются, но передаются всем ожидающим текущего вызова.
+        Вызов отменяется, когда отменены все его ожидающие.
+
+        Args:
+            key: Ключ запроса (адрес и параметры)
+            func: Функция, выполняющая запрос
+
+        Returns:
+            T: Результат функции
+        """
+        self.calls += 1
+
+        cached = self._results.get(key)
+        if cached is not None:
+            finished_at, result = cached
+            if time.monotonic() - finished_at <= self.ttl:
+                self.cache_hits += 1
+                return result
+            del self._results[key]
+
+        future = self._in_flight.get(key)
+        if future is not None:
+            self.shared += 1
+        else:
+            future = asyncio.ensure_future(func())
+            self._in_flight[key] = future
+            future.add_done_callback(lambda done: self._on_done(key, done))
+
+        self._waiters[future] = self._waiters.get(future, 0) + 1
+        try:
+            # shield: отмена одного из ожидающих не должна отменять запрос, нужный остальным
+            return await asyncio.shield(future)
+        finally:
+            self._waiters[future] -= 1
+            if not self._waiters[future]:
+                del self._waiters[future]
+                # Все ожидающие отменены - результат больше никому не нужен
+                if not future.done():
+                    future.cancel()
+
+    def _on_done(self, key: Hashable, future: asyncio.Future) -> None:
+        """Сохранение результата завершенного вызова."""
+        if self._in_flight.get(key) is future:
+            del self._in_flight[key]
+
+        if future.cancelled() or future.exception() is not None:
+            return
+
+        result = future.result()
+        if result and self.ttl > 0:
+            now = time.monotonic()
+            self._results[key] = (now, result)
+            self._prune(now)
+
+    def _prune(self, now: float) -> None:
+        """Удаление устаревших результатов."""
+        expired = [key for key, (finished_at, _) in self._results.items() if now - finished_at > self.ttl]
+        for key in expired:
+            del self._results[key]
+
+    def format_stats(self) -> str:
+        """
+        Краткое текстовое описание статистики.
+
+        Returns:
+            str: Статистика вызовов
+        """
+        return f"вызовов {self.calls}, объединено {self.shared}, из кеша {self.cache_hits}"
@@ -0,0 +1,210 @@
+"""
+Архив исходных HTML-страниц, полученных с сайта ВГУИТ.
+
+Страницы хранятся по адресу содержимого (SHA-256) в сжатом виде (zstd, если установлен
+пакет zstandard, иначе zlib), поэтому одинаковые ответы занимают место один раз.
+Индекс archive/index.jsonl связывает ключ запроса (URL и параметры формы) с хешем
+содержимого и временем получения. Архив позволяет разобрать страницы повторно
+после исправления парсера без обращения к сайту.
+"""
+
+import os
+import json
+import zlib
+import hashlib
+import logging
+import threading
+from dataclasses import dataclass, asdict, field
+from datetime import datetime
+from typing import Dict, Iterator, List, Optional
+from urllib.parse import urlencode
+
+logger = logging.getLogger('SnapshotArchive')
+
+try:
+    import zstandard
+
+    ZSTD_AVAILABLE = True
+except ImportError:
+    ZSTD_AVAILABLE = False
+
+# Скрытые поля формы ASP.NET меняются при каждом запросе и не входят в ключ
+_VOLATILE_FIELDS = {'__VIEWSTATE', '__EVENTVALIDATION'}
+
+_EXTENSIONS = {'zstd': '.zst', 'zlib': '.zz'}
+
+
+@dataclass
+class SnapshotEntry:
+    """
+    Запись индекса архива.
+
+    Attributes:
+        key: Ключ запроса (URL и значимые параметры формы)
+        url: Адрес страницы
+        digest: SHA-256 содержимого страницы
+        encoding: Кодировка ответа
+        fetched_at: Время получения страницы (ISO 8601)
+        params: Значимые поля формы POST-запроса
+    """
+    key: str
+    url: str
+    digest: str
+    encoding: Optional[str]
+    fetched_at: str
+    params: Dict[str, str] = field(default_factory=dict)
+
+
+def snapshot_key(url: str, params: Optional[Dict[str, str]] = None) -> str:
+    """
+    Ключ запроса для индекса архива.
+
+    Args:
+        url: Адрес страницы
+        params: Поля формы POST-запроса
+
+    Returns:
+        str: URL, дополненный значимыми параметрами формы
+    """
+    if not params:
+        return url
+    return f"{url}#{urlencode(sorted(params.items()))}"
+
+
+class SnapshotArchive:
+    """Сжатый архив страниц с адресацией по содержимому."""
+
+    def __init__(self, root_dir: str, compression: Optional[str] = None):
+        """
+        Инициализация архива.
+
+        Args:
+            root_dir: Директория архива
+            compression: Алгоритм сжатия новых страниц ("zstd" или "zlib"); по умолчанию zstd, если доступен
+        """
+        if compression is None:
+            compression = 'zstd' if ZSTD_AVAILABLE else 'zlib'
+        if compression == 'zstd' and not ZSTD_AVAILABLE:
+            logger.warning("Пакет zstandard не установлен, архив использует zlib")
+            compression = 'zlib'
+
+        self.root_dir = root_dir
+        self.compression = compression
+        self.objects_dir = os.path.join(root_dir, 'objects')
+        self.index_path = os.path.join(root_dir, 'index.jsonl')
+        self._lock = threading.Lock()
+        self._last_digest: Optional[Dict[str, str]] = None
+
+        os.makedirs(self.objects_dir, exist_ok=True)
+
+    def _object_path(self, digest: str, compression: str) -> str:
+        """Путь к файлу страницы в архиве."""
+        return os.path.join(self.objects_dir, digest[:2], digest + _EXTENSIONS[compression])
+
+    def _compress(self, content: bytes) -> bytes:
+        """Сжатие содержимого выбранным алгоритмом."""
+        if self.compression == 'zstd':
+            return zstandard.ZstdCompressor(level=10).compress(content)
+        return zlib.compress(content, 9)
+
+    def store(self, url: str, content: bytes, encoding: Optional[str] = None,
+              params: Optional[Dict[str, str]] = None) -> str:
+        """
+        Сохранение страницы в архив.
+
+        Args:
+            url: Адрес страницы
+            content: Тело ответа
+            encoding: Кодировка ответа
+            params: Поля формы POST-запроса
+
+        Returns:
+            str: SHA-256 содержимого страницы
+        """
+        digest = hashlib.sha256(content).hexdigest()
+        params = {name: str(value) for name, value in (params or {}).items() if name not in _VOLATILE_FIELDS}
+        key = snapshot_key(url, params)
+
+        with self._lock:
+            if not any(os.path.exists(self._object_path(digest, c)) for c in _EXTENSIONS):
+                path = self._object_path(digest, self.compression)
+                os.makedirs(os.path.dirname(path), exist_ok=True)
+                # Запись через временный файл, чтобы в архиве не оставалось обрезанных страниц
+                tmp_path = path + '.tmp'
+                with open(tmp_path, 'wb') as f:
+                    f.write(self._compress(content))
+                os.replace(tmp_path, path)
+
+            last_digest = self._load_last_digests()
+            if last_digest.get(key) != digest:
+                entry = SnapshotEntry(
+                    key=key,
+                    url=url,
+                    digest=digest,
+                    encoding=encoding,
+                    fetched_at=datetime.now().isoformat(),
+                    params=params
+                )
+                with open(self.index_path, 'a', encoding='utf-8') as f:
+                    f.write(json.dumps(asdict(entry), ensure_ascii=False) + '\n')
+                last_digest[key] = digest
+
+        return digest
+
+    def load(self, digest: str) -> bytes:
+        """
+        Чтение страницы из архива.
+
+        Args:
+            digest: SHA-256 содержимого страницы
+
+        Returns:
+            bytes: Содержимое страницы
+        """
+        zstd_path = self._object_path(digest, 'zstd')
+        if os.path.exists(zstd_path):
+            if not ZSTD_AVAILABLE:
+                raise RuntimeError(f"Для чтения {zstd_path} нужен пакет zstandard")
+            with open(zstd_path, 'rb') as f:
+                return zstandard.ZstdDecompressor().decompress(f.read())
+
+        with open(self._object_path(digest, 'zlib'), 'rb') as f:
+            return zlib.decompress(f.read())
+
+    def entries(self) -> Iterator[SnapshotEntry]:
+        """
+        Перебор всех записей индекса в порядке добавления.
+
+        Yields:
+            SnapshotEntry: Запись индекса
+        """
+        if not os.path.exists(self.index_path):
+            return
+        with open(self.index_path, 'r', encoding='utf-8') as f:
+            for line in f:
+                line = line.strip()
+                if not line:
+                    continue
+                try:
+                    yield SnapshotEntry(**json.loads(line))
+                except (ValueError, TypeError) as e:
+                    # Последняя строка может быть обрезана при аварийной остановке
+                    logger.warning(f"Пропущена поврежденная запись индекса архива: {e}")
+
+    def latest(self) -> List[SnapshotEntry]:
+        """
+        Последние версии всех сохраненных страниц.
+
+        Returns:
+            List[SnapshotEntry]: По одной записи на ключ запроса
+        """
+        latest: Dict[str, SnapshotEntry] = {}
+        for entry in self.entries():
+            latest[entry.key] = entry
+        return list(latest.values())
+
+    def _load_last_digests(self) -> Dict[str, str]:
+        """Хеши последних версий страниц по ключам (загружаются из индекса один раз)."""
+        if self._last_digest is None:
+            self._last_digest = {entry.key: entry.digest for entry in self.entries()}
+        return self._last_digest
@@ -0,0 +1,543 @@
+"""
+Движки разбора страницы Ved.aspx.
+
+Страница ведомости разбирается в два этапа: движок извлекает из HTML только нужные
+фрагменты (подписи ucVedBox_lbl* и таблицу ucVedBox_tblVed) в виде текстов ячеек,
+а общая функция build_ved_info формирует из них словарь ведомости.
+Поэтому все движки дают одинаковый результат, что проверяет check_engine_parity.
+
+Основной движок работает через lxml непосредственно с байтами ответа,
+BeautifulSoup остается запасным вариантом.
+"""
+
+import re
+import abc
+import hashlib
+import logging
+from dataclasses import dataclass, field
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple, Union
+
+from bs4 import BeautifulSoup
+
+logger = logging.getLogger('VedEngines')
+
+try:
+    import lxml.html
+
+    LXML_AVAILABLE = True
+except ImportError:
+    LXML_AVAILABLE = False
+    logger.warning("lxml не установлен. Для разбора ведомостей используется BeautifulSoup.")
+
+# Подписи с основной информацией о ведомости: ключ словаря -> ID элемента
+VED_LABELS = {
+    'group': 'ucVedBox_lblGroup',
+    'discipline': 'ucVedBox_lblDis',
+    'teacher': 'ucVedBox_lblPrep',
+    'hours': 'ucVedBox_lblHours',
+    'type': 'ucVedBox_lblTypeVed',
+    'block': 'ucVedBox_lblBlock',
+    'kurs': 'ucVedBox_lblKurs',
+    'semester': 'ucVedBox_lblSem',
+    'year': 'ucVedBox_lblYear',
+    'status': 'ucVedBox_lblStatus',
+    'date_update': 'ucVedBox_lblDateUpdate',
+    'department': 'ucVedBox_lblKafName',
+    'plan': 'ucVedBox_lblPlan',
+}
+
+_LABEL_PREFIX = 'ucVedBox_lbl'
+_STUDENT_ROW_CLASS_RE = re.compile(r'VedRow\d+')
+_ID_RE = re.compile(r'id=(\d+)')
+# Начало пользовательского элемента с ведомостью: все, что выше (head, __VIEWSTATE), не разбирается
+_VED_BOX_MARKER = b'ucVedBox_'
+# Скрытые поля формы меняются при каждом запросе и не влияют на содержимое ведомости
+_HIDDEN_INPUT_RE = re.compile(rb'<input[^>]*type="hidden"[^>]*>', re.IGNORECASE)
+
+
+@dataclass
+class RawStudentRow:
+    """
+    Строка таблицы студентов в виде текстов ячеек.
+
+    Attributes:
+        cells: Тексты всех ячеек строки
+        link_href: Ссылка на студента из второй ячейки
+        link_text: Текст ссылки на студента
+    """
+    cells: List[str]
+    link_href: Optional[str] = None
+    link_text: str = ''
+
+
+@dataclass
+class RawVedPage:
+    """
+    Фрагменты страницы Ved.aspx, необходимые для построения ведомости.
+
+    Attributes:
+        labels: Тексты подписей ucVedBox_lbl* по их ID
+        has_table: Найдена ли таблица ucVedBox_tblVed
+        kt_date_cells: Тексты ячеек VedRow1 строки ucVedBox_Row1
+        kt_header_offset: Номер столбца, с которого начинаются группы КТ (сумма colspan ячеек
+            строки ucVedBox_Row1 перед первой ячейкой VedRow1); None, если заголовок не найден
+        kt_header_spans: Ширина (colspan) каждой ячейки VedRow1, то есть число столбцов группы КТ
+        weight_cells: Тексты ячеек второй строки таблицы
+        student_rows: Строки таблицы с классом VedRowN (в потоковом режиме - однократно
+            перебираемый итератор, строки извлекаются по мере перебора)
+    """
+    labels: Dict[str, str] = field(default_factory=dict)
+    has_table: bool = False
+    kt_date_cells: List[str] = field(default_factory=list)
+    kt_header_offset: Optional[int] = None
+    kt_header_spans: List[int] = field(default_factory=list)
+    weight_cells: List[str] = field(default_factory=list)
+    student_rows: Iterable[RawStudentRow] = field(default_factory=list)
+
+
+class VedParseEngine(abc.ABC):
+    """Базовый класс движка разбора страницы ведомости."""
+
+    name = ''
+
+    @abc.abstractmethod
+    def extract(self, content: Union[bytes, str], encoding: Optional[str] = None,
+                stream: bool = False) -> RawVedPage:
+        """
+        Извлечение нужных фрагментов страницы.
+
+        Args:
+            content: Содержимое страницы (байты ответа или текст)
+            encoding: Кодировка байтового содержимого
+            stream: Извлекать строки студентов по мере перебора, не собирая их в список
+
+        Returns:
+            RawVedPage: Фрагменты страницы
+        """
+
+
+class BeautifulSoupVedEngine(VedParseEngine):
+    """Запасной движок на основе BeautifulSoup (html.parser)."""
+
+    name = 'bs4'
+
+    def extract(self, content: Union[bytes, str], encoding: Optional[str] = None,
+                stream: bool = False) -> RawVedPage:
+        if isinstance(content, bytes):
+            content = content.decode(encoding or 'utf-8', errors='replace')
+
+        soup = BeautifulSoup(content, 'html.parser')
+        page = RawVedPage()
+
+        for element in soup.find_all(id=re.compile('^' + _LABEL_PREFIX)):
+            page.labels.setdefault(element['id'], element.text.strip())
+
+        table = soup.find('table', {'id': 'ucVedBox_tblVed'})
+        if not table:
+            return page
+        page.has_table = True
+
+        kt_row = table.find('tr', {'id': 'ucVedBox_Row1'})
+        if kt_row:
+            _read_kt_header(
+                page,
+                ((cell.text.strip(), cell.get('colspan'), 'VedRow1' in cell.get('class', []))
+                 for cell in kt_row.find_all('td'))
+            )
+
+        rows = table.find_all('tr')
+        if len(rows) > 1:
+            page.weight_cells = [cell.text.strip() for cell in rows[1].find_all('td')]
+
+        student_rows = self._iter_student_rows(table)
+        page.student_rows = student_rows if stream else list(student_rows)
+        return page
+
+    @staticmethod
+    def _iter_student_rows(table) -> Iterator[RawStudentRow]:
+        """Извлечение строк студентов из таблицы ведомости."""
+        for row in table.find_all('tr', {'class': _STUDENT_ROW_CLASS_RE}):
+            cells = row.find_all('td')
+            raw_row = RawStudentRow(cells=[cell.text.strip() for cell in cells])
+            if len(cells) > 1:
+                link = cells[1].find('a')
+                if link:
+                    raw_row.link_href = link.get('href', '')
+                    raw_row.link_text = link.text.strip()
+            yield raw_row
+
+
+class LxmlVedEngine(VedParseEngine):
+    """
+    Быстрый движок на основе lxml.
+
+    Разбирает байты ответа начиная с первого элемента ucVedBox_*, пропуская
+    заголовок страницы и объемное поле __VIEWSTATE.
+    """
+
+    name = 'lxml'
+
+    def extract(self, content: Union[bytes, str], encoding: Optional[str] = None,
+                stream: bool = False) -> RawVedPage:
+        if isinstance(content, str):
+            encoding = 'utf-8'
+            content = content.encode(encoding)
+
+        start = content.find(_VED_BOX_MARKER)
+        if start > 0:
+            start = content.rfind(b'<', 0, start)
+            content = content[max(start, 0):]
+
+        parser = lxml.html.HTMLParser(encoding=encoding or 'utf-8')
+        root = lxml.html.document_fromstring(content, parser=parser)
+        page = RawVedPage()
+
+        for element in root.xpath('//*[starts-with(@id, $prefix)]', prefix=_LABEL_PREFIX):
+            page.labels.setdefault(element.get('id'), element.text_content().strip())
+
+        tables = root.xpath('//table[@id="ucVedBox_tblVed"]')
+        if not tables:
+            return page
+        table = tables[0]
+        page.has_table = True
+
+        kt_rows = table.xpath('.//tr[@id="ucVedBox_Row1"]')
+        if kt_rows:
+            _read_kt_header(
+                page,
+                ((cell.text_content().strip(), cell.get('colspan'), 'VedRow1' in cell.get('class', '').split())
+                 for cell in kt_rows[0].iter('td'))
+            )
+
+        rows = table.iter('tr')
+        next(rows, None)
+        weight_row = next(rows, None)
+        if weight_row is not None:
+            page.weight_cells = [cell.text_content().strip() for cell in weight_row.iter('td')]
+
+        student_rows = self._iter_student_rows(table)
+        page.student_rows = student_rows if stream else list(student_rows)
+        return page
+
+    @staticmethod
+    def _iter_student_rows(table) -> Iterator[RawStudentRow]:
+        """Извлечение строк студентов из таблицы ведомости."""
+        for row in table.iter('tr'):
+            if not any(_STUDENT_ROW_CLASS_RE.search(cls) for cls in row.get('class', '').split()):
+                continue
+            cells = list(row.iter('td'))
+            raw_row = RawStudentRow(cells=[cell.text_content().strip() for cell in cells])
+            if len(cells) > 1:
+                links = cells[1].xpath('.//a')
+                if links:
+                    raw_row.link_href = links[0].get('href', '')
+                    raw_row.link_text = links[0].text_content().strip()
+            yield raw_row
+
+
+def _read_kt_header(page: RawVedPage, cells: Iterable[Tuple[str, Optional[str], bool]]) -> None:
+    """
+    Разбор строки заголовка ucVedBox_Row1: даты КТ и расположение групп столбцов КТ.
+
+    Args:
+        page: Фрагменты страницы для заполнения
+        cells: Ячейки строки в виде (текст, значение colspan, является ли ячейка заголовком КТ)
+    """
+    column = 0
+    for text, colspan, is_kt in cells:
+        try:
+            span = max(int(colspan), 1) if colspan else 1
+        except ValueError:
+            span = 1
+
+        if is_kt:
+            if page.kt_header_offset is None:
+                page.kt_header_offset = column
+            page.kt_date_cells.append(text)
+            page.kt_header_spans.append(span)
+        column += span
+
+
+def content_digest(content: bytes) -> str:
+    """
+    Вычисление отпечатка содержательной части страницы Ved.aspx.
+
+    Учитывается только фрагмент начиная с первого элемента ucVedBox_*, а скрытые поля
+    формы отбрасываются, поэтому отпечаток меняется только при изменении ведомости.
+
+    Args:
+        content: Байты ответа сервера
+
+    Returns:
+        str: Шестнадцатеричный отпечаток
+    """
+    start = content.find(_VED_BOX_MARKER)
+    if start > 0:
+        content = content[content.rfind(b'<', 0, start):]
+    content = _HIDDEN_INPUT_RE.sub(b'', content)
+    return hashlib.blake2b(content, digest_size=16).hexdigest()
+
+
+_ENGINES = {
+    BeautifulSoupVedEngine.name: BeautifulSoupVedEngine,
+    LxmlVedEngine.name: LxmlVedEngine,
+}
+
+
+def get_engine(name: Optional[str] = None) -> VedParseEngine:
+    """
+    Получение движка разбора по имени.
+
+    Args:
+        name: Имя движка ('lxml' или 'bs4'); по умолчанию самый быстрый из доступных
+
+    Returns:
+        VedParseEngine: Экземпляр движка
+    """
+    if name is None:
+        name = LxmlVedEngine.name if LXML_AVAILABLE else BeautifulSoupVedEngine.name
+    if name == LxmlVedEngine.name and not LXML_AVAILABLE:
+        logger.warning("Движок lxml недоступен, используется BeautifulSoup")
+        name = BeautifulSoupVedEngine.name
+    if name not in _ENGINES:
+        raise ValueError(f"Неизвестный движок разбора ведомостей: {name}")
+    return _ENGINES[name]()
+
+
+@dataclass(frozen=True)
+class ColumnMap:
+    """
+    Номера столбцов строки студента.
+
+    Attributes:
+        record_book: Номер зачетной книжки
+        kt: Итоговые баллы по каждой КТ (первый столбец группы КТ)
+        final_rating: Итоговый рейтинг (None, если в строке нет такого столбца)
+        rating_grade: Оценка по рейтингу
+        exam_grade: Оценка за экзамен/зачет
+        final_grade: Итоговая оценка
+    """
+    record_book: int
+    kt: Tuple[int, ...]
+    final_rating: Optional[int]
+    rating_grade: int
+    exam_grade: int
+    final_grade: int
+
+
+# Расположение столбцов, если в таблице нет строки заголовка КТ
+_DEFAULT_KT_OFFSET = 7
+_DEFAULT_KT_GROUP_WIDTH = 5
+# Итоговые столбцы занимают последние пять ячеек строки
+_FINAL_COLUMNS = 5
+
+
+def compile_column_map(page: RawVedPage, width: int) -> ColumnMap:
+    """
+    Построение карты столбцов по заголовку таблицы для строк заданной длины.
+
+    Группы КТ берутся из строки ucVedBox_Row1 (начало и ширина каждой группы), итоговые
+    столбцы - из конца строки. Столбцы КТ, попадающие на итоговые, отбрасываются.
+
+    Args:
+        page: Фрагменты страницы
+        width: Количество ячеек в строке студента
+
+    Returns:
+        ColumnMap: Номера столбцов
+    """
+    final_start = width - _FINAL_COLUMNS
+
+    kt = []
+    if page.kt_header_offset is not None:
+        column = page.kt_header_offset
+        for span in page.kt_header_spans:
+            if column >= final_start:
+                break
+            kt.append(column)
+            column += span
+    else:
+        kt = list(range(_DEFAULT_KT_OFFSET, final_start, _DEFAULT_KT_GROUP_WIDTH))
+
+    return ColumnMap(
+        record_book=2,
+        kt=tuple(kt),
+        final_rating=final_start if width > _FINAL_COLUMNS else None,
+        rating_grade=width - 4,
+        exam_grade=width - 3,
+        final_grade=width - 2
+    )
+
+
+def build_ved_info(page: RawVedPage, ved_id: str) -> dict:
+    """
+    Построение словаря ведомости из извлеченных фрагментов страницы.
+
+    Args:
+        page: Фрагменты страницы
+        ved_id: ID ведомости
+
+    Returns:
+        dict: Словарь с информацией о ведомости
+    """
+    ved_info = build_ved_header(page, ved_id)
+    ved_info['students'] = list(iter_students(page))
+    return ved_info
+
+
+def build_ved_header(page: RawVedPage, ved_id: str) -> dict:
+    """
+    Построение словаря ведомости без списка студентов.
+
+    Args:
+        page: Фрагменты страницы
+        ved_id: ID ведомости
+
+    Returns:
+        dict: Словарь с информацией о ведомости (без ключа students)
+    """
+    ved_info = {'id': ved_id}
+    for key, element_id in VED_LABELS.items():
+        ved_info[key] = page.labels.get(element_id, '')
+
+    if not page.has_table:
+        return ved_info
+
+    # Даты КТ: отбрасываем пустые ячейки и ячейки с длинным текстом
+    ved_info['kt_dates'] = [text for text in page.kt_date_cells if text and len(text) <= 10]
+
+    # Веса КТ: значение находится в ячейке, следующей за подписью "Вес Точки"
+    kt_weights = []
+    for i, text in enumerate(page.weight_cells):
+        if "Вес Точки" in text and i + 1 < len(page.weight_cells):
+            kt_weights.append(page.weight_cells[i + 1])
+    ved_info['kt_weights'] = kt_weights
+
+    return ved_info
+
+
+def iter_students(page: RawVedPage) -> Iterator[dict]:
+    """
+    Построение записей студентов по мере перебора строк таблицы.
+
+    Args:
+        page: Фрагменты страницы
+
+    Yields:
+        dict: Информация о студенте
+    """
+    # Карта столбцов строится один раз для каждой встречающейся длины строки
+    column_maps: Dict[int, ColumnMap] = {}
+
+    for row in page.student_rows:
+        cells = row.cells
+        if len(cells) < 5:
+            continue
+
+        columns = column_maps.get(len(cells))
+        if columns is None:
+            columns = column_maps[len(cells)] = compile_column_map(page, len(cells))
+
+        student_id = None
+        if row.link_href:
+            match = _ID_RE.search(row.link_href)
+            if match:
+                student_id = match.group(1)
+
+        yield {
+            'id': student_id,
+            'name': row.link_text,
+            'record_book': cells[columns.record_book],
+            'kt_results': [cells[column] for column in columns.kt],
+            'final_rating': cells[columns.final_rating] if columns.final_rating is not None else '',
+            'rating_grade': cells[columns.rating_grade],
+            'exam_grade': cells[columns.exam_grade],
+            'final_grade': cells[columns.final_grade]
+        }
+
+
+def parse_ved_content(content: Union[bytes, str], ved_id: str, encoding: Optional[str] = None,
+                      engine: Optional[VedParseEngine] = None) -> dict:
+    """
+    Разбор страницы Ved.aspx выбранным движком.
+
+    Args:
+        content: Содержимое страницы
+        ved_id: ID ведомости
+        encoding: Кодировка байтового содержимого
+        engine: Движок разбора (по умолчанию самый быстрый из доступных)
+
+    Returns:
+        dict: Словарь с информацией о ведомости
+    """
+    engine = engine or get_engine()
+    return build_ved_info(engine.extract(content, encoding), ved_id)
+
+
+def parse_ved_stream(content: Union[bytes, str], ved_id: str, encoding: Optional[str] = None,
+                     engine: Optional[VedParseEngine] = None) -> Tuple[dict, Iterator[dict]]:
+    """
+    Потоковый разбор страницы Ved.aspx: студенты извлекаются по одному по мере перебора.
+
+    Дерево документа строится целиком, но записи студентов не накапливаются в памяти,
+    если потребитель (например, DatabaseManager.save_vedomost_details_stream) обрабатывает их по одной.
+
+    Args:
+        content: Содержимое страницы
+        ved_id: ID ведомости
+        encoding: Кодировка байтового содержимого
+        engine: Движок разбора (по умолчанию самый быстрый из доступных)
+
+    Returns:
+        Tuple[dict, Iterator[dict]]: Информация о ведомости без студентов и итератор записей студентов
+    """
+    engine = engine or get_engine()
+    page = engine.extract(content, encoding, stream=True)
+    return build_ved_header(page, ved_id), iter_students(page)
+
+
+def check_engine_parity(content: Union[bytes, str], ved_id: str, encoding: Optional[str] = None) -> List[str]:
+    """
+    Сравнение результатов всех доступных движков на одной странице.
+
+    Args:
+        content: Содержимое страницы
+        ved_id: ID ведомости
+        encoding: Кодировка байтового содержимого
+
+    Returns:
+        List[str]: Описание расхождений (пустой список, если результаты совпадают)
+    """
+    reference_name = BeautifulSoupVedEngine.name
+    reference = parse_ved_content(content, ved_id, encoding, get_engine(reference_name))
+    differences = []
+
+    for name in _ENGINES:
+        if name == reference_name or (name == LxmlVedEngine.name and not LXML_AVAILABLE):
+            continue
+        result = parse_ved_content(content, ved_id, encoding, get_engine(name))
+        differences.extend(_diff_results(reference, result, f"{reference_name}/{name}"))
+
+    return differences
+
+
+def _diff_results(expected: dict, actual: dict, label: str) -> List[str]:
+    """Построчное сравнение двух словарей ведомости."""
+    differences = []
+
+    for key in sorted(set(expected) | set(actual)):
+        if key == 'students':
+            continue
+        if expected.get(key) != actual.get(key):
+            differences.append(f"{label}: поле {key}: {expected.get(key)!r} != {actual.get(key)!r}")
+
+    expected_students = expected.get('students', [])
+    actual_students = actual.get('students', [])
+    if len(expected_students) != len(actual_students):
+        differences.append(f"{label}: количество студентов {len(expected_students)} != {len(actual_students)}")
+
+    for index, (left, right) in enumerate(zip(expected_students, actual_students)):
+        if left != right:
+            differences.append(f"{label}: студент #{index}: {left!r} != {right!r}")
+
+    return differences
@@ -0,0 +1,204 @@
+"""
+Кэш справочных данных (факультеты и группы) в памяти процесса.
+
+Списки факультетов и групп читаются при каждом построении клавиатуры, а меняются
+несколько раз за семестр. ReferenceCache хранит их вместе с индексами по ID и сбрасывается
+методами DatabaseManager, записывающими справочники. Кэш общий для всех экземпляров
+DatabaseManager одного файла базы в процессе (бот и обновитель данных работают через
+разные экземпляры); изменения, сделанные другим процессом, видны не позже чем через
+REFERENCE_CACHE_TTL секунд.
+"""
+
+import os
+import threading
+import time
+from dataclasses import dataclass, field
+from typing import Any, Callable, ClassVar, Dict, List, Optional, Tuple
+
+from config import REFERENCE_CACHE_TTL
+
+
+@dataclass
+class CacheStats:
+    """
+    Статистика обращений к кэшу.
+
+    Attributes:
+        hits: Количество обращений, обслуженных из памяти
+        misses: Количество обращений, потребовавших чтения из базы данных
+        invalidations: Количество сбросов кэша
+    """
+    hits: int = 0
+    misses: int = 0
+    invalidations: int = 0
+
+
+@dataclass(frozen=True)
+class ReferenceData:
+    """
+    Снимок справочных данных.
+
+    Attributes:
+        faculties: Факультеты (id, name) в порядке названий
+        groups: Группы (id, name, faculty_id) в порядке названий
+        faculties_by_id: Факультеты по ID
+        groups_by_id: Группы по ID
+        groups_by_faculty: Группы факультета по ID факультета (в порядке названий)
+        loaded_at: Время загрузки (по time.monotonic)
+    """
+    faculties: List[Dict[str, Any]]
+    groups: List[Dict[str, Any]]
+    faculties_by_id: Dict[str, Dict[str, Any]] = field(default_factory=dict)
+    groups_by_id: Dict[str, Dict[str, Any]] = field(default_factory=dict)
+    groups_by_faculty: Dict[str, List[Dict[str, Any]]] = field(default_factory=dict)
+    loaded_at: float = 0.0
+
+    @classmethod
+    def build(cls, faculties: List[Dict[str, Any]], groups: List[Dict[str, Any]]) -> 'ReferenceData':
+        """
+        Построение снимка и индексов.
+
+        Args:
+            faculties: Факультеты в порядке названий
+            groups: Группы в порядке названий
+
+        Returns:
+            ReferenceData: Снимок справочных данных
+        """
+        groups_by_faculty: Dict[str, List[Dict[str, Any]]] = {}
+        for group in groups:
+            groups_by_faculty.setdefault(group['faculty_id'], []).append(group)
+
+        return cls(
+            faculties=faculties,
+            groups=groups,
+            faculties_by_id={faculty['id']: faculty for faculty in faculties},
+            groups_by_id={group['id']: group for group in groups},
+            groups_by_faculty=groups_by_faculty,
+            loaded_at=time.monotonic()
+        )
+
+    # Выборки из снимка; DatabaseManager и AsyncDatabaseManager возвращают их под теми же именами
+
+    def get_faculties(self) -> List[Dict[str, Any]]:
+        """Копии всех факультетов в порядке названий."""
+        return [dict(faculty) for faculty in self.faculties]
+
+    def get_faculty(self, faculty_id: str) -> Optional[Dict[str, Any]]:
+        """Копия факультета по ID или None, если факультет не найден."""
+        faculty = self.faculties_by_id.get(faculty_id)
+        return dict(faculty) if faculty else None
+
+    def get_groups(self, faculty_id: Optional[str] = None) -> List[Dict[str, Any]]:
+        """Копии групп факультета (всех групп, если faculty_id не задан) в порядке названий."""
+        groups = self.groups_by_faculty.get(faculty_id, []) if faculty_id else self.groups
+        return [dict(group) for group in groups]
+
+    def get_group(self, group_id: str) -> Optional[Dict[str, Any]]:
+        """Копия группы по ID или None, если группа не найдена."""
+        group = self.groups_by_id.get(group_id)
+        return dict(group) if group else None
+
+
+class ReferenceCache:
+    """Справочные данные одного файла базы данных, загружаемые при первом обращении."""
+
+    _shared: ClassVar[Dict[str, 'ReferenceCache']] = {}
+    _shared_lock: ClassVar[threading.Lock] = threading.Lock()
+
+    def __init__(self, ttl: float = REFERENCE_CACHE_TTL):
+        """
+        Инициализация пустого кэша.
+
+        Args:
+            ttl: Время жизни снимка (в секундах, 0 - без кэширования)
+        """
+        self.ttl = ttl
+        self.stats = CacheStats()
+        self._data: Optional[ReferenceData] = None
+        # Номер сброса: снимок, загрузка которого началась до сброса, не сохраняется
+        self._generation = 0
+        self._lock = threading.Lock()
+
+    @classmethod
+    def for_database(cls, db_path: str) -> 'ReferenceCache':
+        """
+        Получение кэша, общего для всех экземпляров DatabaseManager файла базы данных.
+
+        Args:
+            db_path: Путь к файлу базы данных SQLite
+
+        Returns:
+            ReferenceCache: Кэш справочных данных
+        """
+        key = os.path.abspath(db_path)
+        with cls._shared_lock:
+            cache = cls._shared.get(key)
+            if cache is None:
+                cache = cls._shared[key] = cls()
+            return cache
+
+    def _fresh(self) -> Optional[ReferenceData]:
+        """Текущий снимок, если он загружен и не устарел."""
+        data = self._data
+        if data is not None and time.monotonic() - data.loaded_at < self.ttl:
+            return data
+        return None
+
+    def peek(self) -> Optional[ReferenceData]:
+        """
+        Получение снимка без обращения к базе данных.
+
+        Снимок проверяется и возвращается за одно обращение, поэтому его можно использовать
+        в цикле событий: если время жизни истечет сразу после проверки, вызывающий все равно
+        получит уже загруженные данные.
+
+        Returns:
+            Optional[ReferenceData]: Снимок или None, если он не загружен или устарел
+        """
+        data = self._fresh()
+        if data is not None:
+            with self._lock:
+                self.stats.hits += 1
+        return data
+
+    def get(self, load: Callable[[], Tuple[List[Dict[str, Any]], List[Dict[str, Any]]]]) -> ReferenceData:
+        """
+        Получение снимка справочных данных (при отсутствии или устаревании загружается через load).
+
+        Args:
+            load: Чтение факультетов и групп из базы данных (исключения передаются вызывающему)
+
+        Returns:
+            ReferenceData: Снимок справочных данных
+        """
+        data = self._fresh()
+        with self._lock:
+            if data is not None:
+                self.stats.hits += 1
+                return data
+            self.stats.misses += 1
+            generation = self._generation
+
+        data = ReferenceData.build(*load())
+        with self._lock:
+            if generation == self._generation:
+                self._data = data
+        return data
+
+    def invalidate(self) -> None:
+        """Сброс кэша после изменения справочных данных."""
+        with self._lock:
+            self._data = None
+            self._generation += 1
+            self.stats.invalidations += 1
+
+    def format_stats(self) -> str:
+        """
+        Краткое текстовое описание статистики.
+
+        Returns:
+            str: Количество попаданий, промахов и сбросов
+        """
+        return (f"попаданий {self.stats.hits}, промахов {self.stats.misses}, "
+                f"сбросов {self.stats.invalidations}")
@@ -0,0 +1,202 @@
+"""
+Ограниченный LRU-кэш с временем жизни записей для часто читаемых данных пользователей.
+
+Настройки пользователя читаются при каждой команде /start и /settings, а список ведомостей
+студента - при каждом поиске по номеру зачетной книжки. LRUCache хранит результаты этих
+запросов в памяти процесса; DatabaseManager сбрасывает записи при изменении данных.
+Объем кэша ограничен числом записей и примерным размером в байтах; кэш общий для всех
+экземпляров DatabaseManager одного файла базы в процессе.
+"""
+
+import os
+import sys
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Any, ClassVar, Dict, Hashable, Iterable, NamedTuple, Tuple
+
+from config import USER_CACHE_TTL, USER_CACHE_MAX_ENTRIES, USER_CACHE_MAX_BYTES
+from reference_cache import CacheStats
+
+# Значение, возвращаемое get при отсутствии записи (None - допустимое значение записи)
+MISSING = object()
+
+
+@dataclass
+class LRUStats(CacheStats):
+    """
+    Статистика обращений к LRU-кэшу.
+
+    Attributes:
+        evictions: Количество записей, вытесненных из-за ограничения объема
+        expirations: Количество записей, удаленных по истечении времени жизни
+    """
+    evictions: int = 0
+    expirations: int = 0
+
+
+class _Entry(NamedTuple):
+    """Запись кэша: значение, примерный размер (в байтах) и время истечения (по time.monotonic)."""
+    value: Any
+    size: int
+    expires_at: float
+
+
+def approximate_size(value: Any) -> int:
+    """
+    Примерный объем памяти, занимаемый значением (словари, списки, строки и числа).
+
+    Args:
+        value: Значение
+
+    Returns:
+        int: Размер в байтах
+    """
+    size = sys.getsizeof(value)
+    if isinstance(value, dict):
+        size += sum(approximate_size(key) + approximate_size(item) for key, item in value.items())
+    elif isinstance(value, (list, tuple)):
+        size += sum(approximate_size(item) for item in value)
+    return size
+
+
+class LRUCache:
+    """Кэш с вытеснением давно не использованных записей."""
+
+    _shared: ClassVar[Dict[Tuple[str, str], 'LRUCache']] = {}
+    _shared_lock: ClassVar[threading.Lock] = threading.Lock()
+
+    def __init__(self, max_entries: int = USER_CACHE_MAX_ENTRIES, max_bytes: int = USER_CACHE_MAX_BYTES,
+                 ttl: float = USER_CACHE_TTL):
+        """
+        Инициализация пустого кэша.
+
+        Args:
+            max_entries: Наибольшее количество записей
+            max_bytes: Наибольший суммарный примерный размер записей (в байтах)
+            ttl: Время жизни записи (в секундах, 0 - без кэширования)
+        """
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.ttl = ttl
+        self.stats = LRUStats()
+        self.size = 0
+        self._entries: 'OrderedDict[Hashable, _Entry]' = OrderedDict()
+        # Номер сброса: значение, прочитанное из базы до сброса, не сохраняется (см. put)
+        self.generation = 0
+        self._lock = threading.Lock()
+
+    @classmethod
+    def for_database(cls, db_path: str, name: str) -> 'LRUCache':
+        """
+        Получение кэша, общего для всех экземпляров DatabaseManager файла базы данных.
+
+        Args:
+            db_path: Путь к файлу базы данных SQLite
+            name: Назначение кэша (например, user_settings)
+
+        Returns:
+            LRUCache: Кэш
+        """
+        key = (os.path.abspath(db_path), name)
+        with cls._shared_lock:
+            cache = cls._shared.get(key)
+            if cache is None:
+                cache = cls._shared[key] = cls()
+            return cache
+
+    def get(self, key: Hashable) -> Any:
+        """
+        Получение значения.
+
+        Args:
+            key: Ключ
+
+        Returns:
+            Any: Значение или MISSING, если записи нет или ее время жизни истекло
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry.expires_at <= time.monotonic():
+                self._remove(key)
+                self.stats.expirations += 1
+                entry = None
+
+            if entry is None:
+                self.stats.misses += 1
+                return MISSING
+
+            self._entries.move_to_end(key)
+            self.stats.hits += 1
+            return entry.value
+
+    def put(self, key: Hashable, value: Any, generation: int) -> None:
+        """
+        Сохранение значения, прочитанного из базы данных.
+
+        Args:
+            key: Ключ
+            value: Значение (не должно изменяться после сохранения)
+            generation: Значение generation, прочитанное до запроса к базе данных; если с тех пор
+                кэш сбрасывался, значение могло устареть и не сохраняется
+        """
+        if self.ttl <= 0:
+            return
+        size = approximate_size(value)
+        if size > self.max_bytes:
+            return
+
+        with self._lock:
+            if generation != self.generation:
+                return
+            if key in self._entries:
+                self._remove(key)
+            self._entries[key] = _Entry(value, size, time.monotonic() + self.ttl)
+            self.size += size
+
+            while len(self._entries) > self.max_entries or self.size > self.max_bytes:
+                self._remove(next(iter(self._entries)))
+                self.stats.evictions += 1
+
+    def invalidate(self, keys: Iterable[Hashable]) -> None:
+        """
+        Сброс записей после изменения данных.
+
+        Args:
+            keys: Ключи
+        """
+        keys = list(keys)
+        if not keys:
+            # Данные не менялись: значения, читаемые сейчас из базы, можно сохранить
+            return
+
+        with self._lock:
+            self.generation += 1
+            for key in keys:
+                if key in self._entries:
+                    self._remove(key)
+                    self.stats.invalidations += 1
+
+    def clear(self) -> None:
+        """Сброс всех записей."""
+        with self._lock:
+            self.generation += 1
+            self.stats.invalidations += len(self._entries)
+            self._entries.clear()
+            self.size = 0
+
+    def _remove(self, key: Hashable) -> None:
+        """Удаление записи (вызывается под блокировкой)."""
+        self.size -= self._entries.pop(key).size
+
+    def format_stats(self) -> str:
+        """
+        Краткое текстовое описание статистики.
+
+        Returns:
+            str: Заполненность кэша и количество попаданий, промахов и удалений записей
+        """
+        return (f"{len(self._entries)} зап., {self.size // 1024} КБ, попаданий {self.stats.hits}, "
+                f"промахов {self.stats.misses}, сбросов {self.stats.invalidations}, "
+                f"вытеснено {self.stats.evictions}, истекло {self.stats.expirations}")
@@ -0,0 +1,181 @@
+"""
+Проверка AsyncVsuetParser на локальном HTTP-сервере.
+
+Отмена пакетной загрузки: сервер отвечает на Ved.aspx с задержкой, get_detailed_veds и
+fetch_ved_pages прерываются после первого результата и закрываются (aclose). После закрытия
+к серверу не должны уходить новые запросы и не должно оставаться незавершенных общих
+вызовов SingleFlight (например, если отмена ожидающего не отменяет сам запрос).
+
+Отправка формы Default.aspx: одновременные отправки не должны перезаписывать состояние
+ASP.NET друг друга, а отклоненное состояние запрашивается заново не более одного раза.
+"""
+
+import asyncio
+from contextlib import asynccontextmanager
+from typing import AsyncIterator, Dict, Tuple
+
+import pytest
+
+aiohttp = pytest.importorskip('aiohttp')
+web = pytest.importorskip('aiohttp.web')
+
+from parsers.async_vsuet_parser import AsyncVsuetParser, close_shared_connector
+from parsers.rate_limiter import get_rate_limiter
+
+# Количество ведомостей в пакете и задержка ответа сервера (в секундах)
+VEDOMOSTI = 30
+RESPONSE_DELAY = 0.3
+# Время доставки запросов, отправленных до закрытия генератора, и время последующего
+# наблюдения (в секундах)
+IN_TRANSIT_TIME = 0.2
+SETTLE_TIME = 1.0
+
+_PAGE = ('<html><body><span id="ucVedBox_lblDis">Дисциплина</span>'
+         '<table id="ucVedBox_tblVed"></table></body></html>')
+# Количество одновременных отправок формы
+POSTBACKS = 6
+
+
+def form_page(viewstate: str, body: str = '') -> str:
+    """Страница Default.aspx со скрытыми полями формы ASP.NET."""
+    return (f'<html><body><form><input type="hidden" name="__VIEWSTATE" id="__VIEWSTATE" value="{viewstate}" />'
+            f'<input type="hidden" name="__EVENTVALIDATION" id="__EVENTVALIDATION" value="v" />'
+            f'{body}</form></body></html>')
+
+
+@asynccontextmanager
+async def serve(app: web.Application) -> AsyncIterator[AsyncVsuetParser]:
+    """
+    Запуск локального сервера и парсера, настроенного на него.
+
+    Args:
+        app: Приложение сервера (страницы по адресам /web/Ved/...)
+
+    Yields:
+        AsyncVsuetParser: Парсер
+    """
+    runner = web.AppRunner(app)
+    await runner.setup()
+    site = web.TCPSite(runner, '127.0.0.1', 0)
+    await site.start()
+    port = site._server.sockets[0].getsockname()[1]
+
+    parser = AsyncVsuetParser(base_url=f'http://127.0.0.1:{port}/web/Ved/')
+    try:
+        yield parser
+    finally:
+        await parser.close()
+        await close_shared_connector()
+        await runner.cleanup()
+
+
+async def close_stream_early(method: str) -> Tuple[int, int, int]:
+    """
+    Прерывание перебора после первого результата и подсчет последующих запросов.
+
+    Args:
+        method: Метод AsyncVsuetParser, возвращающий генератор результатов по списку ID
+
+    Returns:
+        Tuple[int, int, int]: Запросов к серверу на момент закрытия генератора, запросов,
+            начатых после закрытия, и незавершенных общих вызовов SingleFlight
+    """
+    requests = 0
+
+    async def ved(request: web.Request) -> web.Response:
+        nonlocal requests
+        requests += 1
+        await asyncio.sleep(RESPONSE_DELAY)
+        return web.Response(text=_PAGE, content_type='text/html')
+
+    app = web.Application()
+    app.router.add_get('/web/Ved/Ved.aspx', ved)
+    async with serve(app) as parser:
+        results = getattr(parser, method)([f"{method}-{i}" for i in range(VEDOMOSTI)])
+        async for _ in results:
+            break
+        await results.aclose()
+        await asyncio.sleep(IN_TRANSIT_TIME)
+
+        started_at_close = requests
+        await asyncio.sleep(SETTLE_TIME)
+        return started_at_close, requests - started_at_close, len(parser.single_flight._in_flight)
+
+
+@pytest.mark.parametrize('method', ['get_detailed_veds', 'fetch_ved_pages'])
+def test_closing_stream_stops_requests(method: str) -> None:
+    started_at_close, started_after_close, in_flight = asyncio.run(close_stream_early(method))
+
+    assert 0 < started_at_close < VEDOMOSTI
+    assert started_after_close == 0
+    assert in_flight == 0
+
+
+def form_app(counters: Dict[str, int], accept: bool = True) -> web.Application:
+    """
+    Сервер формы Default.aspx, принимающий только последнее выданное состояние.
+
+    Каждый ответ выдает новое значение __VIEWSTATE; POST с любым другим значением получает
+    ответ 500, как у ASP.NET при чужом состоянии.
+
+    Args:
+        counters: Счетчики запросов (get, post, rejected)
+        accept: Принимать ли последнее выданное состояние
+
+    Returns:
+        web.Application: Приложение сервера
+    """
+    latest = {'viewstate': None}
+
+    def issue(body: str = '') -> web.Response:
+        latest['viewstate'] = f"s{counters['get'] + counters['post']}"
+        return web.Response(text=form_page(latest['viewstate'], body), content_type='text/html')
+
+    async def get(request: web.Request) -> web.Response:
+        counters['get'] += 1
+        return issue()
+
+    async def post(request: web.Request) -> web.Response:
+        counters['post'] += 1
+        data = await request.post()
+        # Запрос обрабатывается с задержкой, чтобы одновременные отправки пересекались
+        await asyncio.sleep(0.05)
+        if not accept or data['__VIEWSTATE'] != latest['viewstate']:
+            counters['rejected'] += 1
+            return web.Response(status=500, text='Invalid viewstate')
+        return issue(f"<p>{data['field']}</p>")
+
+    app = web.Application()
+    app.router.add_get('/web/Ved/Default.aspx', get)
+    app.router.add_post('/web/Ved/Default.aspx', post)
+    return app
+
+
+def test_concurrent_postbacks_do_not_invalidate_each_other() -> None:
+    counters = {'get': 0, 'post': 0, 'rejected': 0}
+
+    async def run() -> list:
+        async with serve(form_app(counters)) as parser:
+            return await asyncio.gather(*(parser._post_form({'field': f'value-{i}'}) for i in range(POSTBACKS)))
+
+    pages = asyncio.run(run())
+
+    assert [f'<p>value-{i}</p>' in html for i, html in enumerate(pages)] == [True] * POSTBACKS
+    assert counters == {'get': 1, 'post': POSTBACKS, 'rejected': 0}
+
+
+def test_rejected_state_is_refetched_once() -> None:
+    counters = {'get': 0, 'post': 0, 'rejected': 0}
+
+    async def run() -> int:
+        async with serve(form_app(counters, accept=False)) as parser:
+            parser.form_state.update(form_page('stale'))
+            with pytest.raises(aiohttp.ClientError):
+                await parser._post_form({'field': 'value'})
+            return get_rate_limiter(parser.base_url.split('/')[2]).overloads
+
+    overloads = asyncio.run(run())
+
+    # Сохраненное состояние, затем одно свежее; отклонение сохраненного не считается перегрузкой
+    assert counters == {'get': 1, 'post': 2, 'rejected': 2}
+    assert overloads == 1
@@ -0,0 +1,106 @@
+"""
+Проверка сохранения данных ведомости при обновлении списка ведомостей группы.
+
+Детали ведомости (с хешем страницы) сохраняются, после чего список ведомостей группы
+сохраняется повторно через DatabaseManager.save_vedomosti, как это делает обновление
+списков. Хеш страницы, детали, время проверки и результаты студентов не должны
+пропадать (например, если строка ведомости перезаписывается через INSERT OR REPLACE).
+"""
+
+from typing import Any, Dict, Iterator
+
+import pytest
+
+from database_manager import DatabaseManager
+
+VEDOMOST_ID = 'v1'
+CONTENT_HASH = 'content-hash'
+# Время последней проверки ведомости (в секундах Unix), отличное от времени сохранения списка
+LAST_CHECKED = 1
+
+
+@pytest.fixture
+def db_manager(tmp_path) -> Iterator[DatabaseManager]:
+    """Менеджер базы с сохраненными деталями ведомости VEDOMOST_ID."""
+    db_manager = DatabaseManager(str(tmp_path / 'upsert.db'))
+    db_manager.save_faculties([{'id': 'f', 'name': 'Факультет'}])
+    db_manager.save_groups([{'id': 'g', 'name': 'Группа'}], 'f')
+    db_manager.save_vedomosti([{'id': VEDOMOST_ID, 'discipline': 'Дисциплина', 'type': 'Экзамен'}], 'g')
+    saved = db_manager.save_vedomost_details(VEDOMOST_ID, {
+        'discipline': 'Дисциплина', 'type': 'Экзамен', 'teacher': 'Преподаватель', 'status': '',
+        'kt_dates': ['01.03'], 'students': [
+            {'id': str(i), 'name': f'Студент {i}', 'record_book': f'rb{i}', 'final_rating': '50',
+             'rating_grade': '4', 'exam_grade': '5', 'final_grade': '5', 'kt_results': ['10']}
+            for i in range(3)
+        ]
+    }, content_hash=CONTENT_HASH)
+    assert saved
+    db_manager.cursor.execute("UPDATE vedomosti SET last_checked = ? WHERE id = ?", (LAST_CHECKED, VEDOMOST_ID))
+    db_manager.connection.commit()
+    try:
+        yield db_manager
+    finally:
+        db_manager.close()
+
+
+def stored_vedomost(db_manager: DatabaseManager) -> Dict[str, Any]:
+    """Строка ведомости VEDOMOST_ID и количество результатов ее студентов."""
+    cursor = db_manager.cursor
+    cursor.execute("SELECT * FROM vedomosti WHERE id = ?", (VEDOMOST_ID,))
+    row = dict(cursor.fetchone())
+    cursor.execute("SELECT COUNT(*) FROM student_results WHERE vedomost_id = ?", (VEDOMOST_ID,))
+    row['student_results'] = cursor.fetchone()[0]
+    return row
+
+
+def test_saving_list_keeps_details(db_manager: DatabaseManager) -> None:
+    before = stored_vedomost(db_manager)
+    db_manager.save_vedomosti([{'id': VEDOMOST_ID, 'discipline': 'Новая дисциплина', 'type': 'Зачет'}], 'g')
+    after = stored_vedomost(db_manager)
+
+    for column in ('content_hash', 'details_json', 'last_checked', 'teacher'):
+        assert after[column] == before[column], column
+    assert after['student_results'] == before['student_results'] == 3
+    assert (after['discipline'], after['type']) == ('Новая дисциплина', 'Зачет')
+
+
+def test_saving_list_keeps_hash_for_conditional_update(db_manager: DatabaseManager) -> None:
+    # Без хеша обновление устаревших ведомостей не отправит условный запрос и не получит ответ 304
+    db_manager.save_vedomosti([{'id': VEDOMOST_ID, 'discipline': 'Новая дисциплина', 'type': 'Зачет'}], 'g')
+    stored_hashes = {ved['id']: ved['content_hash'] for ved in db_manager.get_vedomosti_to_update()}
+
+    assert stored_hashes.get(VEDOMOST_ID) == CONTENT_HASH
+
+
+def kt_rows(db_manager: DatabaseManager) -> Dict[str, Any]:
+    """Результаты КТ ведомости VEDOMOST_ID из kt_results по студентам."""
+    db_manager.cursor.execute(
+        "SELECT student_id, kt_index, score, raw FROM kt_results WHERE vedomost_id = ? "
+        "ORDER BY student_id, kt_index", (VEDOMOST_ID,))
+    rows: Dict[str, Any] = {}
+    for row in db_manager.cursor.fetchall():
+        rows.setdefault(row['student_id'], []).append((row['kt_index'], row['score'], row['raw']))
+    return rows
+
+
+def test_kt_results_are_written_for_changed_students(db_manager: DatabaseManager) -> None:
+    assert kt_rows(db_manager) == {str(i): [(0, 10.0, '10')] for i in range(3)}
+
+    details = db_manager.get_vedomost_details(VEDOMOST_ID)
+    for student in details['students']:
+        student['id'] = student['student_id']
+    details['students'][0]['kt_results'] = ['12,5', 'н/я']
+    traced = []
+    db_manager.connection.set_trace_callback(traced.append)
+    try:
+        assert db_manager.save_vedomost_details(VEDOMOST_ID, details)
+    finally:
+        db_manager.connection.set_trace_callback(None)
+
+    changed = details['students'][0]['student_id']
+    expected = {str(i): [(0, 10.0, '10')] for i in range(3)}
+    expected[changed] = [(0, 12.5, '12,5'), (1, None, 'н/я')]
+    assert kt_rows(db_manager) == expected
+    # Результаты КТ остальных студентов не перезаписываются
+    assert sum('INSERT INTO kt_results' in sql for sql in traced) == 2
+    assert db_manager.get_kt_statistics(VEDOMOST_ID)[0]['max_score'] == 12.5
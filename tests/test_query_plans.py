@@ -0,0 +1,215 @@
+"""
+Проверка планов запросов DatabaseManager.
+
+На синтетической базе данных размером с факультетский обход вызываются методы
+DatabaseManager; выполняемые ими запросы перехватываются, и для каждого через
+EXPLAIN QUERY PLAN проверяется, что горячий запрос не читает таблицу целиком (SCAN без
+индекса), например после удаления или изменения индекса.
+
+Факультеты и группы читаются целиком загрузчиком кэша справочников (раз в
+REFERENCE_CACHE_TTL секунд); его запросы проверяются отдельно.
+"""
+
+import re
+import time
+from typing import Callable, Dict, Iterator, List, Tuple
+
+import pytest
+
+from database_manager import DatabaseManager, pack_kt_results
+
+# Полный просмотр таблицы; "SCAN t USING INDEX" и "SCAN t USING COVERING INDEX" к ним не относятся
+_FULL_SCAN_RE = re.compile(r'^SCAN (\w+)$|^SCAN (\w+) (?!USING )')
+# Запросы, читающие таблицы; INSERT ... VALUES без SELECT таблиц не читает
+_AUDITED_STATEMENT_RE = re.compile(r'^\s*(SELECT|UPDATE|DELETE|WITH|INSERT\b.*\bSELECT)\b', re.IGNORECASE | re.DOTALL)
+
+# Размер синтетической базы
+FACULTIES = 10
+GROUPS_PER_FACULTY = 50
+VEDOMOSTI_PER_GROUP = 10
+STUDENTS_PER_GROUP = 25
+USERS = 2000
+NOTIFICATIONS = 5000
+
+GROUP_ID = 'g3_7'
+VEDOMOST_ID = f'{GROUP_ID}_v2'
+STUDENT_ID = f'{GROUP_ID}_s5'
+RECORD_BOOK = f'rb_{STUDENT_ID}'
+
+
+def build_synthetic_db(db_manager: DatabaseManager) -> None:
+    """
+    Заполнение базы синтетическими данными.
+
+    Args:
+        db_manager: Менеджер пустой базы данных
+    """
+    cursor = db_manager.cursor
+    now = int(time.time())
+
+    faculties = [(f'f{f}', f'Факультет {f}', now) for f in range(FACULTIES)]
+    groups = [(f'g{f}_{g}', f'Группа {f}-{g}', f'f{f}', now)
+              for f in range(FACULTIES) for g in range(GROUPS_PER_FACULTY)]
+    cursor.executemany("INSERT INTO faculties (id, name, last_updated) VALUES (?, ?, ?)", faculties)
+    cursor.executemany("INSERT INTO groups (id, name, faculty_id, last_updated) VALUES (?, ?, ?, ?)", groups)
+
+    vedomosti = []
+    students = []
+    results = []
+    kt_packed = pack_kt_results(['10', '20'])
+    for group_index, (group_id, _, _, _) in enumerate(groups):
+        group_students = [f'{group_id}_s{s}' for s in range(STUDENTS_PER_GROUP)]
+        students.extend((student_id, f'rb_{student_id}', f'Студент {student_id}', group_id)
+                        for student_id in group_students)
+        for v in range(VEDOMOSTI_PER_GROUP):
+            ved_id = f'{group_id}_v{v}'
+            last_checked = 0 if (group_index + v) % 7 == 0 else now - (group_index + v) % 48 * 3600
+            vedomosti.append((ved_id, f'Дисциплина {v}', 'Экзамен', group_id, '2024-2025', '0', last_checked))
+            results.extend((student_id, ved_id, '70', '4', '4', '4', kt_packed, 70, 4, 4, 4, now)
+                           for student_id in group_students)
+
+    cursor.executemany(
+        "INSERT INTO vedomosti (id, discipline, type, group_id, year, semester, last_checked) "
+        "VALUES (?, ?, ?, ?, ?, ?, ?)", vedomosti)
+    cursor.executemany("INSERT INTO students (student_id, record_book, name, group_id) VALUES (?, ?, ?, ?)",
+                       students)
+    cursor.executemany(
+        "INSERT INTO student_results (student_id, vedomost_id, final_rating, rating_grade, exam_grade, "
+        "final_grade, kt_packed, final_rating_value, rating_grade_value, exam_grade_value, final_grade_value, "
+        "last_updated) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)", results)
+
+    subscribers = []
+    for user_id, (_, record_book, _, group_id) in zip(range(USERS), students):
+        faculty_id = 'f' + group_id.split('_')[0][1:]
+        subscribers.append((user_id, faculty_id, group_id, record_book, user_id % 3 != 0))
+    cursor.executemany(
+        "INSERT INTO user_settings (telegram_user_id, faculty_id, group_id, record_book, notify_enabled) "
+        "VALUES (?, ?, ?, ?, ?)", subscribers)
+    cursor.executemany(
+        "INSERT INTO notifications (telegram_user_id, student_id, vedomost_id, old_grade, new_grade, "
+        "created_at, sent) VALUES (?, ?, ?, '3', '4', ?, ?)",
+        [(n % USERS, results[n][0], results[n][1], now - n * 60, n % 10 != 0)
+         for n in range(NOTIFICATIONS)])
+    db_manager.connection.commit()
+
+
+@pytest.fixture(scope='module')
+def db_manager(tmp_path_factory) -> Iterator[DatabaseManager]:
+    """Менеджер заполненной синтетической базы данных."""
+    db_manager = DatabaseManager(str(tmp_path_factory.mktemp('audit') / 'audit.db'))
+    build_synthetic_db(db_manager)
+    try:
+        yield db_manager
+    finally:
+        db_manager.close()
+
+
+def save_changed_details(db_manager: DatabaseManager) -> None:
+    """Повторное сохранение ведомости с измененными оценками всех студентов."""
+    details = db_manager.get_vedomost_details(VEDOMOST_ID)
+    for student in details['students']:
+        student['id'] = student['student_id']
+        student['final_grade'] = '5'
+    db_manager.save_vedomost_details(VEDOMOST_ID, details)
+
+
+# Вызовы DatabaseManager, выполняемые ботом и обновителем данных
+HOT_CALLS: Dict[str, Callable[[DatabaseManager], object]] = {
+    'get_vedomosti(group_id)': lambda db: db.get_vedomosti(GROUP_ID),
+    'get_vedomost_details': lambda db: db.get_vedomost_details(VEDOMOST_ID),
+    'get_vedomost_content_hash': lambda db: db.get_vedomost_content_hash(VEDOMOST_ID),
+    'touch_vedomost': lambda db: db.touch_vedomost(VEDOMOST_ID),
+    'save_vedomost_details': save_changed_details,
+    'get_student_by_record_book': lambda db: db.get_student_by_record_book(RECORD_BOOK),
+    'get_student_results': lambda db: db.get_student_results(STUDENT_ID),
+    'get_kt_statistics': lambda db: db.get_kt_statistics(VEDOMOST_ID),
+    'get_vedomosti_for_student': lambda db: db.get_vedomosti_for_student(RECORD_BOOK),
+    'get_user_settings': lambda db: db.get_user_settings(17),
+    'save_user_settings': lambda db: db.save_user_settings(17, {'notify_enabled': False}),
+    'get_pending_notifications': lambda db: db.get_pending_notifications(limit=100),
+    'mark_notification_as_sent': lambda db: db.mark_notification_as_sent(1),
+    'delete_sent_notifications': lambda db: db.delete_sent_notifications(2),
+    'get_vedomosti_to_update': lambda db: db.get_vedomosti_to_update(),
+}
+
+
+def trace(db_manager: DatabaseManager, call: Callable[[], object]) -> List[str]:
+    """
+    Выполнение вызова с перехватом запросов.
+
+    Args:
+        db_manager: Менеджер базы данных
+        call: Вызов
+
+    Returns:
+        List[str]: Тексты выполненных запросов с подставленными параметрами
+    """
+    traced: List[str] = []
+    db_manager.connection.set_trace_callback(traced.append)
+    try:
+        call()
+    finally:
+        db_manager.connection.set_trace_callback(None)
+    return traced
+
+
+def explain(db_manager: DatabaseManager, sql: str) -> Tuple[List[str], List[str]]:
+    """
+    План запроса и таблицы, читаемые в нем целиком.
+
+    Args:
+        db_manager: Менеджер базы данных (временные таблицы видны только его соединению)
+        sql: Текст запроса с подставленными параметрами
+
+    Returns:
+        Tuple[List[str], List[str]]: Строки EXPLAIN QUERY PLAN и таблицы с полным просмотром
+    """
+    plan = []
+    full_scans = []
+    for row in db_manager.connection.execute(f"EXPLAIN QUERY PLAN {sql}"):
+        detail = row[3]
+        plan.append(detail)
+        match = _FULL_SCAN_RE.match(detail)
+        if not match:
+            continue
+        table = match.group(1) or match.group(2)
+        # Временные таблицы (staged_results) содержат только текущую порцию и читаются целиком
+        if not table.startswith('staged_'):
+            full_scans.append(table)
+    return plan, full_scans
+
+
+@pytest.mark.parametrize('method', HOT_CALLS)
+def test_hot_queries_use_indexes(db_manager: DatabaseManager, method: str) -> None:
+    statements = [sql for sql in trace(db_manager, lambda: HOT_CALLS[method](db_manager))
+                  if _AUDITED_STATEMENT_RE.match(sql)]
+    assert statements, f"{method} не выполнил запросов"
+
+    for sql in statements:
+        plan, full_scans = explain(db_manager, sql)
+        assert not full_scans, f"{' '.join(sql.split())[:200]}\n" + '\n'.join(plan)
+
+
+def test_reference_data_is_read_once_per_table(db_manager: DatabaseManager) -> None:
+    # Кэш справочников заполняется одним чтением каждой таблицы, без запросов по факультету
+    db_manager.reference_cache.invalidate()
+    statements = trace(db_manager, lambda: db_manager.get_groups('f3'))
+    scanned = sorted(table for sql in statements for table in explain(db_manager, sql)[1])
+
+    assert len(statements) == 2
+    assert scanned == ['faculties', 'groups']
+    assert len(db_manager.get_groups('f3')) == GROUPS_PER_FACULTY
+
+
+@pytest.mark.parametrize('call', [
+    lambda db: db.get_faculties(),
+    lambda db: db.get_faculty('f3'),
+    lambda db: db.get_groups(),
+    lambda db: db.get_groups('f3'),
+    lambda db: db.get_group(GROUP_ID),
+], ids=['get_faculties', 'get_faculty', 'get_groups', 'get_groups(faculty_id)', 'get_group'])
+def test_reference_lookups_are_served_from_cache(db_manager: DatabaseManager,
+                                                  call: Callable[[DatabaseManager], object]) -> None:
+    db_manager.get_faculties()
+
+    assert trace(db_manager, lambda: call(db_manager)) == []
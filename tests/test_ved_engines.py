@@ -0,0 +1,187 @@
+"""
+Проверка движков разбора страницы Ved.aspx.
+
+Страницы ведомостей разного вида разбираются всеми доступными движками (lxml и
+BeautifulSoup); результаты сравниваются между собой через check_engine_parity и с
+ожидаемыми значениями. Если есть архив исходных страниц (SNAPSHOT_ARCHIVE_DIR),
+проверяются и сохраненные в нем страницы Ved.aspx.
+"""
+
+import os
+from dataclasses import replace
+from typing import List, Optional
+from urllib.parse import parse_qs, urlparse
+
+import pytest
+
+pytest.importorskip('bs4')
+
+from config import SNAPSHOT_ARCHIVE_DIR
+from parsers.snapshot_archive import SnapshotArchive
+from parsers.ved_engines import (
+    LXML_AVAILABLE, BeautifulSoupVedEngine, LxmlVedEngine, check_engine_parity, compile_column_map, get_engine,
+    parse_ved_content, parse_ved_stream
+)
+
+# Расположение групп КТ на странице стандартного вида
+STANDARD_KT_OFFSET = 7
+STANDARD_KT_GROUP_WIDTH = 5
+
+ENGINES = [BeautifulSoupVedEngine.name] + ([LxmlVedEngine.name] if LXML_AVAILABLE else [])
+
+
+def build_page(kt_count: int = 3, students: int = 5, common_columns: int = STANDARD_KT_OFFSET,
+               kt_header: bool = True, markup: bool = False) -> bytes:
+    """
+    Страница Ved.aspx с заданным расположением столбцов.
+
+    Строка заголовка ucVedBox_Row1 содержит ячейки общей шириной common_columns столбцов и
+    по одной ячейке VedRow1 шириной 5 столбцов на каждую КТ; строка студента - common_columns
+    общих ячеек, по 5 ячеек на КТ и 5 итоговых ячеек.
+
+    Args:
+        kt_count: Количество КТ
+        students: Количество студентов
+        common_columns: Количество общих столбцов перед группами КТ
+        kt_header: Добавить строку заголовка КТ
+        markup: Обернуть значения во вложенные теги и добавить строку без ссылки на студента
+
+    Returns:
+        bytes: Содержимое страницы в кодировке windows-1251
+    """
+    labels = ''.join(
+        f'<span id="ucVedBox_{element_id}">{text}</span>'
+        for element_id, text in (('lblGroup', 'УБ-21'), ('lblDis', 'Математика'), ('lblPrep', 'Иванов И.И.'),
+                                 ('lblTypeVed', 'Экзамен'), ('lblYear', '2024-2025'), ('lblStatus', 'Открыта'))
+    )
+    header = ''
+    if kt_header:
+        kt_dates = ''.join(f'<td class="VedRow1" colspan="{STANDARD_KT_GROUP_WIDTH}">0{kt % 9 + 1}.03.2025</td>'
+                           for kt in range(kt_count))
+        header = (f'<tr id="ucVedBox_Row1"><td colspan="3">Студент</td>'
+                  f'<td colspan="{common_columns - 3}">Зачетная книжка</td>{kt_dates}<td colspan="5">Итог</td></tr>')
+    weights = ''.join(f'<td>Вес Точки</td><td>{kt + 1}</td><td></td><td></td><td></td>' for kt in range(kt_count))
+
+    rows = []
+    for student in range(students):
+        kt_cells = ''.join(f'<td>{kt_score(kt, student)}</td><td>5</td><td>5</td><td>0</td><td>0</td>'
+                           for kt in range(kt_count))
+        name = f'<a href="Student.aspx?id={1000 + student}">Студент {student}</a>'
+        rating = f'{50 + student}'
+        if markup:
+            name = f'<b>{name}</b>' if student % 3 else f'Студент {student}'
+            rating = f'<span><b>{rating}</b></span>'
+        extra = '<td></td>' * (common_columns - 3)
+        rows.append(
+            f'<tr class="VedRow{student % 2 + 2}"><td>{student + 1}</td><td>{name}</td>'
+            f'<td>21-{student:04d}</td>{extra}{kt_cells}'
+            f'<td>{rating}</td><td>4</td><td>5</td><td>5</td><td></td></tr>'
+        )
+    html = (
+        '<html><head><title>Ved</title></head><body><form>'
+        '<input type="hidden" name="__VIEWSTATE" value="state" />'
+        f'{labels}<table id="ucVedBox_tblVed">{header}'
+        f'<tr><td colspan="{common_columns}"></td>{weights}<td colspan="5"></td></tr>'
+        f'{"".join(rows)}</table></form></body></html>'
+    )
+    return html.encode('windows-1251')
+
+
+def kt_score(kt: int, student: int) -> str:
+    """Балл студента за КТ на странице build_page."""
+    return str(10 * kt + student)
+
+
+def archived_ved_pages() -> List[tuple]:
+    """Последние версии страниц Ved.aspx из архива исходных страниц (ключ, содержимое, ID, кодировка)."""
+    if not os.path.exists(os.path.join(SNAPSHOT_ARCHIVE_DIR, 'index.jsonl')):
+        return []
+
+    archive = SnapshotArchive(SNAPSHOT_ARCHIVE_DIR)
+    pages = []
+    for entry in archive.latest():
+        url = urlparse(entry.url)
+        if url.path.endswith('Ved.aspx'):
+            ved_id = parse_qs(url.query).get('id', [''])[0]
+            pages.append(pytest.param(archive, entry.digest, ved_id, entry.encoding, id=entry.key))
+    return pages
+
+
+PAGE_VARIANTS = {
+    'standard': {},
+    'no-kt': {'kt_count': 0},
+    'one-kt': {'kt_count': 1},
+    'many-kt': {'kt_count': 12, 'students': 30},
+    'no-students': {'students': 0},
+    'large-group': {'students': 120},
+    'no-kt-header': {'kt_header': False},
+    'shifted-kt': {'common_columns': 9},
+    'nested-markup': {'markup': True},
+}
+
+
+@pytest.mark.parametrize('options', PAGE_VARIANTS.values(), ids=PAGE_VARIANTS.keys())
+def test_engines_agree(options: dict) -> None:
+    assert check_engine_parity(build_page(**options), 'ved', 'windows-1251') == []
+
+
+@pytest.mark.parametrize('engine', ENGINES)
+@pytest.mark.parametrize('options', PAGE_VARIANTS.values(), ids=PAGE_VARIANTS.keys())
+def test_parsed_values(engine: str, options: dict) -> None:
+    kt_count = options.get('kt_count', 3)
+    students = options.get('students', 5)
+    ved = parse_ved_content(build_page(**options), 'ved', 'windows-1251', get_engine(engine))
+
+    assert ved['discipline'] == 'Математика'
+    assert ved['teacher'] == 'Иванов И.И.'
+    if options.get('kt_header', True):
+        # Веса КТ берутся из второй строки таблицы, следующей за строкой заголовка
+        assert ved['kt_weights'] == [str(kt + 1) for kt in range(kt_count)]
+        assert len(ved['kt_dates']) == kt_count
+    assert len(ved['students']) == students
+    for index, student in enumerate(ved['students']):
+        assert student['record_book'] == f'21-{index:04d}'
+        assert student['kt_results'] == [kt_score(kt, index) for kt in range(kt_count)]
+        assert (student['final_rating'], student['rating_grade'], student['exam_grade'],
+                student['final_grade']) == (str(50 + index), '4', '5', '5')
+        if not options.get('markup') or index % 3:
+            assert (student['id'], student['name']) == (str(1000 + index), f'Студент {index}')
+        else:
+            assert student['id'] is None
+
+
+@pytest.mark.parametrize('engine', ENGINES)
+def test_stream_matches_full_parse(engine: str) -> None:
+    content = build_page(kt_count=4, students=40)
+    header, students = parse_ved_stream(content, 'ved', 'windows-1251', get_engine(engine))
+    ved = parse_ved_content(content, 'ved', 'windows-1251', get_engine(engine))
+
+    assert dict(header, students=list(students)) == ved
+
+
+@pytest.mark.parametrize('engine', ENGINES)
+@pytest.mark.parametrize('kt_count', [0, 1, 3, 12])
+def test_header_layout_matches_fixed_layout(engine: str, kt_count: int) -> None:
+    # Для страницы стандартного вида карта по заголовку совпадает с прежним расположением 7/5
+    page = get_engine(engine).extract(build_page(kt_count=kt_count), 'windows-1251')
+    width = len(page.student_rows[0].cells)
+    header_map = compile_column_map(page, width)
+
+    assert page.kt_header_offset == (STANDARD_KT_OFFSET if kt_count else None)
+    assert page.kt_header_spans == [STANDARD_KT_GROUP_WIDTH] * kt_count
+    assert header_map == compile_column_map(replace(page, kt_header_offset=None, kt_header_spans=[]), width)
+    assert len(header_map.kt) == kt_count
+
+
+def test_page_without_table() -> None:
+    content = '<html><body><span id="ucVedBox_lblDis">Дисциплина</span></body></html>'.encode('windows-1251')
+
+    assert check_engine_parity(content, 'ved', 'windows-1251') == []
+    assert parse_ved_content(content, 'ved', 'windows-1251')['students'] == []
+
+
+@pytest.mark.parametrize('archive, digest, ved_id, encoding', archived_ved_pages() or [
+    pytest.param(None, None, None, None, marks=pytest.mark.skip(reason="архив исходных страниц пуст"))
+])
+def test_archived_pages(archive: SnapshotArchive, digest: str, ved_id: str, encoding: Optional[str]) -> None:
+    assert check_engine_parity(archive.load(digest), ved_id, encoding) == []